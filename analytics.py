@@ -0,0 +1,149 @@
+"""
+Analyses vectorisées de l'historique des résultats
+Séries, taux glissants, répartition horaire, combinaisons de couleurs et écarts entre numéros
+"""
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+from compact_results import CompactResultArray, CARDS_PER_GROUP, WINNER_CODES, SUITS
+from history_archive import HistoryArchive, COLUMNS, suit_masks_from_cards
+
+JOUEUR = WINNER_CODES['Joueur']
+BANQUIER = WINNER_CODES['Banquier']
+
+
+def mask_to_suits(mask: int) -> str:
+    """Convertit un masque de couleurs en chaîne (ex: 7 -> '♠♥♦')"""
+    return ''.join(suit for bit, suit in enumerate(SUITS) if mask & (1 << bit))
+
+
+class ResultsFrame:
+    """Colonnes NumPy d'un ensemble de résultats, dans l'ordre d'enregistrement"""
+
+    __slots__ = ('numeros', 'timestamps', 'winners', 'cards')
+
+    def __init__(self, numeros: np.ndarray, timestamps: np.ndarray, winners: np.ndarray, cards: np.ndarray):
+        self.numeros = np.asarray(numeros, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.winners = np.asarray(winners, dtype=np.uint8)
+        self.cards = np.asarray(cards, dtype=np.uint8).reshape(-1, 2 * CARDS_PER_GROUP)
+
+    def __len__(self) -> int:
+        return len(self.numeros)
+
+    @classmethod
+    def from_compact(cls, compact: CompactResultArray) -> 'ResultsFrame':
+        return cls(
+            np.frombuffer(compact.numeros, dtype=np.uint32),
+            np.frombuffer(compact.timestamps, dtype=np.uint32),
+            np.frombuffer(bytes(compact.winners), dtype=np.uint8),
+            np.frombuffer(bytes(compact.cards), dtype=np.uint8)
+        )
+
+    @classmethod
+    def from_dicts(cls, results: List[Dict[str, Any]]) -> 'ResultsFrame':
+        """Construit les colonnes depuis les résultats YAML du jour"""
+        return cls.from_compact(CompactResultArray.from_dicts(results))
+
+    @classmethod
+    def from_archive(cls, archive: HistoryArchive, since: Optional[str] = None,
+                     until: Optional[str] = None) -> 'ResultsFrame':
+        columns = archive.load_columns(since, until)
+        return cls(*(columns[name] for name in COLUMNS))
+
+    @classmethod
+    def concat(cls, *frames: 'ResultsFrame') -> 'ResultsFrame':
+        return cls(*(np.concatenate([getattr(frame, name) for frame in frames]) for name in cls.__slots__))
+
+
+def run_lengths(values: np.ndarray):
+    """Encodage par plages: (valeurs, longueurs) des suites de valeurs identiques"""
+    if values.size == 0:
+        return values[:0], np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    lengths = np.diff(np.append(starts, values.size))
+    return values[starts], lengths
+
+
+def streaks(winners: np.ndarray) -> Dict[str, Any]:
+    """Séries de victoires consécutives (plus longues et série en cours)"""
+    values, lengths = run_lengths(winners)
+    result = {}
+    for name, code in (('joueur', JOUEUR), ('banquier', BANQUIER)):
+        own = lengths[values == code]
+        result[f'plus_longue_{name}'] = int(own.max()) if own.size else 0
+        result[f'moyenne_{name}'] = float(own.mean()) if own.size else 0.0
+    result['serie_en_cours'] = {
+        'gagnant': {JOUEUR: 'Joueur', BANQUIER: 'Banquier'}.get(int(values[-1])) if values.size else None,
+        'longueur': int(lengths[-1]) if lengths.size else 0
+    }
+    return result
+
+
+def rolling_win_rate(winners: np.ndarray, window: int, code: int = JOUEUR) -> np.ndarray:
+    """Taux de victoire glissant (%) sur les N dernières parties, une valeur par partie à partir de la N-ième"""
+    if window <= 0 or winners.size < window:
+        return np.zeros(0)
+    hits = np.concatenate(([0], np.cumsum(winners == code)))
+    return (hits[window:] - hits[:-window]) / window * 100
+
+
+def hourly_breakdown(timestamps: np.ndarray, winners: np.ndarray) -> Dict[int, Dict[str, int]]:
+    """Nombre de victoires par heure de la journée (heure murale)"""
+    hours = (timestamps // 3600) % 24
+    joueur = np.bincount(hours[winners == JOUEUR], minlength=24)
+    banquier = np.bincount(hours[winners == BANQUIER], minlength=24)
+    return {hour: {'joueur': int(joueur[hour]), 'banquier': int(banquier[hour])}
+            for hour in range(24) if joueur[hour] or banquier[hour]}
+
+
+def suit_combinations(cards: np.ndarray, group: int = 1) -> Dict[str, int]:
+    """Fréquence des combinaisons de couleurs d'un groupe, de la plus fréquente à la moins fréquente"""
+    offset = (group - 1) * CARDS_PER_GROUP
+    masks = suit_masks_from_cards(cards[:, offset:offset + CARDS_PER_GROUP])
+    counts = np.bincount(masks, minlength=16)
+    order = np.argsort(counts)[::-1]
+    return {mask_to_suits(int(mask)): int(counts[mask]) for mask in order if counts[mask] and mask}
+
+
+def number_gaps(numeros: np.ndarray) -> Dict[str, Any]:
+    """Écarts entre numéros enregistrés successifs"""
+    gaps = np.diff(numeros)
+    gaps = gaps[gaps > 0]
+    if gaps.size == 0:
+        return {'moyen': 0.0, 'max': 0, 'frequents': {}}
+    values, counts = np.unique(gaps, return_counts=True)
+    top = np.argsort(counts)[::-1][:5]
+    return {
+        'moyen': float(gaps.mean()),
+        'max': int(gaps.max()),
+        'frequents': {int(values[i]): int(counts[i]) for i in top}
+    }
+
+
+def summary(frame: ResultsFrame, windows: tuple = (20, 50, 100)) -> Dict[str, Any]:
+    """Synthèse complète (sérialisable en JSON) d'un ensemble de résultats"""
+    rolling = {}
+    for window in windows:
+        rates = rolling_win_rate(frame.winners, window)
+        rolling[window] = {
+            'taux_joueur_actuel': float(rates[-1]) if rates.size else None,
+            'min': float(rates.min()) if rates.size else None,
+            'max': float(rates.max()) if rates.size else None
+        }
+    return {
+        'total': len(frame),
+        'series': streaks(frame.winners),
+        'taux_glissants': rolling,
+        'par_heure': hourly_breakdown(frame.timestamps, frame.winners),
+        'combinaisons_groupe1': suit_combinations(frame.cards, group=1),
+        'ecarts_numeros': number_gaps(frame.numeros)
+    }
+
+
+def load_history(results_manager, archive: HistoryArchive, since: Optional[str] = None) -> ResultsFrame:
+    """Historique archivé depuis une date + résultats du jour en cours"""
+    return ResultsFrame.concat(
+        ResultsFrame.from_archive(archive, since),
+        ResultsFrame.from_dicts(results_manager.get_all_results())
+    )
@@ -0,0 +1,1125 @@
+"""
+Benchmarks des chemins critiques du bot
+Usage: python benchmark.py <nom> [options]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+import yaml
+
+import analytics
+import metrics
+from compact_results import CompactResultArray, CARDS_PER_GROUP
+from game_results_manager import GameResultsManager
+from logging_setup import setup_logging
+from shared_storage import Coordinator, FileLock
+
+SUITS = ['♠️', '♥️', '♦️', '♣️']
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+
+
+def random_group(rng: random.Random, size: int) -> str:
+    """Génère un groupe de cartes aléatoire"""
+    return ''.join(rng.choice(RANKS) + rng.choice(SUITS) for _ in range(size))
+
+
+def edit_heavy_stream(games: int, edits: int = 3, seed: int = 42) -> List[str]:
+    """
+    Génère un flux réaliste: pour chaque jeu, un message ⏰ édité plusieurs fois,
+    puis le message finalisé ✅ reçu comme NewMessage et répété par des MessageEdited
+    """
+    rng = random.Random(seed)
+    stream = []
+    number = 1
+    for _ in range(games):
+        number += rng.choice([1, 2, 3])
+        first = random_group(rng, rng.choice([2, 3]))
+        second = random_group(rng, rng.choice([2, 3]))
+        for step in range(edits):
+            stream.append(f"⏰#N{number}. {step}({first[:4]}) - ({second[:4]})")
+        final = f"#N{number}. 1({first}) - ✅5({second}) #T6"
+        stream.extend([final] * (edits + 1))
+    return stream
+
+
+def bench_parse_cache(games: int):
+    """
+    Compare process_message avec et sans cache d'analyse sur un flux riche en éditions
+    Le cache n'économise que l'analyse: de bout en bout, l'écriture du stockage domine et le gain
+    reste de l'ordre du bruit de mesure (la part de l'analyse est affichée pour le situer)
+    """
+    stream = edit_heavy_stream(games)
+    print(f"Flux: {len(stream)} messages pour {games} jeux")
+
+    timings = {}
+    for label, cache_size in (("sans cache", 0), ("avec cache", 512)):
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager = GameResultsManager(data_dir=tmp, parse_cache_size=cache_size)
+                start = time.perf_counter()
+                for message in stream:
+                    manager.process_message(message)
+                elapsed = time.perf_counter() - start
+
+                # Analyse seule (sans accès disque) pour isoler le gain du cache
+                manager.clear_parse_cache()
+                start = time.perf_counter()
+                for message in stream:
+                    manager.parse_message(message)
+                parse_elapsed = time.perf_counter() - start
+
+            stats = manager.get_parse_cache_stats()
+            print(f"{label:>11}: process_message {elapsed * 1000:8.1f} ms "
+                  f"| analyse seule {parse_elapsed * 1000:7.1f} ms "
+                  f"| succès cache {stats['hit_rate']:5.1f}% "
+                  f"| mémoire {stats['memory_bytes'] / 1024:.1f} Ko")
+            timings[label] = (elapsed, parse_elapsed)
+
+    (total, parse), (cached_total, cached_parse) = timings["sans cache"], timings["avec cache"]
+    print(f"Analyse: {parse / total * 100:.1f}% de process_message sans cache; "
+          f"gain du cache sur l'analyse {(parse - cached_parse) * 1000:.1f} ms, "
+          f"écart de bout en bout {(total - cached_total) * 1000:+.1f} ms (stockage inclus, bruit compris)")
+
+
+def synthetic_results(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Génère des résultats au format YAML actuel"""
+    rng = random.Random(seed)
+    results = []
+    number = 0
+    for index in range(count):
+        number += rng.choice([2, 3, 4])
+        first = random_group(rng, 3)
+        second = random_group(rng, rng.choice([2, 3]))
+        seconds = index * 45
+        results.append({
+            'numero': number,
+            'date': f"2025-{(seconds // 2592000) % 12 + 1:02d}-{(seconds // 86400) % 28 + 1:02d}",
+            'heure': f"{(seconds // 3600) % 24:02d}:{(seconds // 60) % 60:02d}:{seconds % 60:02d}",
+            'cartes_groupe1': first,
+            'cartes_groupe2': second,
+            'gagnant': rng.choice(['Joueur', 'Banquier']),
+            'message_complet': f"#N{number}. ✅2({first}) - 1({second}) #T3"
+        })
+    return results
+
+
+def bench_compact(count: int):
+    """Compare la mémoire et la taille disque des dicts YAML et de l'encodage compact"""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    results = synthetic_results(count)
+    dict_memory = tracemalloc.get_traced_memory()[0] - start
+
+    start = tracemalloc.get_traced_memory()[0]
+    compact = CompactResultArray.from_dicts(results)
+    compact_memory = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    sample = results[:10000]
+    yaml_size = len(yaml.dump(sample, allow_unicode=True, default_flow_style=False, indent=2).encode('utf-8'))
+    yaml_size = yaml_size * count // len(sample)
+    binary_size = len(compact.to_bytes())
+
+    print(f"{count} résultats")
+    print(f"  Mémoire dicts   : {dict_memory / 1e6:8.2f} Mo ({dict_memory / count:6.1f} o/résultat)")
+    print(f"  Mémoire compact : {compact_memory / 1e6:8.2f} Mo ({compact_memory / count:6.1f} o/résultat)")
+    print(f"  Disque YAML     : {yaml_size / 1e6:8.2f} Mo (estimé)")
+    print(f"  Disque binaire  : {binary_size / 1e6:8.2f} Mo")
+    assert compact[0].to_dict()['cartes_groupe1'] == results[0]['cartes_groupe1']
+
+
+def naive_summary(compact: CompactResultArray, windows=(20, 50, 100)) -> Dict[str, Any]:
+    """Implémentation de référence en boucles Python pures (pour comparaison)"""
+    winners = list(compact.winners)
+
+    longest = {1: 0, 2: 0}
+    current, length = None, 0
+    for winner in winners:
+        length = length + 1 if winner == current else 1
+        current = winner
+        if winner in longest:
+            longest[winner] = max(longest[winner], length)
+
+    rolling = {}
+    for window in windows:
+        rates = [sum(1 for w in winners[i - window:i] if w == 1) / window * 100
+                 for i in range(window, len(winners) + 1)]
+        rolling[window] = rates[-1] if rates else None
+
+    hours = {}
+    for timestamp, winner in zip(compact.timestamps, winners):
+        hour = (timestamp // 3600) % 24
+        hours.setdefault(hour, {1: 0, 2: 0})
+        if winner in (1, 2):
+            hours[hour][winner] += 1
+
+    combos = {}
+    for index in range(len(compact)):
+        mask = 0
+        for code in compact.cards[index * 2 * CARDS_PER_GROUP:index * 2 * CARDS_PER_GROUP + CARDS_PER_GROUP]:
+            if code:
+                mask |= 1 << (code & 3)
+        combos[mask] = combos.get(mask, 0) + 1
+
+    gaps = [b - a for a, b in zip(compact.numeros, compact.numeros[1:]) if b > a]
+    return {'longest': longest, 'rolling': rolling, 'hours': hours, 'combos': combos,
+            'gap_mean': sum(gaps) / len(gaps) if gaps else 0.0}
+
+
+def bench_analytics(count: int):
+    """Compare le moteur d'analyse vectorisé à une implémentation en boucles Python"""
+    compact = CompactResultArray.from_dicts(synthetic_results(count))
+    print(f"{count} résultats (~{count // 1500} jours)")
+
+    start = time.perf_counter()
+    frame = analytics.ResultsFrame.from_compact(compact)
+    report = analytics.summary(frame)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive = naive_summary(compact)
+    loop = time.perf_counter() - start
+
+    assert report['series']['plus_longue_joueur'] == naive['longest'][1]
+    assert abs(report['ecarts_numeros']['moyen'] - naive['gap_mean']) < 1e-9
+    print(f"  Vectorisé (NumPy) : {vectorized * 1000:9.1f} ms")
+    print(f"  Boucles Python    : {loop * 1000:9.1f} ms")
+    print(f"  Accélération      : x{loop / vectorized:.1f}")
+
+
+def naive_backtest(compact: CompactResultArray, strategy) -> Dict[str, int]:
+    """Référence en boucles Python pures d'une stratégie du backtest (pour comparaison)"""
+    import backtest
+
+    kind, param, target = strategy
+    winners = list(compact.winners)
+    paris = gagnes = gain = peak = drawdown = losing = longest = 0
+    length, previous, signal = 0, None, 0
+    for index, winner in enumerate(winners):
+        if signal and winner:
+            paris += 1
+            if signal == winner:
+                gagnes, gain, losing = gagnes + 1, gain + 1, 0
+            else:
+                gain, losing = gain - 1, losing + 1
+            peak = max(peak, gain)
+            drawdown = max(drawdown, peak - gain)
+            longest = max(longest, losing)
+        length = length + 1 if winner == previous else 1
+        previous = winner
+        if kind == backtest.SUIT_PATTERN:
+            mask = 0
+            for code in compact.cards[index * 2 * CARDS_PER_GROUP:index * 2 * CARDS_PER_GROUP + CARDS_PER_GROUP]:
+                if code:
+                    mask |= 1 << (code & 3)
+            signal = target if mask == param else 0
+        elif length >= param and winner:
+            signal = winner if kind == backtest.FOLLOW_STREAK else 3 - winner
+        else:
+            signal = 0
+    return {'paris': paris, 'gain': gain, 'drawdown_max': drawdown, 'plus_longue_perte': longest}
+
+
+def bench_backtest(count: int, workers: int):
+    """Backtest vectorisé (sur place et en pool de threads) contre une boucle Python par stratégie"""
+    import backtest
+
+    compact = CompactResultArray.from_dicts(synthetic_results(count))
+    frame = analytics.ResultsFrame.from_compact(compact)
+    strategies = backtest.default_grid(max_streak=12)
+    print(f"{count} résultats, {len(strategies)} stratégies, lots de {backtest.BATCH_CELLS} cellules")
+
+    timings = {}
+    for label, pool_workers in (('local', 1), ('threads', workers)):
+        start = time.perf_counter()
+        rows = backtest.sweep(frame, strategies, workers=pool_workers)
+        timings[label] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive = [naive_backtest(compact, strategy) for strategy in strategies]
+    loop = time.perf_counter() - start
+
+    for row, reference in zip(rows, naive):
+        assert all(row[key] == value for key, value in reference.items()), (row, reference)
+    print(f"  Vectorisé (sur place)     : {timings['local'] * 1000:9.1f} ms")
+    print(f"  {f'Vectorisé ({workers} threads)':<26}: {timings['threads'] * 1000:9.1f} ms (CPU: {os.cpu_count()})")
+    print(f"  Boucles Python            : {loop * 1000:9.1f} ms")
+    print(f"  Accélération              : x{loop / min(timings.values()):.1f}")
+
+
+def bench_deploy(calls: int):
+    """Package /deploy: première construction en mémoire puis appels servis par le cache"""
+    from deploy_bundle import DeployBundle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = DeployBundle(base_dir=str(Path(__file__).parent))
+        start = time.perf_counter()
+        data, _, cached = bundle.build()
+        first = time.perf_counter() - start
+        assert not cached
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            assert bundle.build()[0] is data
+        hit = (time.perf_counter() - start) / calls
+
+        # Une source modifiée change l'empreinte et force une reconstruction
+        source = Path(tmp) / 'main.py'
+        source.write_text('# v1\n', encoding='utf-8')
+        changed = DeployBundle(files=['main.py'], base_dir=tmp)
+        changed.build()
+        source.write_text('# v2\n', encoding='utf-8')
+        assert not changed.build()[2] and changed.builds == 2
+
+    print(f"Package de {len(data) / 1024:.1f} Ko ({len(bundle.files)} fichiers sources)")
+    print(f"  Construction en mémoire : {first * 1000:8.2f} ms")
+    print(f"  Appel servi par le cache: {hit * 1000:8.2f} ms (empreinte des sources comprise)")
+
+
+def bench_import(rows: int, store_rows: int):
+    """Lecture en flux d'un gros export (CSV et xlsx): durée et pic mémoire, puis import dédoublonné"""
+    import csv
+    from openpyxl import Workbook
+    from results_import import iter_results
+
+    with tempfile.TemporaryDirectory() as tmp:
+        header = ["Date & Heure", "Numéro", "Victoire (Joueur/Banquier)"]
+        lines = ((f"{(i // 1440) % 28 + 1:02d}/10/2026 - {(i // 60) % 24:02d}:{i % 60:02d}", f"{i:03d}",
+                  'Joueur' if i % 3 else 'Banquier') for i in range(1, rows + 1))
+        csv_path = os.path.join(tmp, 'resultats.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(header)
+            writer.writerows(lines)
+        xlsx_path = os.path.join(tmp, 'resultats.xlsx')
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Résultats")
+        sheet.append(header)
+        for i in range(1, rows + 1):
+            sheet.append([f"19/10/2026 - {(i // 60) % 24:02d}:{i % 60:02d}", f"{i:03d}", 'Joueur' if i % 3 else 'Banquier'])
+        workbook.save(xlsx_path)
+
+        print(f"{rows} lignes")
+        for label, path in (("CSV", csv_path), ("xlsx", xlsx_path)):
+            start = time.perf_counter()
+            count = sum(1 for _ in iter_results(path))
+            elapsed = time.perf_counter() - start
+            assert count == rows
+            # Pic mémoire mesuré sur une seconde lecture (tracemalloc ralentit fortement la boucle)
+            tracemalloc.start()
+            for _ in iter_results(path):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  Lecture {label:<4}: {elapsed:6.2f} s ({elapsed / rows * 1e6:5.1f} µs/ligne), "
+                  f"pic mémoire {peak / 1e6:6.2f} Mo")
+
+        # Import dans un stockage qui contient déjà la moitié des numéros: une seule écriture
+        with contextlib.redirect_stdout(io.StringIO()):
+            logging.disable(logging.CRITICAL)
+            manager = GameResultsManager(data_dir=os.path.join(tmp, 'store'))
+            logging.disable(logging.NOTSET)
+        subset = os.path.join(tmp, 'subset.csv')
+        with open(csv_path, encoding='utf-8') as source, open(subset, 'w', encoding='utf-8') as target:
+            target.writelines(itertools.islice(source, store_rows + 1))
+        manager.import_file(subset)
+        start = time.perf_counter()
+        report = manager.import_file(subset)
+        elapsed = time.perf_counter() - start
+        assert report['importes'] == 0 and report['doublons'] == store_rows
+        print(f"  Réimport de {store_rows} lignes (toutes en doublon): {elapsed * 1000:.0f} ms")
+
+
+def bench_export(count: int):
+    """Exports partiels de /fichier: sélection par l'index (bisect) contre filtrage de tout le stockage"""
+    from results_index import ResultsIndex, matches
+
+    results = synthetic_results(count)
+    index = ResultsIndex(results)
+    middle = results[count // 2]['numero']
+    day = results[count // 2]['date']
+    cases = (
+        ("num (200 jeux)", {'min_numero': middle, 'max_numero': middle + 600}, None),
+        ("100 derniers Joueur", {'winner': 'Joueur'}, 100),
+        (f"date:{day}", {'since': day, 'until': day}, None),
+    )
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as tmp:
+        logging.disable(logging.CRITICAL)
+        manager = GameResultsManager(data_dir=tmp)
+        logging.disable(logging.NOTSET)
+        lines = []
+        for label, filters, last in cases:
+            filters = dict({'min_numero': None, 'max_numero': None, 'since': None, 'until': None, 'winner': None}, **filters)
+            timings = []
+            for select in (lambda: [row for row in results if matches(row, **filters)][-last if last else None:],
+                           lambda: index.tail(last, **filters) if last else list(index.query(**filters))):
+                best = float('inf')
+                for _ in range(5):
+                    start = time.perf_counter()
+                    rows = select()
+                    best = min(best, time.perf_counter() - start)
+                timings.append((best, rows))
+            assert timings[0][1] == timings[1][1]
+            start = time.perf_counter()
+            manager.export_to_txt(os.path.join(tmp, 'partiel.xlsx'), timings[1][1])
+            exported = time.perf_counter() - start
+            lines.append(f"  {label:<22}: {len(rows):6} lignes | parcours complet {timings[0][0] * 1000:8.2f} ms | "
+                         f"index {timings[1][0] * 1000:7.3f} ms | export {exported * 1000:7.1f} ms")
+        start = time.perf_counter()
+        manager.export_to_txt(os.path.join(tmp, 'complet.xlsx'), results)
+        full = time.perf_counter() - start
+
+    print(f"{count} résultats (export complet: {full:.2f} s)")
+    for line in lines:
+        print(line)
+
+
+def bench_day_archive(games: int, edits: int):
+    """Archive quotidienne compressée: taille contre YAML, durée d'écriture, lecture en flux et mémoire"""
+    from day_archive import DayArchive
+
+    results = synthetic_results(games)
+    messages = edit_heavy_stream(games, edits)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = DayArchive(Path(tmp), channel_id=-1001)
+        for message_id, text in enumerate(messages):
+            archive.journal.append(message_id // (edits + 1), text, edited=message_id % (edits + 1) > 0)
+        archive.journal.rotate('2026-01-01')
+        plain = archive.journal.frozen_path('2026-01-01').stat().st_size
+        yaml_size = len(yaml.dump([{'content': text} for text in messages] + results, allow_unicode=True,
+                                  default_flow_style=False, indent=2).encode('utf-8'))
+
+        start = time.perf_counter()
+        compressed = archive.write_day('2026-01-01', results).stat().st_size
+        written = time.perf_counter() - start
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = sum(1 for _ in archive.iter_messages('2026-01-01'))
+        streamed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == len(messages) and sum(1 for _ in archive.iter_results('2026-01-01')) == games
+
+    print(f"{games} résultats, {len(messages)} messages bruts")
+    print(f"  YAML (messages + résultats) : {yaml_size / 1024:9.1f} Ko")
+    print(f"  Journal des messages        : {plain / 1024:9.1f} Ko")
+    print(f"  Archive gzip                : {compressed / 1024:9.1f} Ko (écrite en {written * 1000:.0f} ms)")
+    print(f"  Lecture en flux des messages: {streamed * 1000:9.1f} ms, pic mémoire {peak / 1024:.0f} Ko")
+
+
+def bench_metrics(iterations: int):
+    """Surcoût de l'instrumentation (chronomètre d'histogramme, compteur étiqueté)"""
+    registry = metrics.Registry()
+    histogram = metrics.Histogram('bench_seconds', "bench", registry=registry)
+    counter = metrics.Counter('bench', "bench", ['outcome'], registry=registry)
+
+    def work():
+        return None
+
+    timed_work = histogram.time()(work)
+
+    def measure(func) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1e9
+
+    def with_context():
+        with histogram.time():
+            work()
+
+    series = counter.labels(outcome='recorded')
+
+    def labelled_inc():
+        series.inc()
+
+    baseline = measure(work)
+    decorated = measure(timed_work) - baseline
+    context = measure(with_context) - baseline
+    labelled = measure(labelled_inc) - baseline
+
+    # Coût réel d'un message (chemin cache + règles séquentielles, sans écriture)
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = GameResultsManager(data_dir=tmp)
+            message = "#N10. ✅2(K♠️5♣️7♥️) - 1(2♣️2♥️7♣️) #T3"
+            manager.process_message(message)
+            start = time.perf_counter()
+            for _ in range(1000):
+                manager.process_message(message)
+            per_message = (time.perf_counter() - start) / 1000 * 1e9
+
+    # Message déjà connu: 2 histogrammes (traitement, chargement) et 3 compteurs (cache, résultat, raison)
+    per_message_overhead = decorated * 2 + labelled * 3
+    print(f"  Histogramme (décorateur) : {decorated:7.0f} ns/appel")
+    print(f"  Histogramme (contexte)   : {context:7.0f} ns/appel")
+    print(f"  Compteur (série liée)    : {labelled:7.0f} ns/appel")
+    print(f"  Message traité           : {per_message:7.0f} ns (dont ~{per_message_overhead:.0f} ns "
+          f"d'instrumentation, {per_message_overhead / per_message * 100:.1f}%)")
+
+
+def bench_logging(messages: int):
+    """
+    Coût de journalisation par message sur le thread appelant (celui de la boucle asyncio)
+    Avant: FileHandler + console synchrones, f-strings et print; après: file + thread d'écriture, formatage paresseux
+    Deux séquences: un message enregistré (6 lignes dont 4 de détail) et une édition ignorée
+    (4 lignes de détail, cas le plus fréquent: chaque ⏰ est édité plusieurs fois)
+    """
+    message = "#N10. ✅2(K♠️5♣️7♥️) - 1(2♣️2♥️7♣️) #T3"
+    game, winner = 10, 'Joueur'
+
+    def before(logger):
+        logger.info(f"📨 Message du canal: {message[:100]}...")
+        print(f"📩 Message reçu: {message[:150]}...")
+        print("✅ Message finalisé détecté, traitement en cours...")
+        print(f"🎯 Jeu #{game}: groupes K♠️5♣️7♥️ / 2♣️2♥️7♣️ → Victoire {winner.upper()}")
+        print(f"✅ Résultat enregistré: Jeu #{game} - Gagnant: {winner} - 2024-01-01 12:00:00")
+        logger.info(f"✅ Jeu #{game} enregistré - Gagnant: {winner}")
+
+    def after(logger):
+        logger.debug("📨 Message du canal: %s...", message[:100])
+        logger.debug("📩 Message reçu: %s...", message[:150])
+        logger.debug("✅ Message finalisé détecté, traitement en cours...")
+        logger.debug("🎯 Jeu #%s: groupes %s / %s → Victoire %s", game, 'K♠️5♣️7♥️', '2♣️2♥️7♣️', winner.upper())
+        logger.info("✅ Résultat enregistré: Jeu #%s - Gagnant: %s - %s %s", game, winner, '2024-01-01', '12:00:00')
+        logger.info("✅ Jeu #%s enregistré - Gagnant: %s", game, winner)
+
+    def before_ignored(logger):
+        logger.info(f"✏️ Message édité dans le canal: {message[:100]}...")
+        print(f"📩 Message reçu: {message[:150]}...")
+        print("⚠️ Message ignoré: Message en cours d'édition")
+        logger.info(f"⚠️ Message édité ignoré: Jeu #{game} déjà enregistré")
+
+    def after_ignored(logger):
+        logger.debug("✏️ Message édité dans le canal: %s...", message[:100])
+        logger.debug("📩 Message reçu: %s...", message[:150])
+        logger.debug("⚠️ Message ignoré: %s", "Message en cours d'édition")
+        logger.debug("⚠️ Message édité ignoré: Jeu #%s déjà enregistré", game)
+
+    def measure(sequence) -> float:
+        start = time.perf_counter()
+        for _ in range(messages):
+            sequence(logger)
+        return (time.perf_counter() - start) / messages * 1e6
+
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    logger = logging.getLogger('bench')
+    with tempfile.TemporaryDirectory() as tmp:
+        # La console est simulée par un fichier pour ne pas dépendre du terminal
+        console = open(os.path.join(tmp, 'console.txt'), 'w', encoding='utf-8')
+        try:
+            root.handlers = []
+            logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                                handlers=[logging.StreamHandler(console),
+                                          logging.FileHandler(os.path.join(tmp, 'before.log'), encoding='utf-8')])
+            with contextlib.redirect_stdout(console):
+                before_us = measure(before)
+                before_ignored_us = measure(before_ignored)
+
+            with contextlib.redirect_stdout(console):
+                listener = setup_logging(os.path.join(tmp, 'after.log'), level=logging.INFO)
+            after_us = measure(after)
+            after_ignored_us = measure(after_ignored)
+            listener.stop()
+        finally:
+            for handler in root.handlers:
+                handler.close()
+            root.handlers, root.level = saved_handlers, saved_level
+            console.close()
+
+    print(f"{messages} messages simulés (µs par message sur le thread de la boucle)")
+    print("                      avant    après    gain")
+    print(f"  Enregistré       : {before_us:7.1f}  {after_us:7.1f}   x{before_us / after_us:.1f}")
+    print(f"  Édition ignorée  : {before_ignored_us:7.1f}  {after_ignored_us:7.1f}   x{before_ignored_us / after_ignored_us:.1f}")
+
+
+async def _feed_load_test(clients: int, slow_clients: int, games: int, rate: float):
+    from aiohttp import ClientSession, TCPConnector, web
+    from aiohttp.test_utils import TestServer
+    from live_feed import LiveFeedHub
+
+    results = synthetic_results(games)
+    hub = LiveFeedHub(queue_size=32, max_skips=64)
+    app = web.Application()
+    app.router.add_get('/feed', hub.sse_handler)
+    server = TestServer(app)
+    await server.start_server()
+    hub.start()
+
+    received = [0] * clients
+
+    async def reader(index: int, session: ClientSession):
+        async with session.get(server.make_url('/feed')) as response:
+            async for line in response.content:
+                if line.startswith(b'data: '):
+                    received[index] += 1
+                    if received[index] == games:
+                        return
+
+    async def slow_reader(session: ClientSession):
+        # Se connecte mais ne lit jamais: doit être sauté puis déconnecté
+        async with session.get(server.make_url('/feed')):
+            await asyncio.sleep(3600)
+
+    def publish_all() -> List[float]:
+        latencies = []
+        for result in results:
+            start = time.perf_counter()
+            hub.publish(result)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    async with ClientSession(connector=TCPConnector(limit=0)) as session:
+        # Référence: un seul abonné local, sans connexion réseau
+        local = hub.subscribe()
+        baseline = sorted(publish_all())
+        hub.unsubscribe(local)
+        await asyncio.sleep(0.1)
+
+        tasks = [asyncio.create_task(reader(i, session)) for i in range(clients)]
+        slow = [asyncio.create_task(slow_reader(session)) for _ in range(slow_clients)]
+        while len(hub.subscribers) < clients + slow_clients:
+            await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        latencies = []
+        # Rythme constant (le canal réel publie environ une partie par minute)
+        for result in results:
+            t0 = time.perf_counter()
+            hub.publish(result)
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(1 / rate)
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=60)
+        delivery = time.perf_counter() - start
+        latencies.sort()
+
+        for task in slow:
+            task.cancel()
+        skipped = metrics.REGISTRY.get('bot_feed_skipped').value
+    await hub.stop()
+    await server.close()
+
+    def pct(values, p):
+        return values[min(len(values) - 1, int(len(values) * p))] * 1e6
+
+    print(f"{clients} abonnés SSE + {slow_clients} lents, {games} parties publiées à {rate:g}/s")
+    print(f"  publish() 1 abonné     : p50 {pct(baseline, .5):6.1f} µs | p99 {pct(baseline, .99):6.1f} µs")
+    print(f"  publish() avec abonnés : p50 {pct(latencies, .5):6.1f} µs | p99 {pct(latencies, .99):6.1f} µs")
+    print(f"  Livraison complète     : {delivery * 1000:.0f} ms, {sum(received)} messages reçus "
+          f"({sum(received) / delivery:.0f}/s)")
+    print(f"  Messages sautés        : {skipped:.0f} (abonnés lents)")
+
+
+def bench_live_feed(clients: int, slow_clients: int, games: int, rate: float):
+    """Test de charge du flux en direct: diffusion vers des centaines de clients locaux"""
+    asyncio.run(_feed_load_test(clients, slow_clients, games, rate))
+
+
+def channel_event_stream(games: int, edits: int = 3, seed: int = 7, first_number: int = 1) -> List[Tuple[int, str]]:
+    """
+    Source d'événements factice: (message_id, texte), un identifiant par jeu et ses éditions successives
+    Numéros espacés d'au moins 2: le résultat ne dépend pas de l'ordre entre workers (règle des consécutifs)
+    """
+    rng = random.Random(seed)
+    events = []
+    number = first_number
+    for message_id in range(1, games + 1):
+        number += rng.choice([2, 3])
+        first = random_group(rng, rng.choice([2, 3]))
+        second = random_group(rng, rng.choice([2, 3]))
+        for step in range(edits):
+            events.append((message_id, f"⏰#N{number}. {step}({first[:4]}) - ({second[:4]})"))
+        events.extend([(message_id, f"#N{number}. 1({first}) - ✅5({second}) #T6")] * 2)
+    return events
+
+
+def _scale_worker(index: int, data_dir: str, db_path: str, events, split: int, barrier, done, kill_leader: bool):
+    """Worker: ingère tout le flux (comme chaque processus reçoit les mises à jour), une journée puis l'autre"""
+    logging.disable(logging.CRITICAL)
+    coordinator = Coordinator(db_path, worker_id=f"worker-{index}", lease_ttl=2.0)
+    manager = GameResultsManager(data_dir=data_dir, lock=FileLock(Path(data_dir) / "results.lock"))
+    sent_log = Path(data_dir) / "sent.log"
+    rng = random.Random(index)
+    last_tick = 0.0
+
+    def tick():
+        # Coordination: renouvellement du bail et envoi des notifications par le seul leader
+        nonlocal last_tick
+        if time.monotonic() - last_tick < 0.2:
+            return
+        last_tick = time.monotonic()
+        if coordinator.try_acquire():
+            for row_id, kind, payload in coordinator.pending():
+                with FileLock(sent_log.with_suffix('.lock')), open(sent_log, 'a', encoding='utf-8') as f:
+                    f.write(f"{coordinator.worker_id}\t{payload['text']}\n")
+                coordinator.mark_sent(row_id)
+
+    def ingest(batch):
+        for message_id, text in batch:
+            tick()
+            if coordinator.claim_message(1, message_id, text):
+                success, info = manager.process_message(text)
+                if success:
+                    coordinator.enqueue('message', {'text': info})
+            if rng.random() < 0.05:
+                time.sleep(0.001)
+
+    if index > 0:
+        time.sleep(0.1)  # le worker 0 démarre leader
+    tick()
+    ingest(events[:split])
+    barrier.wait()
+    if kill_leader and index == 0:
+        os._exit(0)  # arrêt brutal du leader: les autres doivent reprendre bail, remise à zéro et envois
+
+    run_name = "daily_reset:J1"
+    while not coordinator.has_run(run_name):
+        last_tick = 0.0
+        tick()
+        if coordinator.is_leader() and coordinator.run_once(run_name):
+            manager.rollover("J1")
+            break
+        time.sleep(0.2)
+
+    ingest(events[split:])
+    with done.get_lock():
+        done.value += 1
+    # Le leader vide la boîte d'envoi jusqu'à ce que tous les workers aient fini
+    expected = barrier.parties - (1 if kill_leader else 0)
+    while True:
+        last_tick = 0.0
+        tick()
+        if done.value >= expected and not coordinator.pending():
+            break
+        time.sleep(0.1)
+
+
+def bench_scale_out(workers: int, games: int, kill_leader: bool):
+    """Plusieurs processus partagent data/ et la base de coordination; vérifie l'absence de doublons"""
+    events = channel_event_stream(games)
+    split = len(events) // 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Référence: un seul processus, sans coordination
+        logging.disable(logging.CRITICAL)
+        reference = GameResultsManager(data_dir=os.path.join(tmp, "ref"))
+        reference_ok = sum(reference.process_message(text)[0] for _, text in events[:split])
+        reference_day1, _ = reference.rollover("J1")
+        reference_ok += sum(reference.process_message(text)[0] for _, text in events[split:])
+        reference_day2 = reference.get_all_results()
+
+        data_dir = os.path.join(tmp, "shared")
+        db_path = os.path.join(data_dir, "shared.db")
+        Coordinator(db_path).close()
+        ctx = multiprocessing.get_context('fork')
+        barrier = ctx.Barrier(workers)
+        done = ctx.Value('i', 0)
+        start = time.perf_counter()
+        processes = [ctx.Process(target=_scale_worker,
+                                 args=(i, data_dir, db_path, events, split, barrier, done, kill_leader))
+                     for i in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=120)
+        elapsed = time.perf_counter() - start
+
+        manager = GameResultsManager(data_dir=data_dir)
+        day1 = manager.load_frozen(Path(data_dir) / "game_results_J1.yaml")
+        day2 = manager.get_all_results()
+        sent = (Path(data_dir) / "sent.log").read_text(encoding='utf-8').splitlines()
+        senders = sorted({line.split('\t')[0] for line in sent})
+        coordinator = Coordinator(db_path)
+        resets = coordinator._db.execute("SELECT holder FROM runs").fetchall()
+        logging.disable(logging.NOTSET)
+
+    numbers = [r['numero'] for r in day1 + day2]
+    print(f"{workers} workers, {len(events)} événements reçus par chacun ({games} jeux), "
+          f"{'leader arrêté' if kill_leader else 'sans panne'}: {elapsed:.2f} s")
+    print(f"  Journée 1      : {len(day1)} parties (référence {len(reference_day1)})")
+    print(f"  Journée 2      : {len(day2)} parties (référence {len(reference_day2)})")
+    print(f"  Doublons       : {len(numbers) - len(set(numbers))}")
+    print(f"  Notifications  : {len(sent)} envoyées (attendu {reference_ok}, uniques {len(set(sent))}) "
+          f"par {', '.join(senders)}")
+    print(f"  Remises à zéro : {len(resets)} ({', '.join(holder for holder, in resets)})")
+    ok = (len(day1) == len(reference_day1) and len(day2) == len(reference_day2)
+          and len(numbers) == len(set(numbers)) and len(sent) == len(set(sent)) == reference_ok
+          and len(resets) == 1)
+    print(f"  Résultat       : {'✅ cohérent' if ok else '❌ incohérent'}")
+
+
+def bench_formats(count: int):
+    """Analyseur du format détecté contre la chaîne d'essais (#N puis jeu), pour chaque format"""
+    from message_formats import FormatDetector
+
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as tmp:
+        logging.disable(logging.CRITICAL)
+        manager = GameResultsManager(data_dir=tmp)
+        logging.disable(logging.NOTSET)
+
+    base = [message for message in edit_heavy_stream(count // 4 + 1) if '✅' in message][:count]
+    for label, messages in (("#N", base), ("Jeu #", [m.replace('#N', 'Jeu #') for m in base])):
+        detector = FormatDetector()
+        for message in messages[:detector.sample_size]:
+            detector.parse(message)
+
+        def chain():
+            for message in messages:
+                manager.extract_game_number(message)
+                manager.extract_parentheses_groups(message)
+
+        def detected():
+            for message in messages:
+                detector.parse(message)
+
+        timings = []
+        for run in (chain, detected):
+            best = float('inf')
+            for _ in range(5):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            timings.append(best / len(messages) * 1e6)
+        print(f"Format {label:<6} (détecté: {detector.name}): chaîne {timings[0]:.2f} µs | "
+              f"analyseur du format {timings[1]:.2f} µs par message")
+
+
+def bench_rules(count: int):
+    """Règles compilées (record_rules) contre les vérifications écrites à la main, sur les mêmes groupes"""
+    from record_rules import RuleSet, suit_counts, suit_mask_from_counts
+
+    rng = random.Random(5)
+    samples = []
+    for _ in range(count):
+        first = random_group(rng, rng.choice([2, 3]))
+        second = random_group(rng, rng.choice([2, 3]))
+        marker = rng.choice(['✅', '✅', '✅', '⏰', '🔰'])
+        samples.append((f"#N1. {marker}({first}) - ({second})", first, second))
+
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as tmp:
+        logging.disable(logging.CRITICAL)
+        manager = GameResultsManager(data_dir=tmp)
+        logging.disable(logging.NOTSET)
+    rules = RuleSet.default()
+
+    def hand_written(message, first, second):
+        if '⏰' in message or '🔰' in message or '✅' not in message:
+            return None
+        masks = (manager.suit_mask(first), manager.suit_mask(second))
+        first_ok = manager.count_cards(first) == 3 and manager.has_different_suits(first)
+        second_ok = manager.count_cards(second) == 3 and manager.has_different_suits(second)
+        if first_ok and second_ok:
+            return None, masks
+        return ('Joueur' if first_ok else 'Banquier' if second_ok else None), masks
+
+    def compiled(message, first, second):
+        if rules.marker_reject(message):
+            return None
+        profiles = [suit_counts(first), suit_counts(second)]
+        masks = (suit_mask_from_counts(profiles[0]), suit_mask_from_counts(profiles[1]))
+        return rules.winner(profiles)[0], masks
+
+    assert all(hand_written(*sample) == compiled(*sample) for sample in samples)
+    for label, check in (("écrites à la main", hand_written), ("compilées", compiled)):
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            for sample in samples:
+                check(*sample)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:>18}: {best / count * 1e6:.2f} µs par message")
+
+
+def bench_predictions(count: int, pending: int):
+    """
+    Latence de l'écouteur de prédictions par partie, avec `pending` prédictions manuelles en attente
+    (index de vérification) comparée à un parcours complet du stock, et coût d'une écriture groupée
+    """
+    from predictions import PredictionEngine
+    from yaml_manager import YAMLDataManager
+
+    results = synthetic_results(count)
+    rng = random.Random(1)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            logging.disable(logging.CRITICAL)
+            store = YAMLDataManager()
+            last = results[-1]['numero']
+            store._save_yaml(store.predictions_file, [
+                {'id': i + 1, 'game_number': rng.randint(1, last), 'suit_combination': rng.choice(['♠️♥️', '♦️', '♣️']),
+                 'status': '⌛', 'chat_id': None, 'prediction_type': 'manual'}
+                for i in range(pending)])
+
+            # Référence: parcours complet des prédictions en attente à chaque résultat
+            start = time.perf_counter()
+            scan_rounds = 3
+            for result in results[:scan_rounds]:
+                [p for p in store.get_pending_predictions() if p['game_number'] <= result['numero'] + 2]
+            scan = (time.perf_counter() - start) / scan_rounds
+
+            start = time.perf_counter()
+            engine = PredictionEngine(store)
+            load = time.perf_counter() - start
+            latencies = []
+            for result in results:
+                start = time.perf_counter()
+                engine.record(-100, result)
+                latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            asyncio.run(engine.flush())
+            flush = time.perf_counter() - start
+            summary = engine.summary(-100)
+
+        finally:
+            logging.disable(logging.NOTSET)
+            os.chdir(cwd)
+
+    latencies.sort()
+    print(f"{count} parties, {pending} prédictions manuelles en attente (index construit en {load * 1000:.0f} ms)")
+    print(f"  record() avec index : p50 {latencies[len(latencies) // 2] * 1e6:.1f} µs "
+          f"| p99 {latencies[int(len(latencies) * .99)] * 1e6:.1f} µs | max {latencies[-1] * 1e6:.1f} µs")
+    print(f"  Parcours complet    : {scan * 1000:.0f} ms par résultat (lecture du stock, sans vérification)")
+    print(f"  Écriture groupée ({len(engine.index)} encore en attente): {flush * 1000:.0f} ms (thread)")
+    print(f"  Précision sur données aléatoires: {summary['accuracy']:.1f}% (≈50% attendu)")
+
+
+async def _load_test(channel_count: int, games: int, edits: int, rate: float, send_delay: float,
+                     commands_every: int):
+    import importlib
+    import re
+    import fake_telegram
+
+    fake_telegram.install(send_delay=send_delay)
+    main = importlib.import_module('main')
+    client = main.client
+    source = fake_telegram.FakeEventSource(client, main.ADMIN_ID)
+
+    channel_ids = [-1001000000000 - i for i in range(1, channel_count + 1)]
+    streams = {channel_id: channel_event_stream(games, edits, seed=i, first_number=i * 1000000)
+               for i, channel_id in enumerate(channel_ids, 1)}
+
+    # Horodatages: premier événement finalisé (✅) par jeu, enregistrement, notification
+    event_at: Dict[int, float] = {}
+    persisted_at: Dict[int, float] = {}
+    notified_at: Dict[int, float] = {}
+    main.channels.add_listener(lambda channel_id, result: persisted_at.setdefault(result['numero'],
+                                                                                  time.perf_counter()))
+    recorded = re.compile(r"Jeu #(\d+) enregistré")
+
+    def on_send(sent):
+        match = recorded.search(sent.text)
+        if match and sent.entity == main.ADMIN_ID:
+            notified_at.setdefault(int(match.group(1)), sent.at)
+    client.add_send_listener(on_send)
+
+    await main.start_bot()
+    main.channels.start(main.process_channel_message)
+    for channel_id in channel_ids:
+        await source.bot_added(channel_id)
+        await source.command(f"/set_channel {channel_id}")
+
+    dispatch: List[float] = []
+    commands: List[float] = []
+    number_pattern = re.compile(r"#N(\d+)")
+
+    async def replay(channel_id: int, stream: List[Tuple[int, str]]):
+        seen = set()
+        for index, (message_id, text) in enumerate(stream):
+            if '✅' in text:
+                event_at.setdefault(int(number_pattern.search(text).group(1)), time.perf_counter())
+            start = time.perf_counter()
+            if message_id in seen:
+                await source.edit(channel_id, message_id, text)
+            else:
+                seen.add(message_id)
+                await source.post(channel_id, message_id, text)
+            dispatch.append(time.perf_counter() - start)
+            # Rafale: toutes les éditions d'un jeu arrivent d'un coup, puis pause jusqu'au jeu suivant
+            if index + 1 < len(stream) and stream[index + 1][0] != message_id:
+                await asyncio.sleep(1 / rate)
+
+    async def admin():
+        period = commands_every / rate
+        for command in itertools.cycle(['/stats', '/status', '/channels', '/stats 20', '/predictions']):
+            await asyncio.sleep(period)
+            commands.append(await source.command(command))
+
+    admin_task = asyncio.create_task(admin()) if commands_every else None
+    start = time.perf_counter()
+    await asyncio.gather(*(replay(channel_id, stream) for channel_id, stream in streams.items()))
+    for store in main.channels:
+        await store.queue.join()
+    elapsed = time.perf_counter() - start
+    if admin_task is not None:
+        admin_task.cancel()
+    for store in main.channels:
+        await store.stop()
+
+    expected = 0
+    for channel_id, stream in streams.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            reference = GameResultsManager(data_dir=tmp)
+            expected += sum(reference.process_message(text)[0] for _, text in stream)
+
+    def pct(values, p):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else 0.0
+
+    def line(label, values):
+        print(f"  {label:<26}: p50 {pct(values, .5):7.2f} ms | p95 {pct(values, .95):7.2f} ms "
+              f"| p99 {pct(values, .99):7.2f} ms ({len(values)})")
+
+    total_events = sum(len(stream) for stream in streams.values())
+    by_method: Dict[str, int] = {}
+    for sent in client.sent:
+        by_method[sent.method] = by_method.get(sent.method, 0) + 1
+    print(f"{channel_count} canal(aux), {games} jeux × {edits + 2} événements, {rate:g} jeux/s par canal, "
+          f"envoi simulé {send_delay * 1000:g} ms")
+    print(f"  Débit                     : {total_events} événements en {elapsed:.2f} s "
+          f"({total_events / elapsed:.0f}/s)")
+    print(f"  Parties enregistrées      : {len(persisted_at)} (attendu {expected})")
+    line("Handler (dispatch)", dispatch)
+    line("Événement → enregistrement", [persisted_at[n] - event_at[n] for n in persisted_at if n in event_at])
+    line("Événement → notification", [notified_at[n] - event_at[n] for n in notified_at if n in event_at])
+    if commands:
+        line("Commandes admin", commands)
+    print("  Envois sortants           : " + ', '.join(f"{method} {count}" for method, count in sorted(by_method.items())))
+
+
+def bench_load_test(channel_count: int, games: int, edits: int, rate: float, send_delay: float,
+                    commands_every: int):
+    """
+    Test de charge hors ligne des handlers de main.py avec un client Telegram factice
+    Exécuté dans un répertoire temporaire (data/, bot_config.json, bot.log)
+    """
+    os.environ.update({'API_ID': '1', 'API_HASH': 'hors-ligne', 'BOT_TOKEN': '0:hors-ligne', 'ADMIN_ID': '4242'})
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.pop('SHARED_DB', None)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            asyncio.run(_load_test(channel_count, games, edits, rate, send_delay, commands_every))
+        finally:
+            os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du bot")
+    sub = parser.add_subparsers(dest='name', required=True)
+
+    p = sub.add_parser('parse_cache', help="Cache LRU d'analyse des messages")
+    p.add_argument('--games', type=int, default=100)
+
+    p = sub.add_parser('compact', help="Mémoire de l'encodage compact des résultats")
+    p.add_argument('--count', type=int, default=100000)
+
+    p = sub.add_parser('analytics', help="Moteur d'analyse vectorisé contre boucles Python")
+    p.add_argument('--count', type=int, default=100000)
+
+    p = sub.add_parser('backtest', help="Backtest vectorisé des stratégies contre boucles Python")
+    p.add_argument('--count', type=int, default=100000)
+    p.add_argument('--workers', type=int, default=4)
+
+    p = sub.add_parser('deploy', help="Package /deploy en mémoire et cache")
+    p.add_argument('--calls', type=int, default=50)
+
+    p = sub.add_parser('import', help="Import en flux d'exports Excel/CSV")
+    p.add_argument('--rows', type=int, default=100000)
+    p.add_argument('--store-rows', type=int, default=20000, help="Lignes du réimport dédoublonné")
+
+    p = sub.add_parser('export', help="Exports partiels filtrés (/fichier)")
+    p.add_argument('--count', type=int, default=100000)
+
+    p = sub.add_parser('day_archive', help="Archives quotidiennes compressées")
+    p.add_argument('--games', type=int, default=1500, help="Parties de la journée")
+    p.add_argument('--edits', type=int, default=3)
+
+    p = sub.add_parser('metrics', help="Surcoût de l'instrumentation")
+    p.add_argument('--iterations', type=int, default=200000)
+
+    p = sub.add_parser('live_feed', help="Diffusion SSE vers de nombreux clients")
+    p.add_argument('--clients', type=int, default=300)
+    p.add_argument('--slow', type=int, default=5)
+    p.add_argument('--games', type=int, default=100)
+    p.add_argument('--rate', type=float, default=20.0, help="Parties publiées par seconde")
+
+    p = sub.add_parser('logging', help="Coût de la journalisation par message")
+    p.add_argument('--messages', type=int, default=20000)
+
+    p = sub.add_parser('scale_out', help="Plusieurs workers sur un stockage partagé (doublons, leader)")
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--games', type=int, default=200)
+    p.add_argument('--kill-leader', action='store_true', help="Arrête brutalement le leader à mi-parcours")
+
+    p = sub.add_parser('formats', help="Analyseurs par format de message")
+    p.add_argument('--count', type=int, default=20000)
+
+    p = sub.add_parser('rules', help="Règles d'enregistrement compilées")
+    p.add_argument('--count', type=int, default=50000)
+
+    p = sub.add_parser('predictions', help="Latence du moteur de prédictions")
+    p.add_argument('--count', type=int, default=10000)
+    p.add_argument('--pending', type=int, default=2000, help="Prédictions manuelles en attente")
+
+    p = sub.add_parser('load_test', help="Handlers de main.py avec un client Telegram factice")
+    p.add_argument('--channels', type=int, default=2)
+    p.add_argument('--games', type=int, default=200, help="Jeux par canal")
+    p.add_argument('--edits', type=int, default=3, help="Éditions ⏰ par jeu (rafale)")
+    p.add_argument('--rate', type=float, default=50.0, help="Jeux par seconde et par canal")
+    p.add_argument('--send-delay', type=float, default=0.0, help="Latence simulée des envois (secondes)")
+    p.add_argument('--commands-every', type=int, default=20, help="Une commande admin tous les N jeux (0: aucune)")
+
+    args = parser.parse_args()
+    if args.name == 'parse_cache':
+        bench_parse_cache(args.games)
+    elif args.name == 'compact':
+        bench_compact(args.count)
+    elif args.name == 'analytics':
+        bench_analytics(args.count)
+    elif args.name == 'backtest':
+        bench_backtest(args.count, args.workers)
+    elif args.name == 'deploy':
+        bench_deploy(args.calls)
+    elif args.name == 'import':
+        bench_import(args.rows, args.store_rows)
+    elif args.name == 'export':
+        bench_export(args.count)
+    elif args.name == 'day_archive':
+        bench_day_archive(args.games, args.edits)
+    elif args.name == 'metrics':
+        bench_metrics(args.iterations)
+    elif args.name == 'live_feed':
+        bench_live_feed(args.clients, args.slow, args.games, args.rate)
+    elif args.name == 'logging':
+        bench_logging(args.messages)
+    elif args.name == 'formats':
+        bench_formats(args.count)
+    elif args.name == 'rules':
+        bench_rules(args.count)
+    elif args.name == 'predictions':
+        bench_predictions(args.count, args.pending)
+    elif args.name == 'load_test':
+        bench_load_test(args.channels, args.games, args.edits, args.rate, args.send_delay, args.commands_every)
+    elif args.name == 'scale_out':
+        bench_scale_out(args.workers, args.games, args.kill_leader)
+
+
+if __name__ == '__main__':
+    main()
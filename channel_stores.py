@@ -0,0 +1,206 @@
+"""
+Surveillance de plusieurs canaux dans un même processus
+Chaque canal a son propre stockage (résultats, index, archives, fenêtres glissantes)
+et sa propre file de traitement: une rafale sur un canal ne retarde pas les autres
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from day_archive import DayArchive
+from game_results_manager import GameResultsManager
+from history_archive import HistoryArchive
+from live_stats import LiveStats, DEFAULT_WINDOWS
+from metrics import Gauge
+from record_rules import RuleSet
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_QUEUE_DEPTH = Gauge('bot_channel_queue_depth', "Messages en attente de traitement par canal", ['channel'])
+
+# Traitement d'un message: handler(store, message_id, texte, édité)
+MessageHandler = Callable[['ChannelStore', int, str, bool], Awaitable[None]]
+# Écouteur commun à tous les canaux: callback(channel_id, résultat)
+ChannelListener = Callable[[int, Dict[str, Any]], None]
+
+
+class ChannelStore:
+    """Stockage et file de traitement d'un canal surveillé"""
+
+    def __init__(self, channel_id: int, title: str, data_dir: Path,
+                 windows: Iterable[int] = DEFAULT_WINDOWS, queue_size: int = 1000, file_suffix: str = '',
+                 lock=None, rules: Optional[RuleSet] = None, previous_day=None):
+        self.channel_id = channel_id
+        self.title = title
+        # Suffixe des fichiers exportés (vide pour le canal historique stocké dans data/)
+        self.file_suffix = file_suffix
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.results = GameResultsManager(data_dir=str(self.data_dir), lock=lock, rules=rules,
+                                          previous_day=previous_day)
+        self.archive = HistoryArchive(archive_dir=str(self.data_dir / "archive"))
+        # Journal des messages bruts du jour et archives quotidiennes compressées
+        self.day_archive = DayArchive(self.data_dir, channel_id)
+        self.live_stats = LiveStats(windows, state_file=str(self.data_dir / "live_stats.yaml"))
+        self.results.add_listener(self.live_stats.record)
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._worker: Optional[asyncio.Task] = None
+        self._stats_writer: Optional[asyncio.Task] = None
+        self._journal_writer: Optional[asyncio.Task] = None
+        CHANNEL_QUEUE_DEPTH.labels(channel=channel_id).set_function(self.queue.qsize)
+
+    def start(self, handler: MessageHandler):
+        if self._worker is None:
+            # Enregistrements faits dans un thread (mode multi-workers): écouteurs rappelés sur la boucle
+            self.results.loop = asyncio.get_running_loop()
+            self._worker = asyncio.create_task(self._run(handler))
+            # État des fenêtres glissantes écrit périodiquement, hors du chemin d'enregistrement
+            self._stats_writer = asyncio.create_task(self.live_stats.run())
+            # Journal des messages écrit par lots, hors de la boucle
+            self._journal_writer = asyncio.create_task(self.day_archive.journal.run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._stats_writer is not None:
+            writer, self._stats_writer = self._stats_writer, None
+            writer.cancel()
+            await asyncio.gather(writer, return_exceptions=True)
+            # Dernière écriture de l'état (sans effet s'il est déjà écrit)
+            await self.live_stats.flush()
+        if self._journal_writer is not None:
+            writer, self._journal_writer = self._journal_writer, None
+            writer.cancel()
+            await asyncio.gather(writer, return_exceptions=True)
+            await self.day_archive.journal.flush()
+        CHANNEL_QUEUE_DEPTH.labels(channel=self.channel_id).set_function(lambda: 0)
+
+    def rollover(self, day: str) -> Tuple[List[Dict[str, Any]], Path]:
+        """Bascule de journée: résultats figés (voir GameResultsManager.rollover) et journal des messages figé"""
+        frozen = self.results.rollover(day)
+        self.day_archive.journal.rotate(day)
+        return frozen
+
+    async def submit(self, message_id: int, text: str, edited: bool):
+        """Met un message en file (attend si la file du canal est pleine: pression limitée à ce canal)"""
+        await self.queue.put((message_id, text, edited))
+
+    async def _run(self, handler: MessageHandler):
+        """Traite les messages du canal dans l'ordre d'arrivée"""
+        while True:
+            message_id, text, edited = await self.queue.get()
+            try:
+                await handler(self, message_id, text, edited)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("❌ Erreur traitement message du canal %s: %s", self.channel_id, e)
+            finally:
+                self.queue.task_done()
+
+
+class ChannelRegistry:
+    """Ensemble des canaux surveillés, dans l'ordre de configuration"""
+
+    def __init__(self, base_dir: str = "data", windows: Iterable[int] = DEFAULT_WINDOWS,
+                 legacy_channel: Optional[int] = None, lock_factory: Optional[Callable[[Path], Any]] = None,
+                 previous_day_factory: Optional[Callable[[int], Any]] = None):
+        self.base_dir = Path(base_dir)
+        self.windows = list(windows)
+        # Fabrique de verrou par répertoire de canal (mode multi-workers), None en mode simple
+        self.lock_factory = lock_factory
+        # Fabrique des jeux de la journée figée par canal (partagés en mode multi-workers), None: en mémoire
+        self.previous_day_factory = previous_day_factory
+        # Le premier canal configuré garde le stockage historique de data/
+        self.legacy_channel = legacy_channel
+        # Règles d'enregistrement communes à tous les canaux (None: règles par défaut)
+        self.rules: Optional[RuleSet] = None
+        self._stores: Dict[int, ChannelStore] = {}
+        self._listeners: List[Tuple[ChannelListener, bool]] = []
+        self._handler: Optional[MessageHandler] = None
+
+    def data_dir_for(self, channel_id: int) -> Path:
+        if self.legacy_channel is None:
+            self.legacy_channel = channel_id
+        if channel_id == self.legacy_channel:
+            return self.base_dir
+        return self.base_dir / "channels" / str(abs(channel_id))
+
+    def add(self, channel_id: int, title: Optional[str] = None) -> ChannelStore:
+        """Ajoute un canal (sans effet s'il est déjà surveillé, hormis la mise à jour du titre)"""
+        store = self._stores.get(channel_id)
+        if store is not None:
+            if title:
+                store.title = title
+            return store
+
+        data_dir = self.data_dir_for(channel_id)
+        suffix = '' if data_dir == self.base_dir else f"_{abs(channel_id)}"
+        lock = self.lock_factory(data_dir) if self.lock_factory else None
+        previous_day = self.previous_day_factory(channel_id) if self.previous_day_factory else None
+        store = ChannelStore(channel_id, title or f"Canal {channel_id}", data_dir, self.windows,
+                             file_suffix=suffix, lock=lock, rules=self.rules, previous_day=previous_day)
+        for callback, thread_safe in self._listeners:
+            self._attach(store, callback, thread_safe)
+        self._stores[channel_id] = store
+        if self._handler is not None:
+            store.start(self._handler)
+        logger.info("📡 Canal ajouté: %s (%s)", store.title, channel_id)
+        return store
+
+    async def remove(self, channel_id: int) -> Optional[ChannelStore]:
+        """Arrête la surveillance d'un canal; ses données restent sur le disque"""
+        store = self._stores.pop(channel_id, None)
+        if store is not None:
+            await store.stop()
+            logger.info("📴 Canal retiré: %s (%s)", store.title, channel_id)
+        return store
+
+    def get(self, channel_id: Optional[int]) -> Optional[ChannelStore]:
+        return self._stores.get(channel_id)
+
+    @property
+    def primary(self) -> Optional[ChannelStore]:
+        """Canal par défaut des commandes et routes sans canal explicite"""
+        return next(iter(self._stores.values()), None)
+
+    def ids(self) -> List[int]:
+        return list(self._stores)
+
+    def __iter__(self) -> Iterator[ChannelStore]:
+        return iter(list(self._stores.values()))
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    def __contains__(self, channel_id) -> bool:
+        return channel_id in self._stores
+
+    def set_rules(self, rules: RuleSet):
+        """Applique de nouvelles règles d'enregistrement à tous les canaux (et aux canaux ajoutés ensuite)"""
+        self.rules = rules
+        for store in self._stores.values():
+            store.results.set_rules(rules)
+
+    def add_listener(self, callback: ChannelListener, thread_safe: bool = False):
+        """
+        Écouteur appelé avec (channel_id, résultat) pour chaque partie enregistrée, tous canaux confondus
+        thread_safe: voir GameResultsManager.add_listener
+        """
+        self._listeners.append((callback, thread_safe))
+        for store in self._stores.values():
+            self._attach(store, callback, thread_safe)
+
+    @staticmethod
+    def _attach(store: ChannelStore, callback: ChannelListener, thread_safe: bool = False):
+        store.results.add_listener(lambda result: callback(store.channel_id, result), thread_safe)
+
+    def start(self, handler: MessageHandler):
+        """Démarre une tâche de traitement par canal (à appeler dans la boucle asyncio)"""
+        self._handler = handler
+        for store in self._stores.values():
+            store.start(handler)
@@ -0,0 +1,208 @@
+"""
+Encodage compact des résultats de jeux
+Chaque carte tient sur un octet (rang << 2 | couleur), chaque résultat sur 15 octets
+"""
+import re
+import struct
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+
+# Rangs: 1 (A) à 13 (K); 0 signifie "pas de carte"
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+RANK_CODES = {rank: code for code, rank in enumerate(RANKS, 1)}
+
+# Couleurs: même ordre que les bits de SUIT_BITS (♠=0, ♥=1, ♦=2, ♣=3)
+SUITS = ['♠', '♥', '♦', '♣']
+SUIT_CODES = {'♠': 0, '♥': 1, '❤': 1, '♦': 2, '♣': 3}
+SUIT_EMOJIS = ['♠️', '♥️', '♦️', '♣️']
+
+# Gagnant: 0 = aucun, 1 = Joueur, 2 = Banquier
+WINNERS = [None, 'Joueur', 'Banquier']
+WINNER_CODES = {None: 0, 'Joueur': 1, 'Banquier': 2}
+
+# Nombre maximal de cartes par groupe
+CARDS_PER_GROUP = 3
+
+# Format binaire fixe: numéro (u32), horodatage (u32), gagnant (u8), 2 x 3 cartes
+RECORD_STRUCT = struct.Struct('<IIB6s')
+
+CARD_PATTERN = re.compile(r"(10|[2-9AJQK])\s*([♠♥♦♣❤])\ufe0f?", re.IGNORECASE)
+
+
+def encode_card(rank: str, suit: str) -> int:
+    """Encode une carte sur un octet"""
+    return (RANK_CODES[rank.upper()] << 2) | SUIT_CODES[suit]
+
+
+def decode_card(code: int) -> str:
+    """Décode un octet en carte affichable (ex: 'K♠️')"""
+    return RANKS[(code >> 2) - 1] + SUIT_EMOJIS[code & 3]
+
+
+def encode_group(group_str: str) -> bytes:
+    """Encode un groupe de cartes sur CARDS_PER_GROUP octets (complété par des zéros)"""
+    codes = [encode_card(rank, suit) for rank, suit in CARD_PATTERN.findall(group_str or '')]
+    codes = codes[:CARDS_PER_GROUP]
+    return bytes(codes) + bytes(CARDS_PER_GROUP - len(codes))
+
+
+def decode_group(data: bytes) -> str:
+    """Décode un groupe de cartes encodé"""
+    return ''.join(decode_card(code) for code in data if code)
+
+
+def encode_timestamp(date_str: str, time_str: str) -> int:
+    """Convertit date (YYYY-MM-DD) et heure (HH:MM:SS) en secondes (heure murale, sans fuseau)"""
+    try:
+        moment = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return 0
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+def decode_timestamp(timestamp: int) -> datetime:
+    """Reconvertit un horodatage encodé en datetime naïf"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _second_group(result: Dict[str, Any]) -> str:
+    """Retrouve le deuxième groupe (champ dédié ou message complet pour les anciens résultats)"""
+    if result.get('cartes_groupe2') is not None:
+        return result['cartes_groupe2']
+    groups = re.findall(r"\(([^)]*)\)", result.get('message_complet') or '')
+    return groups[1] if len(groups) > 1 else ''
+
+
+class CompactResult:
+    """Résultat de jeu compact (15 octets sérialisés)"""
+
+    __slots__ = ('numero', 'timestamp', 'winner', 'cards')
+
+    def __init__(self, numero: int, timestamp: int, winner: int, cards: bytes):
+        self.numero = numero
+        self.timestamp = timestamp
+        self.winner = winner
+        self.cards = cards
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> 'CompactResult':
+        """Construit un résultat compact depuis le format YAML actuel"""
+        cards = encode_group(result.get('cartes_groupe1', '')) + encode_group(_second_group(result))
+        return cls(
+            int(result.get('numero', 0)),
+            encode_timestamp(result.get('date', ''), result.get('heure', '')),
+            WINNER_CODES.get(result.get('gagnant'), 0),
+            cards
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Reconvertit vers le format YAML (sans message_complet, non conservé)"""
+        moment = decode_timestamp(self.timestamp)
+        return {
+            'numero': self.numero,
+            'date': moment.strftime('%Y-%m-%d'),
+            'heure': moment.strftime('%H:%M:%S'),
+            'cartes_groupe1': decode_group(self.cards[:CARDS_PER_GROUP]),
+            'cartes_groupe2': decode_group(self.cards[CARDS_PER_GROUP:]),
+            'gagnant': WINNERS[self.winner]
+        }
+
+    def pack(self) -> bytes:
+        """Sérialise le résultat au format binaire fixe"""
+        return RECORD_STRUCT.pack(self.numero, self.timestamp, self.winner, self.cards)
+
+    @classmethod
+    def unpack(cls, data: bytes, offset: int = 0) -> 'CompactResult':
+        """Désérialise un résultat depuis le format binaire fixe"""
+        return cls(*RECORD_STRUCT.unpack_from(data, offset))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactResult):
+            return NotImplemented
+        return (self.numero, self.timestamp, self.winner, self.cards) == \
+            (other.numero, other.timestamp, other.winner, other.cards)
+
+    def __repr__(self) -> str:
+        return f"CompactResult(#{self.numero}, {WINNERS[self.winner]}, {self.to_dict()['cartes_groupe1']})"
+
+
+class CompactResultArray:
+    """
+    Stockage en colonnes de résultats compacts
+    Une colonne array/bytearray par champ, sans objet Python par résultat
+    """
+
+    __slots__ = ('numeros', 'timestamps', 'winners', 'cards')
+
+    def __init__(self):
+        self.numeros = array('I')
+        self.timestamps = array('I')
+        self.winners = bytearray()
+        self.cards = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.numeros)
+
+    def __getitem__(self, index: int) -> CompactResult:
+        if index < 0:
+            index += len(self)
+        start = index * 2 * CARDS_PER_GROUP
+        return CompactResult(
+            self.numeros[index],
+            self.timestamps[index],
+            self.winners[index],
+            bytes(self.cards[start:start + 2 * CARDS_PER_GROUP])
+        )
+
+    def __iter__(self) -> Iterator[CompactResult]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, record: CompactResult):
+        """Ajoute un résultat compact"""
+        self.numeros.append(record.numero)
+        self.timestamps.append(record.timestamp)
+        self.winners.append(record.winner)
+        self.cards += record.cards
+
+    def append_dict(self, result: Dict[str, Any]):
+        """Ajoute un résultat au format YAML"""
+        self.append(CompactResult.from_dict(result))
+
+    @classmethod
+    def from_dicts(cls, results: Iterable[Dict[str, Any]]) -> 'CompactResultArray':
+        """Construit le stockage compact depuis une liste de résultats YAML"""
+        compact = cls()
+        for result in results:
+            compact.append_dict(result)
+        return compact
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Reconvertit tous les résultats vers le format YAML (pour les exports)"""
+        return [record.to_dict() for record in self]
+
+    def to_bytes(self) -> bytes:
+        """Sérialise tous les résultats (RECORD_STRUCT.size octets par résultat)"""
+        return b''.join(record.pack() for record in self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactResultArray':
+        """Désérialise un ensemble de résultats produit par to_bytes"""
+        compact = cls()
+        for offset in range(0, len(data) - RECORD_STRUCT.size + 1, RECORD_STRUCT.size):
+            compact.append(CompactResult.unpack(data, offset))
+        return compact
+
+    def memory_bytes(self) -> int:
+        """Mémoire occupée par les données des colonnes"""
+        return (self.numeros.itemsize * len(self.numeros)
+                + self.timestamps.itemsize * len(self.timestamps)
+                + len(self.winners) + len(self.cards))
+
+    def find(self, numero: int) -> Optional[CompactResult]:
+        """Recherche un résultat par numéro de jeu"""
+        try:
+            return self[self.numeros.index(numero)]
+        except ValueError:
+            return None
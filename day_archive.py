@@ -0,0 +1,243 @@
+"""
+Archives quotidiennes compressées (gzip, un fichier par journée et par canal)
+Les messages bruts du canal sont journalisés au fil de la journée (JSON Lines, ajout seul); à la
+bascule, le journal et les résultats de la journée sont écrits dans <jour>.jsonl.gz, précédés
+d'une ligne d'en-tête (compteurs, bornes des numéros). Les lecteurs sont des générateurs qui
+décompressent au fil de la lecture; la rétention supprime les archives trop anciennes
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILES = Counter('bot_day_archives', "Archives quotidiennes écrites ou supprimées", ['operation'])
+
+FORMAT_VERSION = 1
+RESULT = 'result'
+MESSAGE = 'message'
+
+
+class RetentionPolicy:
+    """
+    Durées de conservation: archives quotidiennes (jours, et taille totale maximale en Mo)
+    et prédictions (planifications automatiques et historique des prédictions vérifiées); None = pas de limite
+    """
+
+    def __init__(self, archive_days: Optional[int] = 90, max_archive_mb: Optional[float] = None,
+                 prediction_days: Optional[int] = 30):
+        self.archive_days = archive_days
+        self.max_archive_mb = max_archive_mb
+        self.prediction_days = prediction_days
+
+    def cutoff(self, days: Optional[int], today: Optional[date] = None) -> Optional[str]:
+        """Date ISO la plus ancienne conservée (None si pas de limite)"""
+        if days is None:
+            return None
+        return ((today or date.today()) - timedelta(days=days)).isoformat()
+
+    def describe(self) -> str:
+        archive = f"{self.archive_days} jours" if self.archive_days is not None else "illimitée"
+        if self.max_archive_mb is not None:
+            archive += f", {self.max_archive_mb:g} Mo max"
+        predictions = f"{self.prediction_days} jours" if self.prediction_days is not None else "illimitée"
+        return f"archives: {archive}, prédictions: {predictions}"
+
+
+class MessageJournal:
+    """
+    Messages bruts de la journée en cours (une ligne JSON par message ou édition)
+    Les ajouts sont mis en tampon et écrits par lots (voir run), hors de la boucle d'événements.
+    Le fichier est rouvert à chaque lot: après une bascule (renommage), même par un autre
+    worker, les lots suivants vont dans le nouveau journal
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / "messages_journal.jsonl"
+        self._pending: List[str] = []
+        # Sérialise les écritures de lots (thread) et la bascule (boucle)
+        self._write_lock = threading.Lock()
+
+    def append(self, message_id: int, text: str, edited: bool):
+        line = json.dumps({'kind': MESSAGE, 'id': message_id, 'at': datetime.now().isoformat(timespec='seconds'),
+                           'edited': edited, 'text': text}, ensure_ascii=False)
+        self._pending.append(line + '\n')
+
+    def write_pending(self):
+        """Écrit les lignes en attente en un seul ajout (remises en tête du tampon en cas d'échec)"""
+        with self._write_lock:
+            self._write_batch()
+
+    def _write_batch(self):
+        lines, self._pending = self._pending, []
+        if not lines:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+        except Exception:
+            self._pending[:0] = lines
+            raise
+
+    async def flush(self):
+        try:
+            await asyncio.to_thread(self.write_pending)
+        except Exception as e:
+            logger.error("❌ Erreur écriture journal des messages: %s", e)
+
+    async def run(self, interval: float = 1.0):
+        """Tâche de fond: écriture des messages en attente toutes les `interval` secondes, et à l'arrêt"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                if self._pending:
+                    await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    def frozen_path(self, day: str) -> Path:
+        return self.data_dir / f"messages_{day}.jsonl"
+
+    def rotate(self, day: str) -> Path:
+        """Fige le journal de la journée (renommage; ajouté à la suite si la journée est déjà figée)"""
+        frozen = self.frozen_path(day)
+        with self._write_lock:
+            # Les messages encore en tampon appartiennent à la journée figée
+            self._write_batch()
+            if not self.path.exists():
+                return frozen
+            if frozen.exists():
+                with open(self.path, 'rb') as source, open(frozen, 'ab') as target:
+                    target.write(source.read())
+                self.path.unlink()
+            else:
+                os.replace(self.path, frozen)
+        return frozen
+
+
+def _count_lines(path: Path) -> int:
+    count = 0
+    with open(path, 'rb') as f:
+        for _ in f:
+            count += 1
+    return count
+
+
+class DayArchive:
+    """Archives <jour>.jsonl.gz d'un canal: écriture à la bascule, lecture en flux, rétention"""
+
+    def __init__(self, data_dir: Path, channel_id: Optional[int] = None, compresslevel: int = 6):
+        self.data_dir = Path(data_dir)
+        self.archive_dir = self.data_dir / "archives"
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.channel_id = channel_id
+        self.compresslevel = compresslevel
+        self.journal = MessageJournal(self.data_dir)
+
+    def path_for(self, day: str) -> Path:
+        return self.archive_dir / f"{day}.jsonl.gz"
+
+    def days(self) -> List[str]:
+        """Journées archivées, de la plus ancienne à la plus récente"""
+        return sorted(path.name[:-len('.jsonl.gz')] for path in self.archive_dir.glob("*.jsonl.gz"))
+
+    def write_day(self, day: str, results: Iterable[Dict[str, Any]]) -> Path:
+        """
+        Écrit l'archive d'une journée (résultats puis messages du journal figé) et supprime le journal
+        Écriture dans un fichier temporaire puis renommage: une archive présente est toujours complète
+        Relancée après une interruption, l'écriture reprend sans doublon
+        """
+        path = self.path_for(day)
+        frozen = self.journal.frozen_path(day)
+        if path.exists():
+            frozen.unlink(missing_ok=True)
+            return path
+
+        results = list(results)
+        numbers = [result.get('numero', 0) for result in results]
+        header = {
+            'kind': 'header',
+            'format': FORMAT_VERSION,
+            'day': day,
+            'channel_id': self.channel_id,
+            'results': len(results),
+            'messages': _count_lines(frozen) if frozen.exists() else 0,
+            'first_game': min(numbers) if numbers else None,
+            'last_game': max(numbers) if numbers else None,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+        tmp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=self.compresslevel) as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for result in results:
+                f.write(json.dumps(dict(result, kind=RESULT), ensure_ascii=False, default=str) + '\n')
+            if frozen.exists():
+                with open(frozen, 'r', encoding='utf-8') as journal:
+                    for line in journal:
+                        f.write(line)
+        os.replace(tmp_path, path)
+        frozen.unlink(missing_ok=True)
+        ARCHIVE_FILES.labels(operation='write').inc()
+        logger.info("🗜️ Journée %s compressée: %s résultats, %s messages (%.1f Ko)",
+                    day, header['results'], header['messages'], path.stat().st_size / 1024)
+        return path
+
+    def read_header(self, day: str) -> Dict[str, Any]:
+        """En-tête d'une archive (seule la première ligne est décompressée)"""
+        with gzip.open(self.path_for(day), 'rt', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+    def iter_records(self, day: str, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Enregistrements d'une archive (résultats et/ou messages), décompressés au fil de la lecture"""
+        with gzip.open(self.path_for(day), 'rt', encoding='utf-8') as f:
+            f.readline()
+            for line in f:
+                record = json.loads(line)
+                if kind is None or record.get('kind') == kind:
+                    yield record
+
+    def iter_results(self, day: str) -> Iterator[Dict[str, Any]]:
+        for record in self.iter_records(day, RESULT):
+            record.pop('kind', None)
+            yield record
+
+    def iter_messages(self, day: str) -> Iterator[Dict[str, Any]]:
+        return self.iter_records(day, MESSAGE)
+
+    def total_size(self) -> int:
+        return sum(path.stat().st_size for path in self.archive_dir.glob("*.jsonl.gz"))
+
+    def apply_retention(self, policy: RetentionPolicy, today: Optional[date] = None) -> List[str]:
+        """Supprime les archives plus anciennes que la politique, puis les plus anciennes au-delà de la taille maximale"""
+        removed = []
+        cutoff = policy.cutoff(policy.archive_days, today)
+        days = self.days()
+        if cutoff is not None:
+            removed = [day for day in days if day < cutoff]
+        if policy.max_archive_mb is not None:
+            limit = policy.max_archive_mb * 1024 * 1024
+            sizes = {day: self.path_for(day).stat().st_size for day in days}
+            total = sum(size for day, size in sizes.items() if day not in removed)
+            for day in days:
+                if total <= limit:
+                    break
+                if day not in removed:
+                    removed.append(day)
+                    total -= sizes[day]
+        for day in removed:
+            self.path_for(day).unlink(missing_ok=True)
+            ARCHIVE_FILES.labels(operation='delete').inc()
+        if removed:
+            logger.info("🧹 Rétention: %s archive(s) supprimée(s) (%s → %s)", len(removed), removed[0], removed[-1])
+        return removed
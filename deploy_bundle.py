@@ -0,0 +1,235 @@
+"""
+Package de déploiement Render.com (/deploy)
+Le zip est construit en mémoire (BytesIO) hors de la boucle d'événements et mis en cache par
+l'empreinte de son contenu: tant que les fichiers sources ne changent pas, les appels suivants
+renvoient les mêmes octets sans rien reconstruire ni écrire sur le disque
+"""
+import hashlib
+import io
+import logging
+import threading
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+DEPLOY_BUNDLES = Counter('bot_deploy_bundles', "Packages de déploiement demandés", ['result'])
+
+BUNDLE_NAME = "Kouamé.zip"
+BENIN_TZ = timezone(timedelta(hours=1))
+
+# Fichiers du bot copiés dans le package (ignorés s'ils sont absents)
+SOURCE_FILES = [
+    'main.py',
+    'game_results_manager.py',
+    'yaml_manager.py',
+    'compact_results.py',
+    'history_archive.py',
+    'analytics.py',
+    'live_stats.py',
+    'http_cache.py',
+    'metrics.py',
+    'results_index.py',
+    'live_feed.py',
+    'loop_monitor.py',
+    'profiler.py',
+    'logging_setup.py',
+    'channel_stores.py',
+    'shared_storage.py',
+    'predictions.py',
+    'record_rules.py',
+    'record_rules.yaml',
+    'message_formats.py',
+    'backtest.py',
+    'deploy_bundle.py',
+    'results_import.py',
+    'day_archive.py'
+]
+
+RENDER_YAML = """services:
+  - type: web
+    name: bot-telegram-bcarte
+    env: python
+    region: frankfurt
+    plan: starter
+    buildCommand: pip install -r requirements.txt
+    startCommand: python main.py
+    envVars:
+      - key: PORT
+        value: 10000
+      - key: API_ID
+        sync: false
+      - key: API_HASH
+        sync: false
+      - key: BOT_TOKEN
+        sync: false
+      - key: ADMIN_ID
+        sync: false
+"""
+
+REQUIREMENTS = """telethon==1.35.0
+aiohttp==3.9.5
+python-dotenv==1.0.1
+pyyaml==6.0.1
+openpyxl==3.1.2
+numpy==1.26.4
+"""
+
+ENV_EXAMPLE = """# Variables d'environnement pour le bot Telegram
+# Ne jamais committer ces valeurs réelles !
+
+API_ID=votre_api_id
+API_HASH=votre_api_hash
+BOT_TOKEN=votre_bot_token
+ADMIN_ID=votre_admin_id
+PORT=10000
+"""
+
+README = """# Bot Telegram - Package de Déploiement Render.com
+
+📅 **Créé le:** {created} (Heure Bénin UTC+1)
+📦 **Version:** {version}
+
+## 🚀 Instructions de déploiement sur Render.com
+
+### Étape 1: Créer un repository GitHub
+1. Créez un nouveau repository sur GitHub
+2. Uploadez tous les fichiers de ce package
+
+### Étape 2: Déployer sur Render.com
+1. Connectez-vous à [render.com](https://render.com)
+2. Cliquez sur **"New +"** → **"Web Service"**
+3. Connectez votre repository GitHub
+4. Render détectera automatiquement `render.yaml`
+
+### Étape 3: Configurer les Variables d'Environnement
+Dans la section **Environment** de Render.com, ajoutez:
+- **PORT**: 10000 (déjà configuré)
+- **API_ID**: Obtenez-le sur https://my.telegram.org
+- **API_HASH**: Obtenez-le sur https://my.telegram.org
+- **BOT_TOKEN**: Créez un bot avec @BotFather sur Telegram
+- **ADMIN_ID**: Obtenez votre ID avec @userinfobot sur Telegram
+
+### Étape 4: Déployer
+1. Cliquez sur **"Create Web Service"**
+2. Attendez le déploiement (2-3 minutes)
+3. Le bot sera en ligne 24/7 !
+
+## ✅ Fonctionnalités principales
+
+- ✅ **Détection automatique**: Reconnaît les parties avec 3 cartes différentes
+- ✅ **Export quotidien**: Génère un fichier Excel à 00h59 (UTC+1)
+- ✅ **Réinitialisation auto**: Reset automatique à 01h00
+- ✅ **Statistiques en temps réel**: Taux de victoire Joueur/Banquier
+
+## 📊 Commandes disponibles
+
+- `/start` - Démarrer le bot et voir les informations
+- `/status` - Voir les statistiques actuelles
+- `/fichier` - Exporter les résultats en Excel
+- `/reset` - Réinitialiser la base de données manuellement
+- `/deploy` - Créer un nouveau package de déploiement
+- `/help` - Afficher l'aide complète
+
+## 🎯 Critères d'enregistrement
+
+### ✅ Parties enregistrées:
+- Premier groupe: **exactement 3 cartes de couleurs différentes**
+- Deuxième groupe: **PAS 3 cartes**
+- Gagnant identifiable: **Joueur** ou **Banquier**
+
+### ❌ Parties ignorées:
+- Match nul
+- Les deux groupes ont 3 cartes
+- Pas de numéro de jeu identifiable
+
+## ⚙️ Configuration technique
+
+- **Langage**: Python 3.11
+- **Timezone**: Africa/Porto-Novo (UTC+1)
+- **Port**: 10000 (Render.com)
+- **Export automatique**: 00h59 chaque jour
+- **Reset automatique**: 01h00 chaque jour
+
+---
+*Package généré automatiquement*
+*Dernière mise à jour: {updated}*
+"""
+
+
+class DeployBundle:
+    """
+    Zip de déploiement en mémoire, reconstruit seulement si l'empreinte des fichiers sources change
+    build() lit et hache les fichiers: à appeler dans un thread (asyncio.to_thread)
+    """
+
+    def __init__(self, files: Iterable[str] = SOURCE_FILES, base_dir: str = '.'):
+        self.files = list(files)
+        self.base_dir = Path(base_dir)
+        self.digest: Optional[str] = None
+        self.data: Optional[bytes] = None
+        self.built_at: Optional[datetime] = None
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def _read_sources(self) -> Tuple[str, List[Tuple[str, bytes]]]:
+        """Contenu des fichiers présents et empreinte de l'ensemble (noms, contenus et modèles)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for template in (RENDER_YAML, REQUIREMENTS, ENV_EXAMPLE, README):
+            digest.update(template.encode('utf-8'))
+        sources = []
+        for name in self.files:
+            path = self.base_dir / name
+            if not path.is_file():
+                continue
+            content = path.read_bytes()
+            digest.update(name.encode('utf-8') + b'\0' + len(content).to_bytes(8, 'little'))
+            digest.update(content)
+            sources.append((name, content))
+        return digest.hexdigest(), sources
+
+    def _zip(self, sources: List[Tuple[str, bytes]], built_at: datetime, digest: str) -> bytes:
+        version = built_at.strftime('%Y-%m-%d_%H-%M-%S')
+        readme = README.format(created=built_at.strftime('%d/%m/%Y à %H:%M:%S'), version=f"{version} ({digest[:8]})",
+                               updated=built_at.strftime('%d/%m/%Y %H:%M:%S'))
+        generated = [('render.yaml', RENDER_YAML), ('requirements.txt', REQUIREMENTS),
+                     ('.env.example', ENV_EXAMPLE), ('README_DEPLOIEMENT.md', readme)]
+
+        buffer = io.BytesIO()
+        date_time = built_at.timetuple()[:6]
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for name, content in sources + [(name, text.encode('utf-8')) for name, text in generated]:
+                info = zipfile.ZipInfo(name, date_time=date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                zipf.writestr(info, content)
+        return buffer.getvalue()
+
+    def build(self) -> Tuple[bytes, datetime, bool]:
+        """(octets du zip, date de construction, vrai si servi depuis le cache)"""
+        with self._lock:
+            digest, sources = self._read_sources()
+            if self.data is not None and digest == self.digest:
+                DEPLOY_BUNDLES.labels(result='cache').inc()
+                return self.data, self.built_at, True
+
+            built_at = datetime.now(BENIN_TZ)
+            self.data = self._zip(sources, built_at, digest)
+            self.digest = digest
+            self.built_at = built_at
+            self.builds += 1
+            DEPLOY_BUNDLES.labels(result='build').inc()
+            logger.info("📦 Package de déploiement construit: %s fichiers, %.1f Ko (%s)",
+                        len(sources), len(self.data) / 1024, digest[:8])
+            return self.data, built_at, False
+
+    def file(self) -> Tuple[io.BytesIO, datetime, bool]:
+        """Zip prêt à envoyer (objet fichier nommé BUNDLE_NAME), date de construction, cache"""
+        data, built_at, cached = self.build()
+        buffer = io.BytesIO(data)
+        buffer.name = BUNDLE_NAME
+        return buffer, built_at, cached
@@ -0,0 +1,247 @@
+"""
+Client Telegram factice pour les tests de charge hors ligne
+Remplace TelegramClient avant l'import de main: les handlers s'enregistrent sur ce client,
+les événements (messages du canal, éditions, ajout du bot, commandes) sont injectés localement
+et tous les envois sortants sont enregistrés avec leur horodatage
+"""
+import asyncio
+import itertools
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+import telethon
+from telethon import events
+
+BOT_ID = 777000
+
+
+@dataclass
+class SentMessage:
+    """Envoi sortant enregistré (send_message, edit_message ou send_file)"""
+    method: str
+    entity: Any
+    text: str
+    at: float = field(default_factory=time.perf_counter)
+    file: Optional[str] = None
+    message_id: Optional[int] = None
+
+
+class FakeFile:
+    """Pièce jointe d'un message (fichier local envoyé par l'administrateur)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = Path(path).name
+        self.ext = Path(path).suffix
+        self.size = Path(path).stat().st_size
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, text: str, chat_id: int, sender_id: Optional[int],
+                 file: Optional[FakeFile] = None):
+        self.id = message_id
+        self.message = text
+        self.text = text
+        self.raw_text = text
+        self.chat_id = chat_id
+        self.sender_id = sender_id
+        self.file = file
+
+    async def download_media(self, file: Optional[str] = None) -> Optional[str]:
+        if self.file is None:
+            return None
+        return shutil.copy(self.file.path, file or self.file.name)
+
+
+class FakeEvent:
+    """Événement NewMessage / MessageEdited avec les attributs utilisés par les handlers"""
+
+    def __init__(self, client: 'FakeTelegramClient', message: FakeMessage, is_channel: bool):
+        self.client = client
+        self.message = message
+        self.chat_id = message.chat_id
+        self.sender_id = message.sender_id
+        self.is_channel = is_channel
+        self.is_group = False
+        self.is_private = not is_channel
+        self.text = message.text
+        self.raw_text = message.text
+        self.pattern_match = None
+
+    async def respond(self, text: str, **kwargs):
+        return await self.client.send_message(self.chat_id, text, **kwargs)
+
+    async def reply(self, text: str, **kwargs):
+        return await self.client.send_message(self.chat_id, text, **kwargs)
+
+    async def get_reply_message(self):
+        return None
+
+
+class FakeChatAction:
+    """Événement ChatAction: ajout d'un utilisateur (le bot) à un canal"""
+
+    def __init__(self, chat_id: int, user_id: int):
+        self.chat_id = chat_id
+        self.user_id = user_id
+        self.user_joined = False
+        self.user_added = True
+        self.user_left = False
+        self.user_kicked = False
+
+
+class FakeTelegramClient:
+    """
+    Même interface que TelegramClient pour ce qu'utilise main.py
+    send_delay simule l'aller-retour réseau de chaque envoi
+    """
+
+    def __init__(self, *args, send_delay: float = 0.0, **kwargs):
+        self.send_delay = send_delay
+        self.sent: List[SentMessage] = []
+        self._handlers: List[Tuple[Any, Callable]] = []
+        self._ids = itertools.count(1)
+        self._send_listeners: List[Callable[[SentMessage], None]] = []
+        self._disconnected: Optional[asyncio.Event] = None
+        self.me = type('FakeUser', (), {'id': BOT_ID, 'username': 'fake_bot', 'bot': True})()
+
+    # --- Enregistrement des handlers ---
+
+    def on(self, builder):
+        def decorator(callback):
+            self.add_event_handler(callback, builder)
+            return callback
+        return decorator
+
+    def add_event_handler(self, callback, builder):
+        self._handlers.append((builder, callback))
+
+    def add_send_listener(self, callback: Callable[[SentMessage], None]):
+        """Écouteur appelé à chaque envoi sortant (mesure de latence)"""
+        self._send_listeners.append(callback)
+
+    # --- Cycle de vie ---
+
+    async def start(self, *args, **kwargs):
+        self._disconnected = asyncio.Event()
+        return self
+
+    async def run_until_disconnected(self):
+        if self._disconnected is None:
+            self._disconnected = asyncio.Event()
+        await self._disconnected.wait()
+
+    async def disconnect(self):
+        if self._disconnected is not None:
+            self._disconnected.set()
+
+    def is_connected(self) -> bool:
+        return self._disconnected is not None and not self._disconnected.is_set()
+
+    # --- Appels sortants ---
+
+    async def get_me(self):
+        return self.me
+
+    async def get_entity(self, entity):
+        return type('FakeChannel', (), {'id': entity, 'title': f"Canal fictif {entity}"})()
+
+    async def _record(self, sent: SentMessage):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        sent.at = time.perf_counter()
+        self.sent.append(sent)
+        for callback in self._send_listeners:
+            callback(sent)
+
+    async def send_message(self, entity, message: str = '', **kwargs):
+        sent = SentMessage('send_message', entity, message, message_id=next(self._ids))
+        await self._record(sent)
+        return FakeMessage(sent.message_id, message, entity, BOT_ID)
+
+    async def edit_message(self, entity, message=None, text: str = '', **kwargs):
+        message_id = getattr(message, 'id', message)
+        await self._record(SentMessage('edit_message', entity, text, message_id=message_id))
+        return FakeMessage(message_id, text, entity, BOT_ID)
+
+    async def send_file(self, entity, file, caption: str = '', **kwargs):
+        # Objet fichier en mémoire (BytesIO nommé): on enregistre son nom
+        sent = SentMessage('send_file', entity, caption or '', file=str(getattr(file, 'name', file)),
+                           message_id=next(self._ids))
+        await self._record(sent)
+        return FakeMessage(sent.message_id, caption or '', entity, BOT_ID)
+
+    # --- Injection d'événements ---
+
+    async def dispatch_message(self, chat_id: int, message_id: int, text: str, edited: bool = False,
+                               sender_id: Optional[int] = None, is_channel: bool = True,
+                               file: Optional[FakeFile] = None):
+        """Livre un message (nouveau ou édité) aux handlers correspondants, dans l'ordre d'enregistrement"""
+        message = FakeMessage(message_id, text, chat_id, sender_id, file)
+        for builder, callback in self._handlers:
+            # MessageEdited hérite de NewMessage: le type exact décide du handler
+            if isinstance(builder, events.MessageEdited) != edited or not isinstance(builder, events.NewMessage):
+                continue
+            event = FakeEvent(self, message, is_channel)
+            if builder.pattern is not None:
+                event.pattern_match = builder.pattern(text)
+                if not event.pattern_match:
+                    continue
+            try:
+                await callback(event)
+            except events.StopPropagation:
+                break
+
+    async def dispatch_chat_action(self, chat_id: int, user_id: int = BOT_ID):
+        """Livre un événement 'utilisateur ajouté au canal' (par défaut: le bot lui-même)"""
+        for builder, callback in self._handlers:
+            if isinstance(builder, events.ChatAction):
+                await callback(FakeChatAction(chat_id, user_id))
+
+
+class FakeEventSource:
+    """Trafic d'un canal et commandes de l'administrateur injectés dans le client factice"""
+
+    def __init__(self, client: FakeTelegramClient, admin_id: int):
+        self.client = client
+        self.admin_id = admin_id
+        self._command_ids = itertools.count(1)
+
+    async def bot_added(self, channel_id: int):
+        await self.client.dispatch_chat_action(channel_id)
+
+    async def post(self, channel_id: int, message_id: int, text: str):
+        await self.client.dispatch_message(channel_id, message_id, text)
+
+    async def edit(self, channel_id: int, message_id: int, text: str):
+        await self.client.dispatch_message(channel_id, message_id, text, edited=True)
+
+    async def command(self, text: str) -> float:
+        """Envoie une commande en privé au bot; renvoie la durée de traitement par les handlers"""
+        start = time.perf_counter()
+        await self.client.dispatch_message(self.admin_id, next(self._command_ids), text,
+                                           sender_id=self.admin_id, is_channel=False)
+        return time.perf_counter() - start
+
+    async def upload(self, path: str, caption: str = '') -> float:
+        """Envoie un fichier en privé au bot, avec une légende (ex: une commande)"""
+        start = time.perf_counter()
+        await self.client.dispatch_message(self.admin_id, next(self._command_ids), caption,
+                                           sender_id=self.admin_id, is_channel=False, file=FakeFile(path))
+        return time.perf_counter() - start
+
+
+def install(send_delay: float = 0.0) -> type:
+    """
+    Remplace telethon.TelegramClient par le client factice (à appeler avant `import main`)
+    Renvoie la classe installée
+    """
+    class Client(FakeTelegramClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, send_delay=send_delay, **kwargs)
+
+    telethon.TelegramClient = Client
+    return Client
@@ -2,51 +2,189 @@
 Gestionnaire de résultats de jeux pour le bot Telegram
 Stocke les parties où le premier groupe a exactement 3 cartes différentes
 """
+import asyncio
+import logging
+import os
 import re
+import sys
+import time
+import hashlib
+import contextlib
 import yaml
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple, Callable, Iterable
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 
+from message_formats import FormatDetector
+from metrics import Counter, Histogram
+from record_rules import RuleSet, suit_counts, suit_mask_from_counts
+from results_index import ResultsIndex
+from results_import import IMPORTED_ROWS, iter_results
+
+logger = logging.getLogger(__name__)
+
+
+# Métriques du chemin critique
+PROCESS_SECONDS = Histogram('bot_process_message_seconds', "Durée de traitement d'un message du canal")
+PARSE_SECONDS = Histogram('bot_parse_seconds', "Durée d'analyse d'un message (hors cache)")
+STORAGE_SECONDS = Histogram('bot_storage_seconds', "Durée des accès au fichier de résultats", ['operation'])
+EXPORT_SECONDS = Histogram('bot_export_seconds', "Durée de génération des exports Excel",
+                           buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+MESSAGES = Counter('bot_messages', "Messages traités par résultat", ['outcome'])
+IGNORED = Counter('bot_messages_ignored', "Messages ignorés par raison", ['reason'])
+PARSE_CACHE = Counter('bot_parse_cache_lookups', "Consultations du cache d'analyse", ['result'])
+MESSAGES_RECORDED = MESSAGES.labels(outcome='recorded')
+MESSAGES_IGNORED = MESSAGES.labels(outcome='ignored')
+PARSE_CACHE_HITS = PARSE_CACHE.labels(result='hit')
+PARSE_CACHE_MISSES = PARSE_CACHE.labels(result='miss')
+
+# Préfixe des raisons de rejet issues d'une exception (texte libre)
+ERROR_PREFIX = "Erreur: "
+
+# Masques binaires des couleurs (♠=1, ♥=2, ♦=4, ♣=8)
+SUIT_BITS = {'♠': 1, '♥': 2, '♦': 4, '♣': 8}
+
+
+class ParsedMessage(NamedTuple):
+    """
+    Résultat de l'analyse d'un message, indépendant de l'état stocké.
+    Les règles séquentielles (doublons, numéros consécutifs) ne sont PAS
+    incluses: elles sont toujours évaluées contre les résultats actuels.
+    """
+    early_reject: Optional[str]        # Rejet avant les règles séquentielles (⏰, 🔰, ✅, numéro)
+    game_number: Optional[int]
+    groups: Tuple[str, ...]
+    suit_masks: Tuple[int, int]        # Masques des couleurs des deux premiers groupes
+    winner: Optional[str]              # 'Joueur', 'Banquier' ou None
+    late_reject: Optional[str]         # Rejet après les règles séquentielles (groupes, gagnant)
+
+
+def rollover_cards(first_group: str, second_group: str) -> str:
+    """Cartes d'un jeu comparées aux éditions tardives (groupes 1 et 2)"""
+    return f"{first_group.strip()}|{second_group.strip()}"
+
+
+class PreviousDayGames:
+    """Jeux de la journée figée par la dernière bascule, en mémoire (un seul processus)"""
+
+    def __init__(self):
+        self._cards: Dict[int, str] = {}
+
+    def remember(self, games: Dict[int, str]):
+        """Remplace les jeux retenus: numéro → cartes (voir rollover_cards)"""
+        self._cards = dict(games)
+
+    def cards(self, game_number: int) -> Optional[str]:
+        return self._cards.get(game_number)
+
 
 class GameResultsManager:
     """Gestionnaire pour stocker les résultats des jeux de cartes"""
     
-    def __init__(self):
+    def __init__(self, data_dir: str = "data", parse_cache_size: int = 512, lock=None,
+                 rules: Optional[RuleSet] = None, previous_day=None, loop: Optional[asyncio.AbstractEventLoop] = None):
         # Répertoire pour stocker les données
-        self.data_dir = Path("data")
-        self.data_dir.mkdir(exist_ok=True)
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # Fichier de données des résultats
         self.results_file = self.data_dir / "game_results.yaml"
         
+        # Règles d'enregistrement compilées (record_rules.yaml)
+        self.rules = rules or RuleSet.default()
+        
+        # Format des messages du canal, détecté sur les premiers messages (un seul analyseur ensuite)
+        self.formats = FormatDetector()
+        
+        # Verrou des lectures-modifications-écritures (inter-processus en mode multi-workers)
+        self._lock = lock if lock is not None else contextlib.nullcontext()
+        
+        # Cache LRU des analyses de messages (clé: empreinte du texte)
+        # Un même texte arrive souvent plusieurs fois (NewMessage, MessageEdited, rejeu)
+        self.parse_cache_size = parse_cache_size
+        self._parse_cache: "OrderedDict[bytes, ParsedMessage]" = OrderedDict()
+        self._parse_cache_hits = 0
+        self._parse_cache_misses = 0
+        
+        # Copie en mémoire des résultats, valide tant que le fichier n'a pas changé
+        # La génération est incrémentée à chaque sauvegarde et à chaque version du fichier écrite
+        # par un autre processus (invalidation des caches dérivés)
+        self.generation = 0
+        self._results_cache: Optional[List[Dict[str, Any]]] = None
+        self._results_stamp: Optional[Tuple[int, int, int]] = None
+        self._generation_stamp: Optional[Tuple[int, int, int]] = None
+        
+        # Index trié (numéro, horodatage), valide pour une version donnée du fichier
+        self._index: Optional[ResultsIndex] = None
+        self._index_stamp: Optional[Tuple[int, int, int]] = None
+        
+        # Écouteurs appelés après chaque résultat enregistré: (fonction, appelable depuis un thread)
+        self._listeners: List[Tuple[Callable[[Dict[str, Any]], None], bool]] = []
+        # Boucle des écouteurs: un enregistrement fait dans un thread (mode multi-workers) leur est
+        # transmis, sauf pour ceux déclarés appelables depuis un thread
+        self.loop = loop
+        
+        # Jeux de la journée figée par la dernière bascule (éditions tardives de la veille)
+        # Mode multi-workers: état partagé, la bascule faite par un worker vaut pour tous
+        self.previous_day = previous_day if previous_day is not None else PreviousDayGames()
+        
         # Initialiser le fichier s'il n'existe pas
         if not self.results_file.exists():
             self._save_yaml([])
         
-        print("✅ Gestionnaire de résultats initialisé")
+        logger.info("✅ Gestionnaire de résultats initialisé")
     
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Date de modification, taille et inode du fichier de résultats (None s'il n'existe pas)"""
+        try:
+            stat = self.results_file.stat()
+            return stat.st_mtime_ns, stat.st_size, stat.st_ino
+        except OSError:
+            return None
+    
+    def _note_stamp(self, stamp: Optional[Tuple[int, int, int]]):
+        """Nouvelle version du fichier (écrite par un autre processus): nouvelle génération"""
+        if stamp != self._generation_stamp:
+            self._generation_stamp = stamp
+            self.generation += 1
+
+    @STORAGE_SECONDS.labels(operation='load').time()
     def _load_yaml(self) -> List[Dict[str, Any]]:
-        """Charge les résultats depuis le fichier YAML"""
+        """Charge les résultats depuis le fichier YAML (copie en mémoire si le fichier n'a pas changé)"""
         try:
-            if self.results_file.exists():
-                with open(self.results_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    return data if isinstance(data, list) else []
-            return []
+            stamp = self._file_stamp()
+            if stamp is None:
+                return []
+            if self._results_cache is not None and stamp == self._results_stamp:
+                return list(self._results_cache)
+            with open(self.results_file, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f)
+            self._results_cache = data if isinstance(data, list) else []
+            self._results_stamp = stamp
+            self._note_stamp(stamp)
+            return list(self._results_cache)
         except Exception as e:
-            print(f"❌ Erreur chargement résultats: {e}")
+            logger.error("❌ Erreur chargement résultats: %s", e)
             return []
     
+    @STORAGE_SECONDS.labels(operation='save').time()
     def _save_yaml(self, data: List[Dict[str, Any]]):
-        """Sauvegarde les résultats dans le fichier YAML"""
+        """Sauvegarde les résultats dans le fichier YAML (écriture atomique: un lecteur ne voit jamais un fichier partiel)"""
         try:
-            with open(self.results_file, 'w', encoding='utf-8') as f:
+            tmp_file = self.results_file.with_name(self.results_file.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 yaml.dump(data, f, allow_unicode=True, default_flow_style=False, indent=2)
+            os.replace(tmp_file, self.results_file)
+            self._results_cache = list(data)
+            self._results_stamp = self._generation_stamp = self._file_stamp()
         except Exception as e:
-            print(f"❌ Erreur sauvegarde résultats: {e}")
+            self._results_cache = None
+            logger.error("❌ Erreur sauvegarde résultats: %s", e)
+        finally:
+            self.generation += 1
     
     def extract_game_number(self, message: str) -> Optional[int]:
         """Extrait le numéro de jeu du message"""
@@ -63,7 +201,7 @@ class GameResultsManager:
             
             return None
         except Exception as e:
-            print(f"❌ Erreur extraction numéro: {e}")
+            logger.error("❌ Erreur extraction numéro: %s", e)
             return None
     
     def extract_parentheses_groups(self, message: str) -> List[str]:
@@ -126,7 +264,16 @@ class GameResultsManager:
             return False
         
         return all(count == 1 for count in suit_counts.values())
-    
+
+    def suit_mask(self, group_str: str) -> int:
+        """Retourne le masque binaire des couleurs présentes dans un groupe"""
+        normalized = group_str.replace('❤', '♥').replace('\ufe0f', '')
+        mask = 0
+        for suit, bit in SUIT_BITS.items():
+            if suit in normalized:
+                mask |= bit
+        return mask
+
     def determine_winner(self, message: str, first_group: str, second_group: str) -> Optional[str]:
         """
         Détermine le gagnant (Joueur ou Banquier) en fonction du message
@@ -218,11 +365,224 @@ class GameResultsManager:
         now = datetime.now()
         return now.strftime('%Y-%m-%d'), now.strftime('%H:%M:%S')
     
+    def get_index(self) -> ResultsIndex:
+        """Index trié des résultats (reconstruit seulement si le fichier a changé)"""
+        stamp = self._file_stamp()
+        if self._index is None or stamp != self._index_stamp:
+            self._index = ResultsIndex(self._load_yaml())
+            self._index_stamp = self._file_stamp()
+        return self._index
+
+    def _index_append(self, index: ResultsIndex, result_entry: Dict[str, Any]):
+        """
+        Met à jour l'index après l'ajout d'un résultat, sans reconstruction
+        L'index publié n'est jamais modifié en place (copie puis remplacement): un lecteur de la boucle
+        garde une vue cohérente pendant un enregistrement fait dans un thread (mode multi-workers)
+        """
+        if index is self._index:
+            updated = index.copy()
+            updated.add(result_entry)
+            self._index = updated
+            self._index_stamp = self._file_stamp()
+
+    def rollover(self, day: str) -> Tuple[List[Dict[str, Any]], Path]:
+        """
+        Bascule de journée: le stock actif est figé sous game_results_<day>.yaml (renommage)
+        et remplacé par un stock vide. Sans await, aucun message ne peut s'intercaler;
+        l'export et l'archivage de la journée figée se font ensuite hors de la boucle
+        """
+        with self._lock:
+            frozen = self._load_yaml()
+            frozen_file = self.data_dir / f"game_results_{day}.yaml"
+        
+            if frozen_file.exists():
+                # Journée déjà figée (bascule relancée): on complète le fichier figé
+                with open(frozen_file, 'r', encoding='utf-8') as f:
+                    earlier = yaml.safe_load(f) or []
+                frozen = earlier + frozen
+                with open(frozen_file, 'w', encoding='utf-8') as f:
+                    yaml.dump(frozen, f, allow_unicode=True, default_flow_style=False, indent=2)
+                self.results_file.unlink(missing_ok=True)
+            elif self.results_file.exists():
+                os.replace(self.results_file, frozen_file)
+        
+            self._save_yaml([])
+            self._index = ResultsIndex()
+            self._index_stamp = self._file_stamp()
+            self.previous_day.remember({r.get('numero'): rollover_cards(r.get('cartes_groupe1', ''),
+                                                                        r.get('cartes_groupe2', ''))
+                                        for r in frozen if r.get('numero') is not None})
+        
+        logger.info("🔄 Bascule de journée: %s résultats figés dans %s", len(frozen), frozen_file.name)
+        return frozen, frozen_file
+
+    def pending_rollovers(self) -> List[Tuple[str, Path]]:
+        """Journées figées dont l'export/archivage n'a pas été terminé (ex: arrêt du bot)"""
+        pending = []
+        for path in sorted(self.data_dir.glob("game_results_*.yaml")):
+            day = path.stem[len("game_results_"):]
+            pending.append((day, path))
+        return pending
+
+    def load_frozen(self, frozen_file: Path) -> List[Dict[str, Any]]:
+        with open(frozen_file, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        return data if isinstance(data, list) else []
+
+    def discard_frozen(self, frozen_file: Path):
+        """Supprime une journée figée une fois exportée et archivée"""
+        frozen_file.unlink(missing_ok=True)
+
+    def _recorded_before_rollover(self, parsed: ParsedMessage) -> bool:
+        """Vrai si le jeu figure déjà, avec les mêmes cartes, dans la journée figée (édition tardive)"""
+        if len(parsed.groups) < 2:
+            return False
+        return self.previous_day.cards(parsed.game_number) == rollover_cards(parsed.groups[0], parsed.groups[1])
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None], thread_safe: bool = False):
+        """
+        Enregistre une fonction appelée avec chaque nouveau résultat sauvegardé
+        thread_safe: appelée directement même quand l'enregistrement est fait dans un thread
+        """
+        self._listeners.append((callback, thread_safe))
+
+    def _on_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _notify_listeners(self, result_entry: Dict[str, Any]):
+        """Prévient les écouteurs; une erreur d'écouteur n'annule pas l'enregistrement"""
+        in_thread = self.loop is not None and not self._on_loop_thread()
+        for callback, thread_safe in self._listeners:
+            if in_thread and not thread_safe:
+                # Exécuté sur la boucle avant la reprise de l'appelant (ordre des parties conservé)
+                self.loop.call_soon_threadsafe(self._call_listener, callback, result_entry)
+            else:
+                self._call_listener(callback, result_entry)
+
+    @staticmethod
+    def _call_listener(callback: Callable[[Dict[str, Any]], None], result_entry: Dict[str, Any]):
+        try:
+            callback(result_entry)
+        except Exception as e:
+            logger.error("❌ Erreur écouteur résultats (%s): %s", getattr(callback, '__qualname__', callback), e)
+
+    def _message_key(self, message: str) -> bytes:
+        """Empreinte rapide du texte d'un message (clé du cache d'analyse)"""
+        return hashlib.blake2b(message.encode('utf-8'), digest_size=16).digest()
+
+    def parse_message(self, message: str) -> ParsedMessage:
+        """
+        Analyse un message sans consulter les résultats stockés.
+        Le résultat est mis en cache (LRU) par empreinte du texte: seule la première occurrence
+        d'un texte passe par le détecteur de format (votes, confiance, replis), un texte déjà vu
+        n'apportant aucune information nouvelle sur le format du canal.
+        """
+        if self.parse_cache_size <= 0:
+            self._parse_cache_misses += 1
+            return self._parse_uncached(message)
+
+        key = self._message_key(message)
+        parsed = self._parse_cache.get(key)
+        if parsed is not None:
+            self._parse_cache.move_to_end(key)
+            self._parse_cache_hits += 1
+            PARSE_CACHE_HITS.inc()
+            return parsed
+
+        self._parse_cache_misses += 1
+        PARSE_CACHE_MISSES.inc()
+        parsed = self._parse_uncached(message)
+        self._parse_cache[key] = parsed
+        if len(self._parse_cache) > self.parse_cache_size:
+            self._parse_cache.popitem(last=False)
+        return parsed
+
+    @PARSE_SECONDS.time()
+    def _parse_uncached(self, message: str) -> ParsedMessage:
+        """Applique les règles d'enregistrement qui ne dépendent que du texte"""
+        def reject(reason: str, game_number: Optional[int] = None) -> ParsedMessage:
+            return ParsedMessage(reason, game_number, (), (0, 0), None, None)
+
+        rules = self.rules
+        
+        # Marqueurs exigés ou interdits (par défaut: ni ⏰ ni 🔰, ✅ obligatoire)
+        marker_reject = rules.marker_reject(message)
+        if marker_reject:
+            return reject(marker_reject)
+        
+        # Numéro de jeu et groupes de cartes, par l'analyseur du format du canal
+        game_number, groups = self.formats.parse(message)
+        if game_number is None:
+            return reject("Pas de numéro de jeu trouvé")
+        
+        groups = tuple(groups)
+        if len(groups) < rules.required_groups:
+            return ParsedMessage(None, game_number, groups, (0, 0), None, rules.missing_groups_reason)
+        
+        # Profil de couleurs de chaque groupe, testé contre les tables précalculées des règles
+        profiles = [suit_counts(group) for group in groups[:len(rules.group_tables)]]
+        suit_masks = (suit_mask_from_counts(profiles[0]) if profiles else self.suit_mask(groups[0]),
+                      suit_mask_from_counts(profiles[1]) if len(profiles) > 1 else self.suit_mask(groups[1]))
+        
+        winner, late_reject = rules.winner(profiles)
+        return ParsedMessage(None, game_number, groups, suit_masks, winner, late_reject)
+
+    def parse_cache_entries(self) -> int:
+        """Nombre d'entrées du cache d'analyse"""
+        return len(self._parse_cache)
+
+    def get_parse_cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache d'analyse (taux de succès, mémoire approximative)"""
+        lookups = self._parse_cache_hits + self._parse_cache_misses
+        memory = sys.getsizeof(self._parse_cache)
+        for key, parsed in self._parse_cache.items():
+            memory += sys.getsizeof(key) + sys.getsizeof(parsed)
+            memory += sum(sys.getsizeof(g) for g in parsed.groups)
+        return {
+            'size': len(self._parse_cache),
+            'capacity': self.parse_cache_size,
+            'hits': self._parse_cache_hits,
+            'misses': self._parse_cache_misses,
+            'hit_rate': (self._parse_cache_hits / lookups * 100) if lookups else 0.0,
+            'memory_bytes': memory
+        }
+
+    def set_rules(self, rules: RuleSet):
+        """Remplace les règles d'enregistrement (les analyses en cache dépendent des règles)"""
+        self.rules = rules
+        self.clear_parse_cache()
+
+    def clear_parse_cache(self):
+        """Vide le cache d'analyse et remet ses compteurs à zéro"""
+        self._parse_cache.clear()
+        self._parse_cache_hits = 0
+        self._parse_cache_misses = 0
+
     def process_message(self, message: str) -> Tuple[bool, Optional[str]]:
+        """Traite un message (voir _process_message) et met à jour les métriques"""
+        start = time.perf_counter()
+        success, info = self._process_message(message)
+        PROCESS_SECONDS.observe(time.perf_counter() - start)
+        if success:
+            MESSAGES_RECORDED.inc()
+        else:
+            MESSAGES_IGNORED.inc()
+            # Raisons bornées: exceptions regroupées sous 'error', numéros remplacés
+            if info and info.startswith(ERROR_PREFIX):
+                reason = 'error'
+            else:
+                reason = re.sub(r'\d+', 'N', info or 'inconnu')
+            IGNORED.labels(reason=reason).inc()
+        return success, info
+
+    def _process_message(self, message: str) -> Tuple[bool, Optional[str]]:
         """
         Traite un message et stocke le résultat si les conditions sont remplies
         
-        NOUVELLES RÈGLES:
+        RÈGLES PAR DÉFAUT (configurables dans record_rules.yaml):
         - Ne PAS contenir ⏰ (message en cours)
         - Ne PAS contenir 🔰 (on ignore ces messages)
         - Doit contenir ✅ (message finalisé)
@@ -231,125 +591,115 @@ class GameResultsManager:
         - Si les deux ont 3 cartes différentes → NE RIEN enregistrer
         - Ne pas enregistrer les numéros consécutifs (N puis N+1)
         
+        L'analyse du texte passe par le cache LRU (parse_message);
+        les règles séquentielles sont évaluées contre les résultats stockés.
+        
         Retourne: (succès, message_info)
         """
         try:
             # Log du message complet pour debug
-            print(f"📩 Message reçu: {message[:150]}...")
-            
-            # VÉRIFICATION 1: Le message NE doit PAS être en cours
-            if '⏰' in message:
-                print(f"⏰ Message en cours d'édition, attente de finalisation...")
-                return False, "Message en cours d'édition (symbole ⏰)"
-            
-            # VÉRIFICATION 2: Le message NE doit PAS contenir 🔰
-            if '🔰' in message:
-                print(f"🔰 Message avec symbole 🔰, on ignore")
-                return False, "Message avec symbole 🔰 (ignoré)"
-            
-            # VÉRIFICATION 3: Le message doit contenir ✅
-            if '✅' not in message:
-                print(f"⚠️ Message non finalisé (pas de ✅)")
-                return False, "Message non finalisé (pas de symbole ✅)"
-            
-            print(f"✅ Message finalisé détecté, traitement en cours...")
-            
-            # Extraire le numéro de jeu
-            game_number = self.extract_game_number(message)
-            if game_number is None:
-                print(f"❌ Pas de numéro de jeu trouvé dans: {message[:100]}")
-                return False, "Pas de numéro de jeu trouvé"
-            
-            # Charger les résultats existants
-            results = self._load_yaml()
-            
-            # Vérifier si ce jeu n'est pas déjà stocké
-            if any(r.get('numero') == game_number for r in results):
-                print(f"ℹ️ Jeu #{game_number} déjà enregistré")
-                return False, f"Jeu #{game_number} déjà enregistré"
-            
-            # Vérifier les numéros consécutifs contre TOUS les numéros enregistrés
-            if results:
-                for result in results:
-                    stored_number = result.get('numero', 0)
-                    if game_number == stored_number + 1:
-                        print(f"⚠️ Numéro consécutif détecté (numéro {stored_number} déjà enregistré, actuel: {game_number}), message ignoré")
-                        return False, f"Numéro consécutif ignoré ({stored_number} → {game_number})"
-            
-            # Extraire les groupes de parenthèses
-            groups = self.extract_parentheses_groups(message)
-            if len(groups) < 2:
-                print(f"❌ Pas assez de groupes de parenthèses: {groups}")
-                return False, "Pas assez de groupes de parenthèses"
-            
-            first_group = groups[0]
-            second_group = groups[1]
-            
-            # Compter les cartes dans chaque groupe
-            first_count = self.count_cards(first_group)
-            second_count = self.count_cards(second_group)
-            
-            print(f"📊 Jeu #{game_number}: Groupe 1 = {first_count} cartes ({first_group}), Groupe 2 = {second_count} cartes ({second_group})")
-            
-            # Vérifier si chaque groupe a 3 cartes de couleurs différentes
-            first_has_different_suits = (first_count == 3) and self.has_different_suits(first_group)
-            second_has_different_suits = (second_count == 3) and self.has_different_suits(second_group)
-            
-            # NOUVELLE LOGIQUE DE DÉTERMINATION DU GAGNANT
-            winner = None
-            
-            if first_has_different_suits and second_has_different_suits:
-                # Les deux ont 3 cartes différentes → on ignore
-                print(f"⚠️ Les deux groupes ont 3 cartes de couleurs différentes, message ignoré")
-                return False, "Les deux groupes ont 3 couleurs différentes - pas d'enregistrement"
-            elif first_has_different_suits and not second_has_different_suits:
-                # Premier groupe a 3 cartes différentes → Victoire JOUEUR
-                winner = 'Joueur'
-                print(f"🎯 Premier groupe a 3 cartes différentes → Victoire JOUEUR")
-            elif not first_has_different_suits and second_has_different_suits:
-                # Deuxième groupe a 3 cartes différentes → Victoire BANQUIER
-                winner = 'Banquier'
-                print(f"🎯 Deuxième groupe a 3 cartes différentes → Victoire BANQUIER")
-            else:
-                # Aucun groupe n'a 3 cartes différentes → on ignore
-                print(f"⚠️ Aucun groupe n'a 3 cartes de couleurs différentes, message ignoré")
-                return False, "Aucun groupe avec 3 couleurs différentes"
-            
-            # Si on arrive ici, on a un gagnant valide
-            
-            # Extraire date et heure du message
-            date_str, time_str = self.extract_datetime_from_message(message)
-            
-            # Créer l'entrée de résultat
-            result_entry = {
-                'numero': game_number,
-                'date': date_str,
-                'heure': time_str,
-                'cartes_groupe1': first_group.strip(),
-                'gagnant': winner,
-                'message_complet': message[:200]  # Limiter la taille
-            }
-            
-            # Ajouter et sauvegarder
-            results.append(result_entry)
-            self._save_yaml(results)
-            
-            print(f"✅ Résultat enregistré: Jeu #{game_number} - Gagnant: {winner} - {date_str} {time_str}")
+            logger.debug("📩 Message reçu: %s...", message[:150])
+            
+            parsed = self.parse_message(message)
+            if parsed.early_reject:
+                logger.debug("⚠️ Message ignoré: %s", parsed.early_reject)
+                return False, parsed.early_reject
+            
+            game_number = parsed.game_number
+            logger.debug("✅ Message finalisé détecté, traitement en cours...")
+            
+            # Section critique: relecture, règles séquentielles et écriture sous verrou
+            with self._lock:
+                # Index trié des résultats existants (recherches en O(log n))
+                index = self.get_index()
+            
+                # Doublons et numéros consécutifs, contre TOUS les numéros enregistrés
+                sequence_reject = self.rules.sequence_reject(index, game_number)
+                if sequence_reject is None and self.rules.skip_duplicates and self._recorded_before_rollover(parsed):
+                    sequence_reject = f"Jeu #{game_number} déjà enregistré"
+                if sequence_reject:
+                    logger.debug("⚠️ Jeu #%s: %s", game_number, sequence_reject)
+                    return False, sequence_reject
+            
+                if parsed.late_reject:
+                    logger.debug("⚠️ Jeu #%s: %s", game_number, parsed.late_reject)
+                    return False, parsed.late_reject
+            
+                first_group = parsed.groups[0]
+                winner = parsed.winner
+                logger.debug("🎯 Jeu #%s: groupes %s / %s → Victoire %s",
+                             game_number, parsed.groups[0], parsed.groups[1], winner.upper())
+            
+                # Extraire date et heure du message
+                date_str, time_str = self.extract_datetime_from_message(message)
+            
+                # Créer l'entrée de résultat
+                result_entry = {
+                    'numero': game_number,
+                    'date': date_str,
+                    'heure': time_str,
+                    'cartes_groupe1': first_group.strip(),
+                    'cartes_groupe2': parsed.groups[1].strip(),
+                    'gagnant': winner,
+                    'message_complet': message[:200]  # Limiter la taille
+                }
+            
+                # Ajouter et sauvegarder
+                results = self._load_yaml()
+                results.append(result_entry)
+                self._save_yaml(results)
+                self._index_append(index, result_entry)
+            self._notify_listeners(result_entry)
+            
+            logger.info("✅ Résultat enregistré: Jeu #%s - Gagnant: %s - %s %s", game_number, winner, date_str, time_str)
             return True, f"Jeu #{game_number} enregistré - Gagnant: {winner}"
             
         except Exception as e:
-            print(f"❌ Erreur traitement message: {e}")
+            logger.error("❌ Erreur traitement message: %s", e)
             import traceback
             traceback.print_exc()
-            return False, f"Erreur: {e}"
+            return False, f"{ERROR_PREFIX}{e}"
     
+    def import_results(self, results: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Ajoute des résultats importés (restauration ou fusion) en une seule écriture
+        Dédoublonnage par numéro contre l'index trié et à l'intérieur du lot; les écouteurs
+        ne sont pas appelés (résultats passés, pas de nouvelles parties)
+        """
+        added = []
+        duplicates = 0
+        with self._lock:
+            index = self.get_index()
+            seen = set()
+            for result in results:
+                numero = result['numero']
+                if numero in seen or index.contains(numero):
+                    duplicates += 1
+                    continue
+                seen.add(numero)
+                added.append(result)
+            if added:
+                self._save_yaml(self._load_yaml() + added)
+        IMPORTED_ROWS.labels(result='imported').inc(len(added))
+        IMPORTED_ROWS.labels(result='duplicate').inc(duplicates)
+        if added:
+            logger.info("📥 %s résultat(s) importé(s), %s doublon(s) ignoré(s)", len(added), duplicates)
+        return {'importes': len(added), 'doublons': duplicates}
+
+    def import_file(self, path: str) -> Dict[str, int]:
+        """Importe un export Excel ou CSV (voir results_import); à appeler dans un thread"""
+        counts: Dict[str, int] = {}
+        report = self.import_results(iter_results(path, counts))
+        return dict(counts, **report)
+
     def get_all_results(self) -> List[Dict[str, Any]]:
         """Récupère tous les résultats stockés"""
         return self._load_yaml()
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Calcule les statistiques des résultats"""
-        results = self._load_yaml()
+    def get_stats(self, results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Calcule les statistiques des résultats (stock actif par défaut)"""
+        if results is None:
+            results = self._load_yaml()
         
         if not results:
             return {
@@ -372,15 +722,22 @@ class GameResultsManager:
             'taux_banquier': (banquier_wins / total * 100) if total > 0 else 0.0
         }
     
-    def export_to_txt(self, file_path: str = None) -> Optional[str]:
-        """Exporte tous les résultats en fichier Excel"""
+    @EXPORT_SECONDS.time()
+    def export_to_txt(self, file_path: str = None,
+                      results: Optional[Iterable[Dict[str, Any]]] = None) -> Optional[str]:
+        """
+        Exporte les résultats en fichier Excel (stock actif par défaut)
+        Avec des résultats fournis (liste ou itérateur parcouru une seule fois), ne touche pas
+        à l'état du gestionnaire: utilisable dans un thread
+        """
         try:
             # Générer un nom de fichier avec date et heure si non fourni
             if file_path is None:
                 timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
                 file_path = f"resultats_{timestamp}.xlsx"
             
-            results = self._load_yaml()
+            if results is None:
+                results = self._load_yaml()
             
             # Créer un nouveau classeur Excel
             wb = Workbook()
@@ -413,71 +770,72 @@ class GameResultsManager:
             ws.column_dimensions['B'].width = 15
             ws.column_dimensions['C'].width = 30
             
-            if not results:
+            # Ajouter les données
+            row_num = 1
+            for row_num, result in enumerate(results, 2):
+                # Date et Heure
+                date_str = result.get('date', '')
+                heure_str = result.get('heure', '')
+                
+                if date_str and heure_str:
+                    try:
+                        date_parts = date_str.split('-')
+                        if len(date_parts) == 3:
+                            formatted_date = f"{date_parts[2]}/{date_parts[1]}/{date_parts[0]}"
+                        else:
+                            formatted_date = date_str
+                    except:
+                        formatted_date = date_str
+                    
+                    try:
+                        heure_parts = heure_str.split(':')
+                        if len(heure_parts) >= 2:
+                            formatted_heure = f"{heure_parts[0]}:{heure_parts[1]}"
+                        else:
+                            formatted_heure = heure_str
+                    except:
+                        formatted_heure = heure_str
+                    
+                    date_heure = f"{formatted_date} - {formatted_heure}"
+                else:
+                    date_heure = "N/A"
+                
+                # Numéro
+                numero = result.get('numero', 0)
+                numero_formatted = f"{numero:03d}"
+                
+                # Gagnant
+                gagnant = result.get('gagnant', 'N/A')
+                
+                # Écrire les données
+                cell_a = ws.cell(row=row_num, column=1)
+                cell_a.value = date_heure
+                cell_a.border = border
+                cell_a.alignment = Alignment(horizontal="left")
+                
+                cell_b = ws.cell(row=row_num, column=2)
+                cell_b.value = numero_formatted
+                cell_b.border = border
+                cell_b.alignment = Alignment(horizontal="center")
+                
+                cell_c = ws.cell(row=row_num, column=3)
+                cell_c.value = gagnant
+                cell_c.border = border
+                cell_c.alignment = Alignment(horizontal="center")
+            
+            if row_num == 1:
                 # Si pas de résultats
                 cell = ws.cell(row=2, column=1)
                 cell.value = "Aucun résultat enregistré."
                 cell.alignment = Alignment(horizontal="center")
-            else:
-                # Ajouter les données
-                for row_num, result in enumerate(results, 2):
-                    # Date et Heure
-                    date_str = result.get('date', '')
-                    heure_str = result.get('heure', '')
-                    
-                    if date_str and heure_str:
-                        try:
-                            date_parts = date_str.split('-')
-                            if len(date_parts) == 3:
-                                formatted_date = f"{date_parts[2]}/{date_parts[1]}/{date_parts[0]}"
-                            else:
-                                formatted_date = date_str
-                        except:
-                            formatted_date = date_str
-                        
-                        try:
-                            heure_parts = heure_str.split(':')
-                            if len(heure_parts) >= 2:
-                                formatted_heure = f"{heure_parts[0]}:{heure_parts[1]}"
-                            else:
-                                formatted_heure = heure_str
-                        except:
-                            formatted_heure = heure_str
-                        
-                        date_heure = f"{formatted_date} - {formatted_heure}"
-                    else:
-                        date_heure = "N/A"
-                    
-                    # Numéro
-                    numero = result.get('numero', 0)
-                    numero_formatted = f"{numero:03d}"
-                    
-                    # Gagnant
-                    gagnant = result.get('gagnant', 'N/A')
-                    
-                    # Écrire les données
-                    cell_a = ws.cell(row=row_num, column=1)
-                    cell_a.value = date_heure
-                    cell_a.border = border
-                    cell_a.alignment = Alignment(horizontal="left")
-                    
-                    cell_b = ws.cell(row=row_num, column=2)
-                    cell_b.value = numero_formatted
-                    cell_b.border = border
-                    cell_b.alignment = Alignment(horizontal="center")
-                    
-                    cell_c = ws.cell(row=row_num, column=3)
-                    cell_c.value = gagnant
-                    cell_c.border = border
-                    cell_c.alignment = Alignment(horizontal="center")
             
             # Sauvegarder le fichier
             wb.save(file_path)
-            print(f"✅ Export Excel créé: {file_path}")
+            logger.info("✅ Export Excel créé: %s", file_path)
             return file_path
             
         except Exception as e:
-            print(f"❌ Erreur export Excel: {e}")
+            logger.error("❌ Erreur export Excel: %s", e)
             import traceback
             traceback.print_exc()
             return None
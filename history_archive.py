@@ -0,0 +1,191 @@
+"""
+Archive historique multi-jours des résultats
+Stockage en colonnes à largeur fixe, en ajout seul, interrogé via des tableaux NumPy mappés en mémoire
+"""
+import logging
+import yaml
+import numpy as np
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Union
+
+from compact_results import CompactResultArray, CARDS_PER_GROUP, SUIT_CODES, WINNER_CODES
+
+logger = logging.getLogger(__name__)
+
+# Colonnes: nom -> (type NumPy, nombre de valeurs par résultat)
+COLUMNS = {
+    'numeros': (np.uint32, 1),
+    'timestamps': (np.uint32, 1),
+    'winners': (np.uint8, 1),
+    'cards': (np.uint8, 2 * CARDS_PER_GROUP),
+}
+
+
+def suits_to_mask(suits: str) -> int:
+    """Convertit une chaîne de couleurs (ex: '♠♥♦') en masque binaire (♠=1, ♥=2, ♦=4, ♣=8)"""
+    mask = 0
+    for char in suits:
+        if char in SUIT_CODES:
+            mask |= 1 << SUIT_CODES[char]
+    return mask
+
+
+def suit_masks_from_cards(cards: np.ndarray) -> np.ndarray:
+    """Masques des couleurs de chaque ligne d'un tableau (n, CARDS_PER_GROUP) de codes de cartes"""
+    if cards.size == 0:
+        return np.zeros(len(cards), dtype=np.uint8)
+    bits = np.where(cards != 0, np.left_shift(1, cards & 3), 0).astype(np.uint8)
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+class HistoryArchive:
+    """Archive en colonnes des journées terminées"""
+
+    def __init__(self, archive_dir: str = "data/archive"):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.archive_dir / "days.yaml"
+        self._days = self._load_index()
+        self._truncate_to_index()
+
+    def _column_file(self, name: str) -> Path:
+        return self.archive_dir / f"{name}.bin"
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        """Charge l'index des journées (jour, première ligne, nombre de lignes)"""
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f)
+                    return data if isinstance(data, list) else []
+        except Exception as e:
+            logger.error("❌ Erreur chargement index archive: %s", e)
+        return []
+
+    def _save_index(self):
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            yaml.dump(self._days, f, allow_unicode=True, default_flow_style=False, indent=2)
+
+    def _truncate_to_index(self):
+        """Supprime les lignes écrites après le dernier index valide (ajout interrompu)"""
+        rows = self.total_rows()
+        for name, (dtype, width) in COLUMNS.items():
+            path = self._column_file(name)
+            expected = rows * width * np.dtype(dtype).itemsize
+            if path.exists() and path.stat().st_size > expected:
+                with open(path, 'r+b') as f:
+                    f.truncate(expected)
+                logger.warning("⚠️ Archive: colonne %s tronquée à %s lignes", name, rows)
+
+    def total_rows(self) -> int:
+        """Nombre total de résultats archivés"""
+        if not self._days:
+            return 0
+        last = self._days[-1]
+        return last['start'] + last['count']
+
+    def days(self) -> List[str]:
+        """Liste des journées archivées"""
+        return [entry['day'] for entry in self._days]
+
+    def append_day(self, day: str, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Ajoute une journée terminée à l'archive
+        Les colonnes sont écrites avant l'index: un ajout interrompu est ignoré au redémarrage
+        """
+        if any(entry['day'] == day for entry in self._days):
+            logger.debug("ℹ️ Journée %s déjà archivée", day)
+            return 0
+
+        compact = CompactResultArray.from_dicts(results)
+        count = len(compact)
+        if count == 0:
+            return 0
+
+        for name in COLUMNS:
+            with open(self._column_file(name), 'ab') as f:
+                f.write(getattr(compact, name))
+
+        self._days.append({'day': day, 'start': self.total_rows(), 'count': count})
+        self._save_index()
+        logger.info("🗄️ Journée %s archivée (%s résultats)", day, count)
+        return count
+
+    def _column(self, name: str) -> np.ndarray:
+        """Ouvre une colonne en lecture seule, mappée en mémoire"""
+        dtype, width = COLUMNS[name]
+        rows = self.total_rows()
+        if rows == 0:
+            shape = (0, width) if width > 1 else (0,)
+            return np.empty(shape, dtype=dtype)
+        shape = (rows, width) if width > 1 else (rows,)
+        return np.memmap(self._column_file(name), dtype=dtype, mode='r', shape=shape)
+
+    def row_range(self, since: Optional[str] = None,
+                  until: Optional[str] = None) -> Union[slice, np.ndarray]:
+        """
+        Lignes des journées [since, until] (dates ISO incluses), dans l'ordre des journées
+        Tranche (vue sans copie) si les journées sont contiguës dans les colonnes, sinon
+        tableau d'indices: une journée archivée en retard est écrite après les suivantes
+        """
+        selected = sorted((entry for entry in self._days
+                           if (since is None or entry['day'] >= since) and (until is None or entry['day'] <= until)),
+                          key=lambda entry: entry['day'])
+        if not selected:
+            return slice(0, 0)
+        if all(current['start'] == previous['start'] + previous['count']
+               for previous, current in zip(selected, selected[1:])):
+            return slice(selected[0]['start'], selected[-1]['start'] + selected[-1]['count'])
+        return np.concatenate([np.arange(entry['start'], entry['start'] + entry['count'])
+                               for entry in selected])
+
+    def _since_days(self, days: int) -> str:
+        return (date.today() - timedelta(days=days)).isoformat()
+
+    def winner_rate(self, days: int = 30) -> Dict[str, Any]:
+        """Taux de victoire Joueur/Banquier sur les N derniers jours"""
+        winners = self._column('winners')[self.row_range(since=self._since_days(days))]
+        total = int(winners.size)
+        joueur = int(np.count_nonzero(winners == WINNER_CODES['Joueur']))
+        banquier = int(np.count_nonzero(winners == WINNER_CODES['Banquier']))
+        return {
+            'jours': days,
+            'total': total,
+            'joueur_victoires': joueur,
+            'banquier_victoires': banquier,
+            'taux_joueur': (joueur / total * 100) if total else 0.0,
+            'taux_banquier': (banquier / total * 100) if total else 0.0
+        }
+
+    def group_suit_masks(self, group: int = 1, rows: Union[slice, np.ndarray] = slice(None)) -> np.ndarray:
+        """Masques des couleurs d'un groupe (1 ou 2) pour les lignes demandées"""
+        offset = (group - 1) * CARDS_PER_GROUP
+        cards = np.asarray(self._column('cards')[rows, offset:offset + CARDS_PER_GROUP])
+        return suit_masks_from_cards(cards)
+
+    def find_suit_pattern(self, suits: str, group: int = 1, since: Optional[str] = None,
+                          until: Optional[str] = None) -> np.ndarray:
+        """Numéros des parties dont le groupe contient exactement les couleurs demandées"""
+        rows = self.row_range(since, until)
+        masks = self.group_suit_masks(group, rows)
+        numeros = self._column('numeros')[rows]
+        return np.asarray(numeros[masks == suits_to_mask(suits)])
+
+    def load_columns(self, since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Colonnes des journées [since, until] (vues mappées en mémoire, copiées si non contiguës)"""
+        rows = self.row_range(since, until)
+        return {name: self._column(name)[rows] for name in COLUMNS}
+
+    def load_day(self, day: str) -> List[Dict[str, Any]]:
+        """Recharge une journée au format YAML (pour les exports)"""
+        for entry in self._days:
+            if entry['day'] == day:
+                rows = slice(entry['start'], entry['start'] + entry['count'])
+                compact = CompactResultArray()
+                compact.numeros.extend(int(v) for v in self._column('numeros')[rows])
+                compact.timestamps.extend(int(v) for v in self._column('timestamps')[rows])
+                compact.winners.extend(self._column('winners')[rows].tobytes())
+                compact.cards.extend(self._column('cards')[rows].tobytes())
+                return compact.to_dicts()
+        return []
@@ -0,0 +1,73 @@
+"""
+Réponses HTTP pré-sérialisées avec validation conditionnelle (ETag / Last-Modified)
+Les instantanés ne sont reconstruits que lorsque leur version change
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Hashable, Optional
+
+from aiohttp import web
+
+
+class CachedResponse:
+    """Corps pré-encodé et validateurs HTTP associés"""
+
+    __slots__ = ('body', 'content_type', 'etag', 'last_modified', 'modified_at')
+
+    def __init__(self, body: bytes, content_type: str, modified_at: Optional[datetime] = None):
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        # Précision HTTP: la seconde
+        self.modified_at = (modified_at or datetime.now(timezone.utc)).replace(microsecond=0)
+        self.last_modified = format_datetime(self.modified_at, usegmt=True)
+
+    def is_not_modified(self, request: web.Request) -> bool:
+        """Vrai si les en-têtes conditionnels du client correspondent à cette version"""
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or self.etag in tags or f"W/{self.etag}" in tags
+
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return self.modified_at <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def respond(self, request: web.Request, cache_control: str = 'no-cache') -> web.Response:
+        """Réponse 304 si le client est à jour, sinon 200 avec le corps pré-encodé"""
+        headers = {'ETag': self.etag, 'Last-Modified': self.last_modified, 'Cache-Control': cache_control}
+        if self.is_not_modified(request):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=self.body, content_type=self.content_type, charset='utf-8', headers=headers)
+
+
+class Snapshot:
+    """
+    Instantané JSON reconstruit uniquement quand la version change
+    version(): valeur hachable (ex: génération des résultats), build(): données à sérialiser
+    """
+
+    def __init__(self, build: Callable[[], Any], version: Callable[[], Hashable]):
+        self._build = build
+        self._version = version
+        self._current_version = None
+        self._cached: Optional[CachedResponse] = None
+        self.rebuilds = 0
+
+    def get(self) -> CachedResponse:
+        version = self._version()
+        if self._cached is None or version != self._current_version:
+            body = json.dumps(self._build(), ensure_ascii=False, default=str).encode('utf-8')
+            self._cached = CachedResponse(body, 'application/json')
+            self._current_version = version
+            self.rebuilds += 1
+        return self._cached
+
+    def respond(self, request: web.Request) -> web.Response:
+        return self.get().respond(request)
@@ -0,0 +1,177 @@
+"""
+Diffusion en direct des parties enregistrées (Server-Sent Events / WebSocket)
+La publication ne coûte qu'un put_nowait: la distribution aux abonnés se fait dans une tâche dédiée
+"""
+import asyncio
+import json
+from typing import Dict, Any, Optional, Set
+
+from aiohttp import web, WSMsgType
+
+from metrics import Counter, Gauge
+
+# Champs diffusés (le message complet n'est pas transmis)
+FEED_FIELDS = ('canal', 'numero', 'date', 'heure', 'gagnant', 'cartes_groupe1', 'cartes_groupe2')
+
+FEED_PUBLISHED = Counter('bot_feed_published', "Résultats publiés sur le flux en direct")
+FEED_SKIPPED = Counter('bot_feed_skipped', "Messages sautés pour des abonnés trop lents")
+FEED_DROPPED = Counter('bot_feed_dropped_subscribers', "Abonnés déconnectés car trop lents")
+FEED_SUBSCRIBERS = Gauge('bot_feed_subscribers', "Abonnés connectés au flux en direct")
+
+
+class Subscriber:
+    """Abonné avec file bornée; au-delà de max_skips messages sautés, il est déconnecté"""
+
+    __slots__ = ('queue', 'skipped', 'max_skips', 'closed')
+
+    def __init__(self, queue_size: int, max_skips: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.skipped = 0
+        self.max_skips = max_skips
+        self.closed = False
+
+    def offer(self, payload: bytes) -> bool:
+        """Dépose un message; si la file est pleine, le plus ancien est sauté. Faux si l'abonné est abandonné"""
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        self.skipped += 1
+        FEED_SKIPPED.inc()
+        if self.skipped > self.max_skips:
+            self.close()
+            return False
+        self.queue.get_nowait()
+        self.queue.put_nowait(payload)
+        return True
+
+    def close(self):
+        """Réveille le lecteur avec un message vide (fin de flux)"""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(b'')
+
+
+class LiveFeedHub:
+    """Concentrateur publication / abonnement"""
+
+    def __init__(self, queue_size: int = 256, max_skips: int = 1024, inbox_size: int = 1024,
+                 heartbeat: float = 15.0):
+        self.queue_size = queue_size
+        self.max_skips = max_skips
+        self.inbox_size = inbox_size
+        self.heartbeat = heartbeat
+        self.subscribers: Set[Subscriber] = set()
+        self._inbox: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        FEED_SUBSCRIBERS.set_function(lambda: len(self.subscribers))
+
+    def start(self):
+        """Démarre la tâche de distribution (à appeler dans la boucle asyncio)"""
+        if self._task is None:
+            self._inbox = asyncio.Queue(maxsize=self.inbox_size)
+            self._task = asyncio.create_task(self._fan_out())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+
+    def publish(self, result: Dict[str, Any]):
+        """Publie un résultat (écouteur de GameResultsManager); ne bloque jamais l'enregistrement"""
+        if self._inbox is None or not self.subscribers:
+            return
+        payload = json.dumps({field: result.get(field) for field in FEED_FIELDS},
+                             ensure_ascii=False).encode('utf-8')
+        try:
+            self._inbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Distribution en retard: on sacrifie le plus ancien message en attente
+            self._inbox.get_nowait()
+            self._inbox.put_nowait(payload)
+            FEED_SKIPPED.inc()
+        FEED_PUBLISHED.inc()
+
+    async def _fan_out(self):
+        while True:
+            payload = await self._inbox.get()
+            for subscriber in list(self.subscribers):
+                if not subscriber.offer(payload):
+                    self.subscribers.discard(subscriber)
+                    FEED_DROPPED.inc()
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.queue_size, self.max_skips)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+        subscriber.closed = True
+
+    async def _next(self, subscriber: Subscriber) -> Optional[bytes]:
+        """Prochain message, ou None après `heartbeat` secondes sans activité"""
+        try:
+            return await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat)
+        except asyncio.TimeoutError:
+            return None
+
+    async def sse_handler(self, request: web.Request) -> web.StreamResponse:
+        """GET /feed: flux Server-Sent Events (un événement 'result' par partie)"""
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream; charset=utf-8',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        await response.prepare(request)
+        subscriber = self.subscribe()
+        try:
+            await response.write(b': connecte\n\n')
+            while True:
+                payload = await self._next(subscriber)
+                if payload is None:
+                    await response.write(b': ping\n\n')
+                    continue
+                if not payload:
+                    break
+                await response.write(b'event: result\ndata: ' + payload + b'\n\n')
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.unsubscribe(subscriber)
+        return response
+
+    async def ws_handler(self, request: web.Request) -> web.WebSocketResponse:
+        """GET /ws: flux WebSocket (un message texte JSON par partie)"""
+        ws = web.WebSocketResponse(heartbeat=self.heartbeat)
+        await ws.prepare(request)
+        subscriber = self.subscribe()
+
+        async def drain_client():
+            # Les messages du client sont ignorés; la fermeture met fin au flux
+            async for message in ws:
+                if message.type in (WSMsgType.CLOSE, WSMsgType.ERROR):
+                    break
+            subscriber.close()
+
+        reader = asyncio.create_task(drain_client())
+        try:
+            while not ws.closed:
+                payload = await subscriber.queue.get()
+                if not payload:
+                    break
+                await ws.send_str(payload.decode('utf-8'))
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            reader.cancel()
+            self.unsubscribe(subscriber)
+            await ws.close()
+        return ws
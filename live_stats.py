@@ -0,0 +1,138 @@
+"""
+Statistiques en direct sur fenêtres glissantes
+Chaque fenêtre est un tampon circulaire avec des sommes courantes: mise à jour en O(1)
+L'état (derniers gagnants) est écrit périodiquement hors de la boucle, pas à chaque partie
+"""
+import asyncio
+import logging
+import os
+import yaml
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional
+
+from compact_results import WINNER_CODES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = (20, 50, 100)
+
+
+class RingWindow:
+    """Fenêtre glissante de taille fixe sur les gagnants (codes compact_results)"""
+
+    __slots__ = ('size', 'buffer', 'position', 'count', 'joueur', 'banquier')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffer = bytearray(size)
+        self.position = 0
+        self.count = 0
+        self.joueur = 0
+        self.banquier = 0
+
+    def push(self, code: int):
+        """Ajoute un gagnant et retire le plus ancien si la fenêtre est pleine"""
+        if self.count == self.size:
+            old = self.buffer[self.position]
+            if old == WINNER_CODES['Joueur']:
+                self.joueur -= 1
+            elif old == WINNER_CODES['Banquier']:
+                self.banquier -= 1
+        else:
+            self.count += 1
+
+        self.buffer[self.position] = code
+        self.position = (self.position + 1) % self.size
+        if code == WINNER_CODES['Joueur']:
+            self.joueur += 1
+        elif code == WINNER_CODES['Banquier']:
+            self.banquier += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.count
+        return {
+            'taille': self.size,
+            'total': total,
+            'joueur_victoires': self.joueur,
+            'banquier_victoires': self.banquier,
+            'taux_joueur': (self.joueur / total * 100) if total else 0.0,
+            'taux_banquier': (self.banquier / total * 100) if total else 0.0
+        }
+
+
+class LiveStats:
+    """Ensemble de fenêtres glissantes alimentées à chaque résultat enregistré"""
+
+    def __init__(self, windows: Iterable[int] = DEFAULT_WINDOWS, state_file: str = "data/live_stats.yaml"):
+        self.windows = {size: RingWindow(size) for size in sorted(set(windows)) if size > 0}
+        self.state_file = Path(state_file)
+        # Historique récent (taille de la plus grande fenêtre) pour la persistance
+        self._recent = RingWindow(max(self.windows)) if self.windows else RingWindow(1)
+        # Parties enregistrées depuis la dernière écriture de l'état
+        self._dirty = False
+        self._load_state()
+
+    def _load_state(self):
+        """Restaure les fenêtres depuis les derniers gagnants sauvegardés"""
+        try:
+            if self.state_file.exists():
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f) or {}
+                for code in data.get('recent', [])[-self._recent.size:]:
+                    self._push(code)
+        except Exception as e:
+            logger.error("❌ Erreur chargement statistiques en direct: %s", e)
+
+    def _write_state(self, codes: list):
+        """Écriture atomique (fichier temporaire puis renommage): un arrêt brutal laisse l'état précédent"""
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            yaml.dump({'recent': codes}, f, default_flow_style=True)
+        os.replace(tmp_file, self.state_file)
+
+    async def flush(self):
+        """Écrit l'état s'il a changé; instantané pris sur la boucle, écriture dans un thread"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write_state, self.recent_codes())
+        except Exception as e:
+            self._dirty = True
+            logger.error("❌ Erreur sauvegarde statistiques en direct: %s", e)
+
+    async def run(self, interval: float = 5.0):
+        """Tâche de fond: écriture de l'état toutes les `interval` secondes, et à l'arrêt"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    def recent_codes(self) -> list:
+        """Derniers gagnants, du plus ancien au plus récent"""
+        ring = self._recent
+        if ring.count < ring.size:
+            return list(ring.buffer[:ring.count])
+        return list(ring.buffer[ring.position:] + ring.buffer[:ring.position])
+
+    def _push(self, code: int):
+        self._recent.push(code)
+        for window in self.windows.values():
+            window.push(code)
+
+    def record(self, result: Dict[str, Any]):
+        """Met à jour toutes les fenêtres avec un résultat enregistré (écouteur de GameResultsManager)"""
+        self._push(WINNER_CODES.get(result.get('gagnant'), 0))
+        self._dirty = True
+
+    def window(self, size: int) -> Optional[Dict[str, Any]]:
+        """Statistiques d'une fenêtre configurée (None si la taille n'est pas suivie)"""
+        window = self.windows.get(size)
+        return window.stats() if window else None
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Statistiques de toutes les fenêtres"""
+        return {size: window.stats() for size, window in self.windows.items()}
@@ -0,0 +1,78 @@
+"""
+Journalisation non bloquante
+Les appels de log ne font qu'un put_nowait dans une file; l'écriture (console, bot.log avec rotation)
+se fait dans le thread d'un QueueListener, hors de la boucle asyncio
+"""
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Dict, Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler allégé: la version standard copie l'enregistrement et applique le formateur
+    sur le thread appelant; ici seul le message est figé (msg % args), le reste se fait à l'écriture
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # La trace doit être rendue tant que les objets existent encore
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """'telethon=WARNING,game_results_manager=DEBUG' → {'telethon': 30, 'game_results_manager': 10}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        name, level = item.split('=', 1)
+        value = logging.getLevelName(level.strip().upper())
+        if isinstance(value, int):
+            levels[name.strip()] = value
+    return levels
+
+
+def setup_logging(log_file: str = 'bot.log', level: int = logging.INFO,
+                  module_levels: Optional[Dict[str, int]] = None,
+                  max_bytes: int = 5 * 1024 * 1024, backup_count: int = 5,
+                  rotate_when: str = '') -> logging.handlers.QueueListener:
+    """
+    Installe le pipeline file → thread d'écriture et renvoie le QueueListener démarré
+    Rotation par taille (max_bytes) ou, si rotate_when est donné ('midnight', 'H'...), par période
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console = logging.StreamHandler(sys.stdout)
+    if rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8')
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    for handler in (console, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, console, file_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(level)
+
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    listener.start()
+    return listener
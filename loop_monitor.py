@@ -0,0 +1,124 @@
+"""
+Surveillance du retard de la boucle asyncio
+Une coroutine périodique mesure son retard de réveil; un thread chien de garde capture
+la pile du code qui bloque la boucle au-delà d'un seuil
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+from metrics import Gauge, Histogram
+
+LOOP_LAG_SECONDS = Histogram('bot_event_loop_lag_seconds', "Retard de réveil de la boucle asyncio",
+                             buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+LOOP_LAG_PERCENTILE = Gauge('bot_event_loop_lag_percentile_seconds',
+                            "Percentiles du retard de la boucle sur la fenêtre récente", ['quantile'])
+LOOP_BLOCKED = Gauge('bot_event_loop_blocked_seconds', "Durée du blocage en cours de la boucle asyncio")
+
+
+class LoopLagMonitor:
+    """Mesure le retard de la boucle et conserve les pires blocages avec leur pile d'appels"""
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.5, window: int = 240,
+                 worst_count: int = 5):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples: deque = deque(maxlen=window)
+        self.worst: List[Dict[str, Any]] = []
+        self.worst_count = worst_count
+        self._last_tick = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # Pile capturée pendant le blocage en cours (par le chien de garde)
+        self._pending_stack: Optional[str] = None
+
+        for quantile in ('0.5', '0.95', '0.99'):
+            LOOP_LAG_PERCENTILE.labels(quantile=quantile).set_function(
+                lambda q=float(quantile): self.percentile(q))
+        LOOP_BLOCKED.set_function(self.blocked_for)
+
+    def start(self):
+        """Démarre l'échantillonneur (dans la boucle) et le chien de garde (thread)"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._task = asyncio.create_task(self._sampler())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sampler(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_tick = now
+            self._record(max(0.0, now - expected))
+
+    def _record(self, lag: float):
+        self.samples.append(lag)
+        LOOP_LAG_SECONDS.observe(lag)
+        if lag >= self.threshold:
+            stack, self._pending_stack = self._pending_stack, None
+            self.worst.append({
+                'lag': lag,
+                'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'stack': stack or "(blocage plus court que la période du chien de garde)"
+            })
+            self.worst.sort(key=lambda entry: entry['lag'], reverse=True)
+            del self.worst[self.worst_count:]
+        else:
+            self._pending_stack = None
+
+    def _watch(self):
+        """Thread: si la boucle ne s'est pas réveillée à temps, capture la pile du thread de la boucle"""
+        while not self._stopped.wait(self.threshold / 2):
+            if self._pending_stack is None and self.blocked_for() >= self.threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending_stack = ''.join(traceback.format_stack(frame, limit=12))
+
+    def blocked_for(self) -> float:
+        """Depuis combien de temps la boucle aurait dû se réveiller (0 si elle est à l'heure)"""
+        if self._task is None:
+            return 0.0
+        return max(0.0, time.monotonic() - self._last_tick - self.interval)
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def is_healthy(self) -> bool:
+        """Santé dégradée si la boucle est bloquée ou si le p95 récent dépasse le seuil"""
+        return self.blocked_for() < self.threshold and self.percentile(0.95) < self.threshold
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'healthy': self.is_healthy(),
+            'threshold_ms': self.threshold * 1000,
+            'blocked_ms': round(self.blocked_for() * 1000, 1),
+            'lag_ms': {
+                'p50': round(self.percentile(0.5) * 1000, 1),
+                'p95': round(self.percentile(0.95) * 1000, 1),
+                'p99': round(self.percentile(0.99) * 1000, 1),
+                'max': round(max(self.samples, default=0.0) * 1000, 1)
+            },
+            'worst': [
+                {'lag_ms': round(entry['lag'] * 1000, 1), 'at': entry['at'], 'stack': entry['stack']}
+                for entry in self.worst
+            ]
+        }
@@ -1,33 +1,54 @@
 import os
 import asyncio
+import atexit
 import json
+import itertools
+import re
 import logging
-import sys
-import zipfile
-import shutil
+import tempfile
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from telethon import TelegramClient, events
 from telethon.events import ChatAction
 from dotenv import load_dotenv
-from game_results_manager import GameResultsManager
 from yaml_manager import YAMLDataManager
+import analytics
+import backtest
+from live_stats import DEFAULT_WINDOWS
+from channel_stores import ChannelRegistry, ChannelStore
+from shared_storage import Coordinator, FileLock, SharedPreviousDayGames
+from http_cache import CachedResponse, Snapshot
+from live_feed import LiveFeedHub
+from predictions import PredictionEngine
+from deploy_bundle import DeployBundle, BUNDLE_NAME
+from record_rules import load_rules
+from results_import import SUPPORTED_SUFFIXES
+from results_index import matches
+from day_archive import RetentionPolicy
+from loop_monitor import LoopLagMonitor
+from profiler import profile_session, MAX_DURATION
+from logging_setup import setup_logging, parse_module_levels
+import metrics
+from metrics import Counter, Gauge, Histogram
 from aiohttp import web
 from pathlib import Path
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('bot.log', encoding='utf-8')
-    ]
-)
-logger = logging.getLogger(__name__)
-
 # Charger les variables d'environnement
 load_dotenv()
 
+# Configuration du logging: écriture console + bot.log (rotation) dans un thread dédié
+# LOG_LEVELS règle les niveaux par module, ex: "telethon=WARNING,game_results_manager=DEBUG"
+log_listener = setup_logging(
+    log_file='bot.log',
+    level=logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper()),
+    module_levels=parse_module_levels(os.getenv('LOG_LEVELS', '')),
+    max_bytes=int(os.getenv('LOG_MAX_BYTES') or 5 * 1024 * 1024),
+    backup_count=int(os.getenv('LOG_BACKUP_COUNT') or 5),
+    rotate_when=os.getenv('LOG_ROTATE_WHEN', '')
+)
+atexit.register(log_listener.stop)
+logger = logging.getLogger(__name__)
+
 # --- CONFIGURATION ---
 try:
     API_ID = int(os.getenv('API_ID') or '0')
@@ -35,6 +56,22 @@ try:
     BOT_TOKEN = os.getenv('BOT_TOKEN') or ''
     ADMIN_ID = int(os.getenv('ADMIN_ID') or '0')
     PORT = int(os.getenv('PORT') or '10000')
+    STATS_WINDOWS = [int(size) for size in (os.getenv('STATS_WINDOWS') or '').split(',') if size.strip()] \
+        or list(DEFAULT_WINDOWS)
+    LOOP_LAG_THRESHOLD = float(os.getenv('LOOP_LAG_THRESHOLD_MS') or '500') / 1000
+    # Mode multi-workers: base SQLite partagée (ex: data/shared.db) et identifiant du worker
+    SHARED_DB = os.getenv('SHARED_DB') or ''
+    WORKER_ID = os.getenv('WORKER_ID') or None
+    # Règles d'enregistrement (marqueurs, conditions par groupe, séquence)
+    RULES_FILE = os.getenv('RULES_FILE') or 'record_rules.yaml'
+    # Âge maximal de l'instantané /status (écritures des autres workers, horodatage)
+    STATUS_MAX_AGE = float(os.getenv('STATUS_MAX_AGE') or '5') or 5.0
+    # Rétention des archives quotidiennes (jours, taille totale en Mo) et des prédictions (planifications et historique)
+    RETENTION = RetentionPolicy(
+        archive_days=int(os.getenv('ARCHIVE_RETENTION_DAYS') or '90') or None,
+        max_archive_mb=float(os.getenv('ARCHIVE_MAX_MB') or '0') or None,
+        prediction_days=int(os.getenv('PREDICTION_RETENTION_DAYS') or '30') or None
+    )
 
     # Validation des variables requises
     if not API_ID or API_ID == 0:
@@ -44,9 +81,9 @@ try:
     if not BOT_TOKEN:
         raise ValueError("BOT_TOKEN manquant")
 
-    logger.info(f"✅ Configuration chargée: API_ID={API_ID}, ADMIN_ID={ADMIN_ID}, PORT={PORT}")
+    logger.info("✅ Configuration chargée: API_ID=%s, ADMIN_ID=%s, PORT=%s", API_ID, ADMIN_ID, PORT)
 except Exception as e:
-    logger.error(f"❌ Erreur configuration: {e}")
+    logger.error("❌ Erreur configuration: %s", e)
     logger.error("Vérifiez vos variables d'environnement dans le fichier .env")
     exit(1)
 
@@ -54,50 +91,126 @@ except Exception as e:
 CONFIG_FILE = 'bot_config.json'
 
 # Variables globales
-detected_stat_channel = None
 confirmation_pending = {}
 transfer_enabled = True
+# Message du canal → message transféré à l'administrateur, clé (canal, message)
+transferred_messages = {}
 
 # Gestionnaires
-yaml_manager = YAMLDataManager()
-results_manager = GameResultsManager()
+# Mode multi-workers: les fichiers de prédictions sont aussi protégés par un verrou de fichier
+yaml_manager = YAMLDataManager(file_lock=FileLock(Path("data") / "predictions.lock") if SHARED_DB else None)
+# Mode multi-workers: coordination SQLite (bail du leader, boîte d'envoi) et verrou par stockage de canal
+coordinator = Coordinator(SHARED_DB, worker_id=WORKER_ID) if SHARED_DB else None
+# Canaux surveillés: un stockage (résultats, index, archive, fenêtres) et une file de traitement par canal
+channels = ChannelRegistry(windows=STATS_WINDOWS,
+                           lock_factory=(lambda data_dir: FileLock(data_dir / "results.lock")) if coordinator else None,
+                           previous_day_factory=((lambda channel_id: SharedPreviousDayGames(coordinator, channel_id))
+                                                 if coordinator else None))
+try:
+    channels.set_rules(load_rules(RULES_FILE))
+except ValueError as e:
+    logger.error("❌ %s, règles par défaut utilisées", e)
+rules_mtime = os.stat(RULES_FILE).st_mtime_ns if os.path.exists(RULES_FILE) else None
+live_feed = LiveFeedHub()
+channels.add_listener(lambda channel_id, result: live_feed.publish(dict(result, canal=channel_id)))
+# Prédictions: modèle mis à jour à chaque partie, stockées dans predictions.yaml / auto_predictions.yaml
+predictions = PredictionEngine(yaml_manager)
+if coordinator is not None:
+    # Mode multi-workers: chaque worker ne voit que les parties qu'il a traitées; elles passent par la
+    # boîte d'envoi partagée et seul le leader met à jour le modèle et écrit les fichiers de prédictions
+    # (dépôt fait dans le thread d'enregistrement, dans l'ordre des parties)
+    channels.add_listener(lambda channel_id, result: coordinator.enqueue(
+        'game', {'channel_id': channel_id, 'result': result}), thread_safe=True)
+else:
+    channels.add_listener(predictions.record)
+loop_monitor = LoopLagMonitor(threshold=LOOP_LAG_THRESHOLD)
+# Package /deploy construit en mémoire, mis en cache tant que les sources ne changent pas
+deploy_bundle = DeployBundle()
 
 # Client Telegram
 import time
 session_name = f'bot_session_{int(time.time())}'
 client = TelegramClient(session_name, API_ID, API_HASH)
 
+# Métriques des envois Telegram, de la remise à zéro et de l'état courant
+SEND_SECONDS = Histogram('bot_telegram_send_seconds', "Durée des appels sortants vers Telegram", ['method'])
+SEND_ERRORS = Counter('bot_telegram_send_errors', "Appels sortants vers Telegram en échec", ['method'])
+metrics.instrument_async_methods(client, ('send_message', 'edit_message', 'send_file'), SEND_SECONDS, SEND_ERRORS)
+DAILY_RESET_SECONDS = Histogram('bot_daily_reset_seconds', "Durée de la remise à zéro quotidienne",
+                                buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+DAILY_RESETS = Counter('bot_daily_resets', "Remises à zéro quotidiennes", ['outcome'])
+Gauge('bot_results_stored', "Parties enregistrées dans la journée en cours (tous canaux)").set_function(
+    lambda: sum(len(store.results.get_index()) for store in channels))
+Gauge('bot_results_generation', "Générations cumulées des fichiers de résultats").set_function(
+    lambda: sum(store.results.generation for store in channels))
+Gauge('bot_parse_cache_entries', "Entrées des caches d'analyse").set_function(
+    lambda: sum(store.results.parse_cache_entries() for store in channels))
+
+
+def parse_cache_stats() -> dict:
+    """Statistiques cumulées des caches d'analyse de tous les canaux"""
+    stats = [store.results.get_parse_cache_stats() for store in channels]
+    hits, misses = sum(s['hits'] for s in stats), sum(s['misses'] for s in stats)
+    return {
+        'size': sum(s['size'] for s in stats),
+        'capacity': sum(s['capacity'] for s in stats),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': (hits / (hits + misses) * 100) if hits + misses else 0.0,
+        'memory_bytes': sum(s['memory_bytes'] for s in stats)
+    }
+
+
+Gauge('bot_parse_cache_hit_rate', "Taux de succès des caches d'analyse (%)").set_function(
+    lambda: parse_cache_stats()['hit_rate'])
+Gauge('bot_parse_cache_memory_bytes', "Mémoire approximative des caches d'analyse").set_function(
+    lambda: parse_cache_stats()['memory_bytes'])
+Gauge('bot_channels_monitored', "Canaux surveillés").set_function(lambda: len(channels))
+
 
 def load_config():
-    """Charge la configuration depuis le fichier JSON"""
-    global detected_stat_channel
+    """
+    Charge la configuration depuis le fichier JSON (ancien format à un seul canal accepté)
+    Renvoie les canaux configurés, ou None si le fichier est absent ou illisible
+    """
     try:
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
                 config = json.load(f)
-                detected_stat_channel = config.get('stat_channel')
-                logger.info(f"✅ Configuration chargée: Canal={detected_stat_channel}")
+            legacy_channel = config.get('stat_channel')
+            channels.legacy_channel = legacy_channel
+            entries = config.get('stat_channels')
+            if entries is None:
+                entries = [{'id': legacy_channel}] if legacy_channel else []
+            for entry in entries:
+                channels.add(int(entry['id']), entry.get('title'))
+            logger.info("✅ Configuration chargée: Canaux=%s", channels.ids())
+            return [int(entry['id']) for entry in entries]
         else:
             logger.info("ℹ️ Aucune configuration trouvée")
     except Exception as e:
-        logger.warning(f"⚠️ Erreur chargement configuration: {e}")
+        logger.warning("⚠️ Erreur chargement configuration: %s", e)
+    return None
 
 
 def save_config():
     """Sauvegarde la configuration dans le fichier JSON"""
     try:
         config = {
-            'stat_channel': detected_stat_channel
+            # Canal historique (stockage dans data/), puis tous les canaux surveillés
+            'stat_channel': channels.legacy_channel,
+            'stat_channels': [{'id': store.channel_id, 'title': store.title} for store in channels]
         }
         with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
+            json.dump(config, f, indent=2, ensure_ascii=False)
 
         if yaml_manager:
-            yaml_manager.set_config('stat_channel', detected_stat_channel)
+            yaml_manager.set_config('stat_channel', channels.legacy_channel)
+            yaml_manager.set_config('stat_channels', channels.ids())
 
-        logger.info(f"💾 Configuration sauvegardée: Canal={detected_stat_channel}")
+        logger.info("💾 Configuration sauvegardée: Canaux=%s", channels.ids())
     except Exception as e:
-        logger.error(f"❌ Erreur sauvegarde configuration: {e}")
+        logger.error("❌ Erreur sauvegarde configuration: %s", e)
 
 
 async def start_bot():
@@ -110,15 +223,16 @@ async def start_bot():
 
         me = await client.get_me()
         username = getattr(me, 'username', 'Unknown') or f"ID:{getattr(me, 'id', 'Unknown')}"
-        logger.info(f"✅ Bot opérationnel: @{username}")
+        logger.info("✅ Bot opérationnel: @%s", username)
 
-        if detected_stat_channel:
-            logger.info(f"📊 Surveillance du canal: {detected_stat_channel}")
+        if channels:
+            for store in channels:
+                logger.info("📊 Surveillance du canal: %s (%s)", store.title, store.channel_id)
         else:
             logger.info("⚠️ Aucun canal configuré. Ajoutez le bot à un canal pour commencer.")
 
     except Exception as e:
-        logger.error(f"❌ Erreur démarrage: {e}")
+        logger.error("❌ Erreur démarrage: %s", e)
         return False
 
     return True
@@ -164,18 +278,18 @@ Le bot stockera automatiquement les parties où le premier groupe de parenthèse
 
                 try:
                     await client.send_message(ADMIN_ID, invitation_msg)
-                    logger.info(f"✉️ Invitation envoyée pour: {chat_title} ({channel_id})")
+                    logger.info("✉️ Invitation envoyée pour: %s (%s)", chat_title, channel_id)
                 except Exception as e:
-                    logger.error(f"❌ Erreur envoi invitation: {e}")
+                    logger.error("❌ Erreur envoi invitation: %s", e)
 
     except Exception as e:
-        logger.error(f"❌ Erreur dans handler_join: {e}")
+        logger.error("❌ Erreur dans handler_join: %s", e)
 
 
 @client.on(events.NewMessage(pattern=r'/set_channel (-?\d+)'))
 async def set_channel(event):
-    """Configure le canal à surveiller"""
-    global detected_stat_channel, confirmation_pending
+    """Ajoute un canal à la liste des canaux surveillés"""
+    global confirmation_pending
 
     try:
         if event.is_group or event.is_channel:
@@ -188,22 +302,27 @@ async def set_channel(event):
         match = event.pattern_match
         channel_id = int(match.group(1))
 
+        if channel_id in channels:
+            await event.respond(f"ℹ️ Le canal {channel_id} est déjà surveillé")
+            return
+
         if channel_id not in confirmation_pending:
             await event.respond("❌ Ce canal n'est pas en attente de configuration")
             return
 
-        detected_stat_channel = channel_id
-        confirmation_pending[channel_id] = 'configured'
-        save_config()
-
         try:
             chat = await client.get_entity(channel_id)
             chat_title = getattr(chat, 'title', f'Canal {channel_id}')
         except:
             chat_title = f'Canal {channel_id}'
 
+        channels.add(channel_id, chat_title)
+        confirmation_pending[channel_id] = 'configured'
+        save_config()
+
         await event.respond(f"""✅ **Canal configuré avec succès**
 📋 {chat_title}
+📡 Canaux surveillés: {len(channels)}
 
 Le bot va maintenant:
 • Surveiller les messages de ce canal
@@ -211,15 +330,62 @@ Le bot va maintenant:
 • Identifier le gagnant (Joueur ou Banquier)
 • Ignorer les matchs nuls et les cas où les deux groupes ont 3 cartes
 
-Utilisez /fichier pour exporter les résultats.""")
+Utilisez /fichier pour exporter les résultats et /channels pour lister les canaux.""")
 
-        logger.info(f"✅ Canal configuré: {channel_id}")
+        logger.info("✅ Canal configuré: %s", channel_id)
 
     except Exception as e:
-        logger.error(f"❌ Erreur set_channel: {e}")
+        logger.error("❌ Erreur set_channel: %s", e)
 
 
-transferred_messages = {}
+@client.on(events.NewMessage(pattern=r'/channels$'))
+async def cmd_channels(event):
+    """Liste les canaux surveillés"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    if not channels:
+        await event.respond("📡 Aucun canal surveillé. Ajoutez le bot à un canal puis utilisez `/set_channel ID`.")
+        return
+
+    lines = []
+    for store in channels:
+        stats = store.results.get_stats()
+        message_format = store.results.formats.name or "en détection"
+        lines.append(f"• **{store.title}** (`{store.channel_id}`)\n"
+                     f"  {stats['total']} parties aujourd'hui, {store.queue.qsize()} message(s) en file, "
+                     f"format {message_format}")
+    await event.respond("📡 **Canaux surveillés**\n\n" + "\n".join(lines))
+
+
+@client.on(events.NewMessage(pattern=r'/remove_channel (-?\d+)'))
+async def cmd_remove_channel(event):
+    """Arrête la surveillance d'un canal (ses données restent sur le disque)"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        channel_id = int(event.pattern_match.group(1))
+        store = await channels.remove(channel_id)
+        if store is None:
+            await event.respond(f"❌ Le canal {channel_id} n'est pas surveillé")
+            return
+
+        confirmation_pending.pop(channel_id, None)
+        save_config()
+        await event.respond(f"📴 **Canal retiré**: {store.title}\n\nSes données restent dans `{store.data_dir}`.")
+
+    except Exception as e:
+        logger.error("❌ Erreur remove_channel: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
 
 
 @client.on(events.NewMessage())
@@ -238,12 +404,14 @@ async def handle_message(event):
                     if message_text == 'OUI':
                         await event.respond("🔄 **Remise à zéro en cours...**")
 
-                        results_manager._save_yaml([])
+                        for store in channels:
+                            store.results._save_yaml([])
                         logger.info("✅ Base de données remise à zéro manuellement")
 
                         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
                         new_file_path = f"resultats_{timestamp}.xlsx"
-                        empty_file = results_manager.export_to_txt(file_path=new_file_path)
+                        empty_file = channels.primary.results.export_to_txt(file_path=new_file_path) \
+                            if channels.primary else None
 
                         if empty_file and os.path.exists(empty_file):
                             await client.send_file(
@@ -260,76 +428,136 @@ async def handle_message(event):
                         del confirmation_pending[event.sender_id]
                         return
 
-        if detected_stat_channel and event.chat_id == detected_stat_channel:
-            message_text = event.message.message
-            logger.info(f"📨 Message du canal: {message_text[:100]}...")
+        store = channels.get(event.chat_id)
+        if store is not None:
+            await store.submit(event.message.id, event.message.message, edited=False)
 
-            if transfer_enabled:
-                try:
-                    transfer_msg = f"📨 **Message du canal:**\n\n{message_text}"
-                    sent_msg = await client.send_message(ADMIN_ID, transfer_msg)
-                    transferred_messages[event.message.id] = sent_msg.id
-                except Exception as e:
-                    logger.error(f"❌ Erreur transfert message: {e}")
+    except Exception as e:
+        logger.exception("❌ Erreur traitement message: %s", e)
 
-            success, info = results_manager.process_message(message_text)
 
-            if success:
-                logger.info(f"✅ {info}")
-                try:
-                    stats = results_manager.get_stats()
-                    notification = f"""✅ **Partie enregistrée!**
+@client.on(events.MessageEdited())
+async def handle_edited_message(event):
+    """Traite les messages édités"""
+    try:
+        store = channels.get(event.chat_id)
+        if store is not None:
+            await store.submit(event.message.id, event.message.message, edited=True)
 
-{info}
+    except Exception as e:
+        logger.exception("❌ Erreur traitement message édité: %s", e)
 
-📊 **Statistiques actuelles:**
-• Total: {stats['total']} parties
-• Joueur: {stats['joueur_victoires']} ({stats['taux_joueur']:.1f}%)
-• Banquier: {stats['banquier_victoires']} ({stats['taux_banquier']:.1f}%)"""
-                    await client.send_message(ADMIN_ID, notification)
-                except Exception as e:
-                    logger.error(f"Erreur notification: {e}")
-            else:
-                logger.info(f"⚠️ Message ignoré: {info}")
 
-    except Exception as e:
-        logger.error(f"❌ Erreur traitement message: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+async def off_loop(func, *args):
+    """
+    Mode multi-workers: appel bloquant (base SQLite partagée, verrou de fichier) fait dans un thread,
+    un worker voisin lent ne bloque ni les autres canaux ni le serveur web; appel direct sinon
+    """
+    if coordinator is None:
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
 
 
-@client.on(events.MessageEdited())
-async def handle_edited_message(event):
-    """Traite les messages édités"""
+def channel_label(store: ChannelStore) -> str:
+    """Nom du canal à afficher dans les messages dès que plusieurs canaux sont surveillés"""
+    return f" — {store.title}" if len(channels) > 1 else ""
+
+
+def is_transfer_enabled() -> bool:
+    """Réglage partagé entre workers en mode multi-workers"""
+    if coordinator is not None:
+        return coordinator.get_setting('transfer_enabled', True)
+    return transfer_enabled
+
+
+def set_transfer_enabled(enabled: bool):
+    global transfer_enabled
+    transfer_enabled = enabled
+    if coordinator is not None:
+        coordinator.set_setting('transfer_enabled', enabled)
+
+
+def get_transferred(channel_id: int, message_id: int):
+    if coordinator is not None:
+        return coordinator.get_transfer(channel_id, message_id)
+    return transferred_messages.get((channel_id, message_id))
+
+
+def set_transferred(channel_id: int, message_id: int, admin_message_id: int):
+    if coordinator is not None:
+        coordinator.set_transfer(channel_id, message_id, admin_message_id)
+    else:
+        transferred_messages[(channel_id, message_id)] = admin_message_id
+
+
+async def transfer_channel_message(channel_id: int, label: str, message_id: int, message_text: str, edited: bool):
+    """Transfère (ou met à jour) le message du canal en privé à l'administrateur"""
+    admin_msg_id = get_transferred(channel_id, message_id) if edited else None
+    if admin_msg_id is not None:
+        try:
+            transfer_msg = f"📨 **Message du canal{label} (✏️ ÉDITÉ):**\n\n{message_text}"
+            await client.edit_message(ADMIN_ID, admin_msg_id, transfer_msg)
+            logger.debug("✅ Message transféré édité")
+        except Exception as e:
+            logger.error("❌ Erreur édition message transféré: %s", e)
+        return
+
     try:
-        if detected_stat_channel and event.chat_id == detected_stat_channel:
-            message_text = event.message.message
-            logger.info(f"✏️ Message édité dans le canal: {message_text[:100]}...")
-
-            if transfer_enabled:
-                if event.message.id in transferred_messages:
-                    admin_msg_id = transferred_messages[event.message.id]
-                    try:
-                        transfer_msg = f"📨 **Message du canal (✏️ ÉDITÉ):**\n\n{message_text}"
-                        await client.edit_message(ADMIN_ID, admin_msg_id, transfer_msg)
-                        logger.info(f"✅ Message transféré édité")
-                    except Exception as e:
-                        logger.error(f"❌ Erreur édition message transféré: {e}")
-                else:
-                    try:
-                        transfer_msg = f"📨 **Message du canal (✏️ ÉDITÉ - nouveau):**\n\n{message_text}"
-                        sent_msg = await client.send_message(ADMIN_ID, transfer_msg)
-                        transferred_messages[event.message.id] = sent_msg.id
-                    except Exception as e:
-                        logger.error(f"❌ Erreur transfert message édité: {e}")
+        header = f"📨 **Message du canal{label} (✏️ ÉDITÉ - nouveau):**" if edited else f"📨 **Message du canal{label}:**"
+        sent_msg = await client.send_message(ADMIN_ID, f"{header}\n\n{message_text}")
+        set_transferred(channel_id, message_id, sent_msg.id)
+    except Exception as e:
+        logger.error("❌ Erreur transfert message: %s", e)
 
-            success, info = results_manager.process_message(message_text)
 
-            if success:
-                logger.info(f"✅ {info}")
-                try:
-                    stats = results_manager.get_stats()
-                    notification = f"""✅ **Partie enregistrée (message finalisé)!**
+async def deliver_admin(kind: str, payload: dict):
+    """Envoi effectif d'une notification à l'administrateur"""
+    if kind == 'transfer':
+        await transfer_channel_message(payload['channel_id'], payload['label'], payload['message_id'],
+                                       payload['text'], payload['edited'])
+    else:
+        await client.send_message(ADMIN_ID, payload['text'])
+
+
+async def send_admin(kind: str, payload: dict):
+    """
+    Notification à l'administrateur: envoi direct en mode simple; en mode multi-workers,
+    dépôt dans la boîte d'envoi partagée que seul le leader vide (un seul envoi par notification)
+    """
+    if coordinator is not None:
+        await asyncio.to_thread(coordinator.enqueue, kind, payload)
+    else:
+        await deliver_admin(kind, payload)
+
+
+async def process_channel_message(store: ChannelStore, message_id: int, message_text: str, edited: bool):
+    """Traitement d'un message d'un canal surveillé (tâche de la file du canal, dans l'ordre d'arrivée)"""
+    if coordinator is not None and not await asyncio.to_thread(coordinator.claim_message, store.channel_id,
+                                                               message_id, message_text):
+        # Cette version du message a déjà été traitée (par un autre worker ou lors d'un rejeu)
+        logger.debug("↩️ Message %s du canal %s déjà traité", message_id, store.channel_id)
+        return
+
+    if edited:
+        logger.debug("✏️ Message édité dans le canal %s: %s...", store.channel_id, message_text[:100])
+    else:
+        logger.debug("📨 Message du canal %s: %s...", store.channel_id, message_text[:100])
+
+    store.day_archive.journal.append(message_id, message_text, edited)
+
+    if await off_loop(is_transfer_enabled):
+        await send_admin('transfer', {'channel_id': store.channel_id, 'label': channel_label(store),
+                                      'message_id': message_id, 'text': message_text, 'edited': edited})
+
+    # Écouteurs de la boucle (statistiques, flux en direct) rappelés sur la boucle avant la reprise
+    success, info = await off_loop(store.results.process_message, message_text)
+
+    if success:
+        logger.info("✅ %s%s", info, channel_label(store))
+        try:
+            stats = await off_loop(store.results.get_stats)
+            title = "Partie enregistrée (message finalisé)!" if edited else "Partie enregistrée!"
+            notification = f"""✅ **{title}**{channel_label(store)}
 
 {info}
 
@@ -337,17 +565,13 @@ async def handle_edited_message(event):
 • Total: {stats['total']} parties
 • Joueur: {stats['joueur_victoires']} ({stats['taux_joueur']:.1f}%)
 • Banquier: {stats['banquier_victoires']} ({stats['taux_banquier']:.1f}%)"""
-                    await client.send_message(ADMIN_ID, notification)
-                except Exception as e:
-                    logger.error(f"Erreur notification: {e}")
-            else:
-                if "en cours d'édition" not in info:
-                    logger.info(f"⚠️ Message édité ignoré: {info}")
-
-    except Exception as e:
-        logger.error(f"❌ Erreur traitement message édité: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+            await send_admin('message', {'text': notification})
+        except Exception as e:
+            logger.error("Erreur notification: %s", e)
+    elif not edited:
+        logger.debug("⚠️ Message ignoré: %s", info)
+    elif "en cours d'édition" not in info:
+        logger.debug("⚠️ Message édité ignoré: %s", info)
 
 
 @client.on(events.NewMessage(pattern='/start'))
@@ -373,6 +597,19 @@ Ce bot stocke automatiquement les résultats des parties où le premier groupe d
 Développé pour stocker les victoires Joueur/Banquier.""")
 
 
+async def resolve_store(event, channel_arg: str = None):
+    """Canal désigné par l'argument de commande (canal par défaut si absent); répond si introuvable"""
+    if channel_arg:
+        store = channels.get(int(channel_arg))
+        if store is None:
+            await event.respond(f"❌ Le canal {channel_arg} n'est pas surveillé (voir /channels)")
+        return store
+    store = channels.primary
+    if store is None:
+        await event.respond("❌ Aucun canal configuré")
+    return store
+
+
 @client.on(events.NewMessage(pattern='/status'))
 async def cmd_status(event):
     """Affiche le statut du bot"""
@@ -384,18 +621,24 @@ async def cmd_status(event):
         return
 
     try:
-        stats = results_manager.get_stats()
+        channel_sections = []
+        for store in channels:
+            stats = store.results.get_stats()
+            channel_sections.append(f"""**{store.title}** (`{store.channel_id}`):
+• Total de parties: {stats['total']}
+• Victoires Joueur: {stats['joueur_victoires']} ({stats['taux_joueur']:.1f}%)
+• Victoires Banquier: {stats['banquier_victoires']} ({stats['taux_banquier']:.1f}%)""")
 
+        cache = parse_cache_stats()
         status_msg = f"""📊 **STATUT DU BOT**
 
 **Configuration:**
-• Canal surveillé: {f'✅ Configuré (ID: {detected_stat_channel})' if detected_stat_channel else '❌ Non configuré'}
-• Transfert des messages: {'🔔 Activé' if transfer_enabled else '🔕 Désactivé'}
+• Canaux surveillés: {f'✅ {len(channels)}' if channels else '❌ Non configuré'}
+• Transfert des messages: {'🔔 Activé' if is_transfer_enabled() else '🔕 Désactivé'}
+• Cache d'analyse: {cache['size']}/{cache['capacity']} entrées, {cache['hit_rate']:.1f}% de succès
 
 **Statistiques:**
-• Total de parties: {stats['total']}
-• Victoires Joueur: {stats['joueur_victoires']} ({stats['taux_joueur']:.1f}%)
-• Victoires Banquier: {stats['banquier_victoires']} ({stats['taux_banquier']:.1f}%)
+{chr(10).join(channel_sections) or '• Aucun canal configuré'}
 
 **Critères de stockage:**
 ✅ Exactement 3 cartes dans le premier groupe
@@ -408,13 +651,150 @@ Utilisez /fichier pour exporter les résultats."""
         await event.respond(status_msg)
 
     except Exception as e:
-        logger.error(f"❌ Erreur status: {e}")
+        logger.error("❌ Erreur status: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+@client.on(events.NewMessage(pattern=r'/stats(?:\s+(\d+))?(?:\s+(-\d+))?$'))
+async def cmd_stats(event):
+    """Taux sur les N dernières parties enregistrées (fenêtres glissantes)"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        store = await resolve_store(event, event.pattern_match.group(2))
+        if store is None:
+            return
+        live_stats = store.live_stats
+
+        size = event.pattern_match.group(1)
+        if size:
+            window = live_stats.window(int(size))
+            if window is None:
+                sizes = ', '.join(str(s) for s in live_stats.windows)
+                await event.respond(f"❌ Fenêtre {size} non suivie. Fenêtres disponibles: {sizes}")
+                return
+            windows = {int(size): window}
+        else:
+            windows = live_stats.snapshot()
+
+        lines = [
+            f"• {size} dernières ({w['total']}): Joueur {w['taux_joueur']:.1f}% | Banquier {w['taux_banquier']:.1f}%"
+            for size, w in windows.items()
+        ]
+        await event.respond(f"📊 **Statistiques glissantes**{channel_label(store)}\n\n" + "\n".join(lines))
+
+    except Exception as e:
+        logger.error("❌ Erreur stats: %s", e)
         await event.respond(f"❌ Erreur: {e}")
 
 
-@client.on(events.NewMessage(pattern='/fichier'))
+EXPORT_WINNERS = {'joueur': 'Joueur', 'banquier': 'Banquier'}
+
+
+def parse_range(value: str) -> tuple:
+    """'A..B', 'A..', '..B' ou 'A' (une seule valeur: A..A) → (début ou None, fin ou None)"""
+    if '..' not in value:
+        return value, value
+    start, end = value.split('..', 1)
+    return start or None, end or None
+
+
+def is_export_date(value: str) -> bool:
+    """Borne de date de /fichier: AAAA-MM-JJ, suivie ou non de HH:MM[:SS], et date réelle"""
+    match = re.fullmatch(r'(\d{4}-\d{2}-\d{2})(?:[ T](\d{2}:\d{2}(?::\d{2})?))?', value)
+    if match is None:
+        return False
+    day, clock = match.groups()
+    clock = clock or '00:00'
+    try:
+        datetime.strptime(f"{day} {clock}", '%Y-%m-%d %H:%M:%S' if clock.count(':') == 2 else '%Y-%m-%d %H:%M')
+    except ValueError:
+        return False
+    return True
+
+
+def parse_export_args(text: str) -> tuple:
+    """
+    Arguments de /fichier: date:DEBUT..FIN, num:MIN..MAX, derniers:N, gagnant:joueur|banquier, canal
+    Renvoie (filtres de ResultsIndex.query, N derniers ou None, canal ou None); ValueError si invalide
+    """
+    filters = {'min_numero': None, 'max_numero': None, 'since': None, 'until': None, 'winner': None}
+    last = None
+    channel_arg = None
+    for token in text.split():
+        key, _, value = token.partition(':')
+        if not value and re.fullmatch(r'-\d+', token):
+            channel_arg = token
+        elif key == 'date' and value:
+            filters['since'], filters['until'] = parse_range(value)
+            for bound in (filters['since'], filters['until']):
+                if bound is not None and not is_export_date(bound):
+                    raise ValueError(f"Date invalide: {bound} (AAAA-MM-JJ)")
+        elif key == 'num' and value:
+            low, high = parse_range(value)
+            if not all(bound is None or bound.isdigit() for bound in (low, high)):
+                raise ValueError(f"Numéros invalides: {value} (ex: num:200..350)")
+            filters['min_numero'] = int(low) if low is not None else None
+            filters['max_numero'] = int(high) if high is not None else None
+        elif key == 'derniers' and value.isdigit() and int(value) > 0:
+            last = int(value)
+        elif key == 'gagnant' and value.lower() in EXPORT_WINNERS:
+            filters['winner'] = EXPORT_WINNERS[value.lower()]
+        else:
+            raise ValueError(f"Argument invalide: {token}")
+    return filters, last, channel_arg
+
+
+def describe_export_filters(filters: dict, last) -> str:
+    parts = []
+    if filters['since'] or filters['until']:
+        parts.append(f"dates {filters['since'] or '…'} → {filters['until'] or '…'}")
+    if filters['min_numero'] is not None or filters['max_numero'] is not None:
+        parts.append(f"jeux #{filters['min_numero'] or '…'} → #{filters['max_numero'] or '…'}")
+    if filters['winner']:
+        parts.append(f"gagnant {filters['winner']}")
+    if last:
+        parts.append(f"{last} derniers")
+    return ', '.join(parts)
+
+
+def iter_archived_rows(store: ChannelStore, filters: dict):
+    """
+    Résultats des journées archivées dans la plage de dates (lus en flux, filtrés à la lecture)
+    Seules les archives des jours concernés sont ouvertes; la veille est incluse car une journée
+    archivée va jusqu'à 00h59 le lendemain
+    """
+    if filters['since'] is None and filters['until'] is None:
+        return
+    first_day = None
+    if filters['since']:
+        first_day = (datetime.strptime(filters['since'][:10], '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    last_day = filters['until'][:10] if filters['until'] else None
+    for day in store.day_archive.days():
+        if (first_day is None or day >= first_day) and (last_day is None or day <= last_day):
+            for row in store.day_archive.iter_results(day):
+                if matches(row, **filters):
+                    yield row
+
+
+def export_selection(store: ChannelStore, file_path: str, current: list, filters: dict, last) -> tuple:
+    """Thread: lignes archivées de la plage puis lignes sélectionnées du stock, exportées; (fichier, lignes)"""
+    rows = itertools.chain(iter_archived_rows(store, filters), current)
+    rows = list(deque(rows, maxlen=last) if last else rows)
+    return store.results.export_to_txt(file_path, rows), len(rows)
+
+
+@client.on(events.NewMessage(pattern=r'/fichier((?:\s+\S+)*)$'))
 async def cmd_fichier(event):
-    """Exporte les résultats en fichier Excel"""
+    """
+    Exporte les résultats en fichier Excel (un fichier par canal, ou le canal indiqué)
+    Filtres optionnels: date:DEBUT..FIN, num:MIN..MAX, derniers:N, gagnant:joueur|banquier
+    """
     if event.is_group or event.is_channel:
         return
 
@@ -423,21 +803,401 @@ async def cmd_fichier(event):
         return
 
     try:
-        await event.respond("📊 Génération du fichier Excel en cours...")
-        file_path = results_manager.export_to_txt()
+        try:
+            filters, last, channel_arg = parse_export_args(event.pattern_match.group(1) or '')
+        except ValueError as e:
+            await event.respond(f"❌ {e}\nExemples: `/fichier derniers:100`, `/fichier num:200..350 gagnant:joueur`, "
+                                f"`/fichier date:2025-01-10..2025-01-12`")
+            return
 
-        if file_path and os.path.exists(file_path):
-            await client.send_file(
-                event.chat_id,
-                file_path,
-                caption="📊 **Export des résultats**\n\nFichier Excel généré avec succès!"
-            )
-            logger.info("✅ Fichier Excel exporté et envoyé")
+        if channel_arg:
+            store = await resolve_store(event, channel_arg)
+            stores = [store] if store else []
         else:
-            await event.respond("❌ Erreur lors de la génération du fichier Excel")
+            stores = list(channels)
+            if not stores:
+                await event.respond("❌ Aucun canal configuré")
+
+        description = describe_export_filters(filters, last)
+        for store in stores:
+            await event.respond(f"📊 Génération du fichier Excel en cours...{channel_label(store)}")
+            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+            file_path = f"resultats_{timestamp}{store.file_suffix}.xlsx"
+
+            # Plages sur l'index trié (bisect): seules les lignes retenues sont copiées puis exportées
+            index = store.results.get_index()
+            current = index.tail(last, **filters) if last else list(index.query(**filters))
+            file_path, count = await asyncio.to_thread(export_selection, store, file_path, current, filters, last)
+
+            if file_path and os.path.exists(file_path):
+                details = f"\n🔎 {description}: {count} partie(s)" if description else ""
+                await client.send_file(
+                    event.chat_id,
+                    file_path,
+                    caption=f"📊 **Export des résultats**{channel_label(store)}\n\nFichier Excel généré avec succès!{details}"
+                )
+                logger.info("✅ Fichier Excel exporté et envoyé (%s lignes)", count)
+            else:
+                await event.respond("❌ Erreur lors de la génération du fichier Excel")
 
     except Exception as e:
-        logger.error(f"❌ Erreur export fichier: {e}")
+        logger.error("❌ Erreur export fichier: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+@client.on(events.NewMessage(pattern=r'/import(?:\s+(-\d+))?$'))
+async def cmd_import(event):
+    """Importe un export Excel/CSV envoyé avec la commande en légende (ou en réponse au fichier)"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        message = event.message if event.message.file else await event.get_reply_message()
+        if message is None or not message.file:
+            await event.respond("📥 Envoyez un fichier resultats_*.xlsx ou .csv avec `/import [canal]` en légende, "
+                                "ou répondez au fichier avec `/import [canal]`")
+            return
+
+        suffix = Path(message.file.name or '').suffix.lower() or (message.file.ext or '').lower()
+        if suffix not in SUPPORTED_SUFFIXES:
+            await event.respond(f"❌ Format non pris en charge: {suffix or 'inconnu'} (xlsx ou csv)")
+            return
+
+        store = await resolve_store(event, event.pattern_match.group(1))
+        if store is None:
+            return
+
+        await event.respond(f"📥 Import en cours...{channel_label(store)}")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = await message.download_media(file=os.path.join(tmp, f"import{suffix}"))
+            # Lecture en flux et écriture unique hors de la boucle d'événements
+            report = await asyncio.to_thread(store.results.import_file, path)
+
+        await event.respond(f"""📥 **Import terminé**{channel_label(store)}
+
+• Lignes lues: {report['lignes']}
+• Résultats importés: {report['importes']}
+• Doublons ignorés: {report['doublons']}
+• Lignes invalides: {report['invalides']}""")
+
+    except Exception as e:
+        logger.error("❌ Erreur import: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+@client.on(events.NewMessage(pattern=r'/historique(?:\s+(\d+))?(?:\s+([^\s\d-]\S*))?(?:\s+(-\d+))?'))
+async def cmd_historique(event):
+    """Statistiques sur l'archive des journées précédentes"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        store = await resolve_store(event, event.pattern_match.group(3))
+        if store is None:
+            return
+        history_archive = store.archive
+
+        days = int(event.pattern_match.group(1) or 30)
+        suits = event.pattern_match.group(2)
+        rate = history_archive.winner_rate(days)
+
+        history_msg = f"""🗄️ **HISTORIQUE ({days} derniers jours)**{channel_label(store)}
+
+• Journées archivées: {len(history_archive.days())}
+• Total de parties: {rate['total']}
+• Victoires Joueur: {rate['joueur_victoires']} ({rate['taux_joueur']:.1f}%)
+• Victoires Banquier: {rate['banquier_victoires']} ({rate['taux_banquier']:.1f}%)"""
+
+        if suits:
+            since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            numeros = history_archive.find_suit_pattern(suits, group=1, since=since)
+            shown = ', '.join(f"#{n}" for n in numeros[-20:])
+            history_msg += f"\n\n🃏 Groupe 1 = {suits}: {len(numeros)} parties\n{shown}"
+
+        await event.respond(history_msg)
+
+    except Exception as e:
+        logger.error("❌ Erreur historique: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+def build_archives_report(store: ChannelStore, limit: int = 10) -> str:
+    """Dernières archives quotidiennes d'un canal (seuls les en-têtes sont décompressés)"""
+    days = store.day_archive.days()
+    lines = []
+    for day in days[-limit:]:
+        header = store.day_archive.read_header(day)
+        size = store.day_archive.path_for(day).stat().st_size
+        lines.append(f"• {day}: {header['results']} résultats, {header['messages']} messages ({size / 1024:.1f} Ko)")
+    return f"""🗜️ **ARCHIVES QUOTIDIENNES**{channel_label(store)}
+
+• Journées archivées: {len(days)} ({store.day_archive.total_size() / 1024 / 1024:.2f} Mo)
+• Rétention: {RETENTION.describe()}
+
+{chr(10).join(lines) or '• Aucune archive'}"""
+
+
+@client.on(events.NewMessage(pattern=r'/archives(?:\s+(-\d+))?$'))
+async def cmd_archives(event):
+    """Archives quotidiennes compressées (messages bruts et résultats) et politique de rétention"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        store = await resolve_store(event, event.pattern_match.group(1))
+        if store is None:
+            return
+        await event.respond(await asyncio.to_thread(build_archives_report, store))
+
+    except Exception as e:
+        logger.error("❌ Erreur archives: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+def build_analytics(days: int, store: ChannelStore) -> dict:
+    """Analyse de l'historique des N derniers jours + journée en cours d'un canal"""
+    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    frame = analytics.load_history(store.results, store.archive, since)
+    report = analytics.summary(frame)
+    report['jours'] = days
+    return report
+
+
+@client.on(events.NewMessage(pattern=r'/analyse(?:\s+(\d+))?(?:\s+(-\d+))?'))
+async def cmd_analyse(event):
+    """Analyse détaillée de l'historique (séries, taux glissants, heures, couleurs)"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        store = await resolve_store(event, event.pattern_match.group(2))
+        if store is None:
+            return
+
+        days = int(event.pattern_match.group(1) or 30)
+        report = await asyncio.to_thread(build_analytics, days, store)
+
+        if report['total'] == 0:
+            await event.respond(f"📈 Aucune partie sur les {days} derniers jours")
+            return
+
+        series = report['series']
+        rolling = '\n'.join(
+            f"• {window} dernières: {data['taux_joueur_actuel']:.1f}% Joueur"
+            for window, data in report['taux_glissants'].items() if data['taux_joueur_actuel'] is not None
+        )
+        hours = sorted(report['par_heure'].items(), key=lambda item: sum(item[1].values()), reverse=True)[:3]
+        top_hours = ', '.join(f"{hour}h ({data['joueur']}J/{data['banquier']}B)" for hour, data in hours)
+        combos = ', '.join(f"{suits} ({count})" for suits, count in list(report['combinaisons_groupe1'].items())[:4])
+        gaps = report['ecarts_numeros']
+
+        analyse_msg = f"""📈 **ANALYSE ({days} derniers jours)**{channel_label(store)}
+
+• Total de parties: {report['total']}
+
+**Séries:**
+• Plus longue Joueur: {series['plus_longue_joueur']}
+• Plus longue Banquier: {series['plus_longue_banquier']}
+• En cours: {series['serie_en_cours']['gagnant'] or 'N/A'} x{series['serie_en_cours']['longueur']}
+
+**Taux glissants:**
+{rolling or '• Pas assez de parties'}
+
+**Heures les plus actives:** {top_hours}
+**Couleurs groupe 1:** {combos}
+**Écart moyen entre numéros:** {gaps['moyen']:.1f} (max {gaps['max']})"""
+
+        await event.respond(analyse_msg)
+
+    except Exception as e:
+        logger.error("❌ Erreur analyse: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+def build_backtest(days: int, store: ChannelStore, strategy=None) -> dict:
+    """Backtest des stratégies sur les N derniers jours + journée en cours d'un canal"""
+    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    frame = analytics.load_history(store.results, store.archive, since)
+    report = backtest.summary(frame, [strategy] if strategy else None, min_bets=1 if strategy else 30)
+    report['jours'] = days
+    return report
+
+
+def format_backtest_row(row: dict) -> str:
+    return (f"• {row['strategie']}: {row['taux_reussite']:.1f}% sur {row['paris']} paris, "
+            f"gain {row['gain']:+d}, drawdown {row['drawdown_max']}, pertes d'affilée {row['plus_longue_perte']}")
+
+
+@client.on(events.NewMessage(pattern=r'/backtest(?:\s+(\d+))?(?:\s+([a-z_]+\d*:\S+))?(?:\s+(-\d+))?$'))
+async def cmd_backtest(event):
+    """Simulation des stratégies de pari sur l'historique (balayage complet ou une stratégie)"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        store = await resolve_store(event, event.pattern_match.group(3))
+        if store is None:
+            return
+
+        days = int(event.pattern_match.group(1) or 30)
+        strategy = event.pattern_match.group(2)
+        try:
+            strategy = backtest.parse_strategy(strategy) if strategy else None
+        except ValueError as e:
+            await event.respond(f"❌ {e}\nExemples: `suivre_serie:3`, `alterner_apres:2`, "
+                                f"`couleurs_groupe1:♠♥♦:Joueur`")
+            return
+
+        # Chargement et balayage hors de la boucle d'événements (lots répartis sur un pool de threads)
+        report = await asyncio.to_thread(build_backtest, days, store, strategy)
+
+        if report['parties'] == 0:
+            await event.respond(f"🧪 Aucune partie sur les {days} derniers jours")
+            return
+
+        header = f"🧪 **BACKTEST ({days} derniers jours)**{channel_label(store)}\n\n• Parties: {report['parties']}"
+        if strategy:
+            await event.respond(f"{header}\n\n{format_backtest_row(report['resultats'][0])}")
+            return
+
+        best = '\n'.join(format_backtest_row(row) for row in report['meilleures'])
+        worst = '\n'.join(format_backtest_row(row) for row in report['pires'])
+        backtest_msg = f"""{header}
+• Stratégies évaluées: {report['strategies']} ({report['retenues']} avec au moins {report['min_paris']} paris)
+
+**Meilleures:**
+{best or '• Pas assez de paris'}"""
+        if worst:
+            backtest_msg += f"\n\n**Moins bonnes:**\n{worst}"
+
+        await event.respond(backtest_msg)
+
+    except Exception as e:
+        logger.error("❌ Erreur backtest: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+@client.on(events.NewMessage(pattern=r'/predictions(?:\s+(-\d+))?$'))
+async def cmd_predictions(event):
+    """Prédiction en attente et précision du modèle"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        store = await resolve_store(event, event.pattern_match.group(1))
+        if store is None:
+            return
+        if coordinator is not None and not coordinator.is_leader():
+            # Le modèle tourne chez le leader: état relu depuis son dernier enregistrement
+            await asyncio.to_thread(predictions.reload)
+        summary = predictions.summary(store.channel_id)
+        pending = summary['pending']
+        if pending:
+            last_game = pending['game_number'] + predictions.tolerance
+            pending_line = (f"🔮 Jeux #{pending['game_number']} à #{last_game}: **{pending['prediction']}** "
+                            f"({pending['confidence'] * 100:.0f}%)")
+        else:
+            pending_line = "🔮 Aucune prédiction en attente"
+        await event.respond(f"""🔮 **Prédictions**{channel_label(store)}
+
+{pending_line}
+
+📈 **Précision:** {summary['accuracy']:.1f}% ({summary['hits']} ✅ / {summary['misses']} ❌)
+🧮 Derniers gagnants: {summary['recent'] or '-'}""")
+
+    except Exception as e:
+        logger.error("❌ Erreur predictions: %s", e)
+        await event.respond(f"❌ Erreur: {e}")
+
+
+def reload_rules() -> str:
+    """Recharge record_rules.yaml; en cas d'erreur les règles en place sont conservées (ValueError)"""
+    global rules_mtime
+    rules = load_rules(RULES_FILE)
+    channels.set_rules(rules)
+    rules_mtime = os.stat(RULES_FILE).st_mtime_ns if os.path.exists(RULES_FILE) else None
+    return rules.describe()
+
+
+@client.on(events.NewMessage(pattern=r'/rules$'))
+async def cmd_rules(event):
+    """Affiche les règles d'enregistrement en vigueur"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    rules = channels.rules
+    origin = rules.origin if rules else 'défaut'
+    await event.respond(f"📐 **Règles d'enregistrement** ({origin})\n\n{rules.describe() if rules else '-'}")
+
+
+@client.on(events.NewMessage(pattern=r'/reload_rules$'))
+async def cmd_reload_rules(event):
+    """Recharge les règles d'enregistrement sans redémarrer"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    try:
+        description = reload_rules()
+        logger.info("📐 Règles d'enregistrement rechargées")
+        await event.respond(f"✅ **Règles rechargées**\n\n{description}")
+    except ValueError as e:
+        await event.respond(f"❌ {e}\n\nLes règles précédentes restent en vigueur.")
+
+
+@client.on(events.NewMessage(pattern=r'/profile(?:\s+(\d+))?$'))
+async def cmd_profile(event):
+    """Profile le bot en fonctionnement pendant N secondes (cProfile + tracemalloc)"""
+    if event.is_group or event.is_channel:
+        return
+
+    if event.sender_id != ADMIN_ID:
+        await event.respond("❌ Commande réservée à l'administrateur")
+        return
+
+    if profile_session.active:
+        await event.respond("⏳ Un profilage est déjà en cours")
+        return
+
+    try:
+        seconds = min(int(event.pattern_match.group(1) or 30), MAX_DURATION)
+        await event.respond(f"🔬 Profilage démarré pour {seconds}s...")
+        report = await profile_session.run(seconds)
+        await event.respond(report)
+
+    except Exception as e:
+        logger.error("❌ Erreur profilage: %s", e)
         await event.respond(f"❌ Erreur: {e}")
 
 
@@ -454,179 +1214,33 @@ async def cmd_deploy(event):
     try:
         await event.respond("📦 Préparation du package de déploiement pour Render.com...")
 
-        benin_tz = timezone(timedelta(hours=1))
-        now_benin = datetime.now(benin_tz)
-        timestamp = now_benin.strftime('%Y-%m-%d_%H-%M-%S')
-        
-        deploy_dir = Path(f"deploy_render_{timestamp}")
-        deploy_dir.mkdir(exist_ok=True)
-
-        files_to_copy = [
-            'main.py',
-            'game_results_manager.py',
-            'yaml_manager.py'
-        ]
-
-        for file in files_to_copy:
-            if os.path.exists(file):
-                shutil.copy(file, deploy_dir / file)
-
-        render_yaml = """services:
-  - type: web
-    name: bot-telegram-bcarte
-    env: python
-    region: frankfurt
-    plan: starter
-    buildCommand: pip install -r requirements.txt
-    startCommand: python main.py
-    envVars:
-      - key: PORT
-        value: 10000
-      - key: API_ID
-        sync: false
-      - key: API_HASH
-        sync: false
-      - key: BOT_TOKEN
-        sync: false
-      - key: ADMIN_ID
-        sync: false
-"""
-
-        with open(deploy_dir / 'render.yaml', 'w', encoding='utf-8') as f:
-            f.write(render_yaml)
-
-        requirements = """telethon==1.35.0
-aiohttp==3.9.5
-python-dotenv==1.0.1
-pyyaml==6.0.1
-openpyxl==3.1.2
-"""
-
-        with open(deploy_dir / 'requirements.txt', 'w', encoding='utf-8') as f:
-            f.write(requirements)
-        
-        env_example = """# Variables d'environnement pour le bot Telegram
-# Ne jamais committer ces valeurs réelles !
-
-API_ID=votre_api_id
-API_HASH=votre_api_hash
-BOT_TOKEN=votre_bot_token
-ADMIN_ID=votre_admin_id
-PORT=10000
-"""
-
-        with open(deploy_dir / '.env.example', 'w', encoding='utf-8') as f:
-            f.write(env_example)
-
-        readme = f"""# Bot Telegram - Package de Déploiement Render.com
-
-📅 **Créé le:** {now_benin.strftime('%d/%m/%Y à %H:%M:%S')} (Heure Bénin UTC+1)
-📦 **Version:** {timestamp}
-
-## 🚀 Instructions de déploiement sur Render.com
-
-### Étape 1: Créer un repository GitHub
-1. Créez un nouveau repository sur GitHub
-2. Uploadez tous les fichiers de ce package
-
-### Étape 2: Déployer sur Render.com
-1. Connectez-vous à [render.com](https://render.com)
-2. Cliquez sur **"New +"** → **"Web Service"**
-3. Connectez votre repository GitHub
-4. Render détectera automatiquement `render.yaml`
-
-### Étape 3: Configurer les Variables d'Environnement
-Dans la section **Environment** de Render.com, ajoutez:
-- **PORT**: 10000 (déjà configuré)
-- **API_ID**: Obtenez-le sur https://my.telegram.org
-- **API_HASH**: Obtenez-le sur https://my.telegram.org
-- **BOT_TOKEN**: Créez un bot avec @BotFather sur Telegram
-- **ADMIN_ID**: Obtenez votre ID avec @userinfobot sur Telegram
-
-### Étape 4: Déployer
-1. Cliquez sur **"Create Web Service"**
-2. Attendez le déploiement (2-3 minutes)
-3. Le bot sera en ligne 24/7 !
-
-## ✅ Fonctionnalités principales
-
-- ✅ **Détection automatique**: Reconnaît les parties avec 3 cartes différentes
-- ✅ **Export quotidien**: Génère un fichier Excel à 00h59 (UTC+1)
-- ✅ **Réinitialisation auto**: Reset automatique à 01h00
-- ✅ **Statistiques en temps réel**: Taux de victoire Joueur/Banquier
-
-## 📊 Commandes disponibles
-
-- `/start` - Démarrer le bot et voir les informations
-- `/status` - Voir les statistiques actuelles
-- `/fichier` - Exporter les résultats en Excel
-- `/reset` - Réinitialiser la base de données manuellement
-- `/deploy` - Créer un nouveau package de déploiement
-- `/help` - Afficher l'aide complète
-
-## 🎯 Critères d'enregistrement
-
-### ✅ Parties enregistrées:
-- Premier groupe: **exactement 3 cartes de couleurs différentes**
-- Deuxième groupe: **PAS 3 cartes**
-- Gagnant identifiable: **Joueur** ou **Banquier**
-
-### ❌ Parties ignorées:
-- Match nul
-- Les deux groupes ont 3 cartes
-- Pas de numéro de jeu identifiable
-
-## ⚙️ Configuration technique
-
-- **Langage**: Python 3.11
-- **Timezone**: Africa/Porto-Novo (UTC+1)
-- **Port**: 10000 (Render.com)
-- **Export automatique**: 00h59 chaque jour
-- **Reset automatique**: 01h00 chaque jour
-
----
-*Package généré automatiquement*
-*Dernière mise à jour: {now_benin.strftime('%d/%m/%Y %H:%M:%S')}*
-"""
-
-        with open(deploy_dir / 'README_DEPLOIEMENT.md', 'w', encoding='utf-8') as f:
-            f.write(readme)
-
-        deploy_zip = "Kouamé.zip"
-        with zipfile.ZipFile(deploy_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(deploy_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, deploy_dir)
-                    zipf.write(file_path, arcname)
+        # Construction (ou relecture du cache) hors de la boucle d'événements, sans fichier sur le disque
+        bundle_file, built_at, cached = await asyncio.to_thread(deploy_bundle.file)
 
         short_caption = f"""📦 **Package Render.com - Kouamé**
 
-📅 {now_benin.strftime('%d/%m/%Y %H:%M:%S')} (Bénin)
-📁 Kouamé.zip
+📅 {built_at.strftime('%d/%m/%Y %H:%M:%S')} (Bénin)
+📁 {BUNDLE_NAME}
 ✅ Port 10000 configuré
 ✅ Export à 00h59
 ✅ Reset à 01h00"""
 
         await client.send_file(
             ADMIN_ID,
-            deploy_zip,
+            bundle_file,
             caption=short_caption
         )
 
-        shutil.rmtree(deploy_dir)
-        logger.info(f"✅ Package créé: {deploy_zip}")
+        logger.info("✅ Package envoyé: %s (%s)", BUNDLE_NAME, "cache" if cached else "reconstruit")
 
     except Exception as e:
-        logger.error(f"❌ Erreur création package: {e}")
+        logger.error("❌ Erreur création package: %s", e)
         await event.respond(f"❌ Erreur: {e}")
 
 
 @client.on(events.NewMessage(pattern='/stop_transfer'))
 async def cmd_stop_transfer(event):
     """Désactive le transfert des messages du canal"""
-    global transfer_enabled
-
     if event.is_group or event.is_channel:
         return
 
@@ -634,7 +1248,7 @@ async def cmd_stop_transfer(event):
         await event.respond("❌ Seul l'administrateur peut contrôler le transfert")
         return
 
-    transfer_enabled = False
+    set_transfer_enabled(False)
     await event.respond("🔕 **Transfert des messages désactivé**\n\nLes messages du canal ne seront plus transférés en privé.\n\nUtilisez /start_transfer pour réactiver.")
     logger.info("🔕 Transfert des messages désactivé")
 
@@ -642,8 +1256,6 @@ async def cmd_stop_transfer(event):
 @client.on(events.NewMessage(pattern='/start_transfer'))
 async def cmd_start_transfer(event):
     """Active le transfert des messages du canal"""
-    global transfer_enabled
-
     if event.is_group or event.is_channel:
         return
 
@@ -651,7 +1263,7 @@ async def cmd_start_transfer(event):
         await event.respond("❌ Seul l'administrateur peut contrôler le transfert")
         return
 
-    transfer_enabled = True
+    set_transfer_enabled(True)
     await event.respond("🔔 **Transfert des messages activé**\n\nLes messages du canal seront à nouveau transférés en privé.")
     logger.info("🔔 Transfert des messages activé")
 
@@ -677,7 +1289,7 @@ async def cmd_reset(event):
         logger.info("⚠️ Confirmation de remise à zéro en attente")
 
     except Exception as e:
-        logger.error(f"❌ Erreur commande reset: {e}")
+        logger.error("❌ Erreur commande reset: %s", e)
         await event.respond(f"❌ Erreur: {e}")
 
 
@@ -690,7 +1302,7 @@ async def cmd_help(event):
     help_msg = """📖 **AIDE - Bot de Stockage de Résultats de Jeux**
 
 **Fonctionnement:**
-Le bot surveille un canal et stocke automatiquement les parties qui remplissent ces critères:
+Le bot surveille un ou plusieurs canaux et stocke automatiquement les parties qui remplissent ces critères:
 
 ✅ **Critères d'enregistrement:**
 • Le premier groupe de parenthèses contient exactement 3 cartes différentes
@@ -705,7 +1317,19 @@ Le bot surveille un canal et stocke automatiquement les parties qui remplissent
 **Commandes:**
 • `/start` - Message de bienvenue
 • `/status` - Voir les statistiques
-• `/fichier` - Exporter en fichier Excel manuellement
+• `/stats [N] [canal]` - Taux sur les N dernières parties (fenêtres glissantes)
+• `/fichier [filtres] [canal]` - Exporter en fichier Excel (filtres: `date:2025-01-10..2025-01-12`, `num:200..350`, `derniers:100`, `gagnant:joueur`)
+• `/import [canal]` - Restaurer/fusionner un export Excel ou CSV (en légende du fichier envoyé)
+• `/historique [jours] [couleurs] [canal]` - Statistiques des journées archivées (ex: `/historique 30 ♠♥♦`)
+• `/archives [canal]` - Archives quotidiennes compressées (messages bruts et résultats)
+• `/analyse [jours] [canal]` - Analyse détaillée: séries, taux glissants, heures, couleurs
+• `/backtest [jours] [stratégie] [canal]` - Simuler les stratégies de pari sur l'historique (ex: `/backtest 30 suivre_serie:3`)
+• `/channels` - Lister les canaux surveillés
+• `/remove_channel ID` - Arrêter de surveiller un canal
+• `/predictions [canal]` - Prédiction en cours et précision du modèle
+• `/rules` - Règles d'enregistrement en vigueur
+• `/reload_rules` - Recharger record_rules.yaml sans redémarrer
+• `/profile [secondes]` - Profiler le bot (temps par fonction, allocations mémoire)
 • `/deploy` - Créer un package pour déployer sur Replit
 • `/reset` - Remettre à zéro la base de données manuellement
 • `/stop_transfer` - Désactiver le transfert des messages du canal
@@ -732,9 +1356,7 @@ Pour toute question, contactez l'administrateur."""
     await event.respond(help_msg)
 
 
-async def index(request):
-    """Page d'accueil du bot"""
-    html = """
+INDEX_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -747,29 +1369,177 @@ async def index(request):
         <ul>
             <li><a href="/health">Health Check</a></li>
             <li><a href="/status">Statut et Statistiques (JSON)</a></li>
+            <li><a href="/analytics">Analyse de l'historique (JSON)</a></li>
+            <li><a href="/metrics">Métriques (Prometheus)</a></li>
+            <li><a href="/results">Résultats paginés (JSON)</a></li>
+            <li><a href="/results.ndjson">Résultats en flux (NDJSON)</a></li>
+            <li><a href="/feed">Parties en direct (Server-Sent Events, ou WebSocket sur /ws)</a></li>
         </ul>
     </body>
     </html>
     """
-    return web.Response(text=html, content_type='text/html', status=200)
+
+# Page d'accueil encodée une seule fois
+index_page = CachedResponse(INDEX_HTML.encode('utf-8'), 'text/html')
+
+
+async def index(request):
+    """Page d'accueil du bot"""
+    return index_page.respond(request)
 
 
 async def health_check(request):
-    """Endpoint de vérification de santé"""
+    """Endpoint de vérification de santé (503 si la boucle asyncio est bloquée ou trop lente)"""
+    healthy = loop_monitor.is_healthy()
+    if request.query.get('verbose') or not healthy:
+        return web.json_response(loop_monitor.report(), status=200 if healthy else 503)
     return web.Response(text="OK", status=200)
 
 
-async def status_api(request):
-    """Endpoint de statut"""
-    stats = results_manager.get_stats()
-    status_data = {
+def build_status() -> dict:
+    """Contenu de l'endpoint /status (reconstruit seulement si les résultats ou les canaux changent)"""
+    channel_status = [{
+        "channel_id": store.channel_id,
+        "title": store.title,
+        "stats": store.results.get_stats(),
+        "windows": store.live_stats.snapshot(),
+        "format": store.results.formats.name
+    } for store in channels]
+    primary = channel_status[0] if channel_status else {}
+    return {
         "status": "running",
-        "channel_configured": detected_stat_channel is not None,
-        "channel_id": detected_stat_channel,
-        "stats": stats,
+        "channel_configured": bool(channel_status),
+        # Canal par défaut (compatibilité avec le format à un seul canal)
+        "channel_id": primary.get("channel_id"),
+        "stats": primary.get("stats"),
+        "windows": primary.get("windows"),
+        "channels": channel_status,
+        "worker": {
+            "id": coordinator.worker_id if coordinator else None,
+            "leader": coordinator.is_leader() if coordinator else True
+        },
         "timestamp": datetime.now().isoformat()
     }
-    return web.json_response(status_data)
+
+
+def status_version():
+    """
+    Version de l'instantané /status, sans accès disque: génération en mémoire de chaque stockage,
+    rôle de leader et période de STATUS_MAX_AGE secondes (la reconstruction relit les fichiers et
+    prend alors en compte les écritures des autres workers)
+    """
+    return (tuple((store.channel_id, store.results.generation) for store in channels),
+            coordinator.is_leader() if coordinator else True,
+            int(time.monotonic() // STATUS_MAX_AGE))
+
+
+status_snapshot = Snapshot(build_status, status_version)
+
+
+def store_for_request(request):
+    """Canal visé par ?channel=ID (canal par défaut sinon); renvoie (store, réponse d'erreur)"""
+    channel = request.query.get('channel')
+    if channel:
+        try:
+            store = channels.get(int(channel))
+        except ValueError:
+            return None, web.json_response({"error": "Paramètre channel invalide"}, status=400)
+    else:
+        store = channels.primary
+    if store is None:
+        return None, web.json_response({"error": "Canal non surveillé"}, status=404)
+    return store, None
+
+
+async def status_api(request):
+    """Endpoint de statut (instantané pré-sérialisé, réponses 304 si inchangé)"""
+    return status_snapshot.respond(request)
+
+
+async def metrics_api(request):
+    """Métriques au format d'exposition Prometheus"""
+    return web.Response(body=metrics.REGISTRY.render().encode('utf-8'),
+                        headers={'Content-Type': metrics.CONTENT_TYPE + '; charset=utf-8'})
+
+
+RESULTS_PAGE_MAX = 1000
+NDJSON_BATCH = 500
+
+
+def parse_result_filters(query) -> dict:
+    """Filtres communs des routes de résultats (lève ValueError si invalides)"""
+    filters = {
+        'min_numero': int(query['min']) if query.get('min') else None,
+        'max_numero': int(query['max']) if query.get('max') else None,
+        'since': query.get('from') or None,
+        'until': query.get('to') or None,
+        'winner': query.get('winner') or None
+    }
+    if filters['winner'] not in (None, 'Joueur', 'Banquier'):
+        raise ValueError("winner doit valoir Joueur ou Banquier")
+    return filters
+
+
+async def results_api(request):
+    """Résultats paginés par curseur (?channel=&cursor=N&limit=100&min=&max=&from=&to=&winner=)"""
+    store, error = store_for_request(request)
+    if error is not None:
+        return error
+    try:
+        filters = parse_result_filters(request.query)
+        cursor = int(request.query['cursor']) if request.query.get('cursor') else None
+        limit = min(max(int(request.query.get('limit', 100)), 1), RESULTS_PAGE_MAX)
+    except ValueError as e:
+        return web.json_response({"error": f"Paramètre invalide: {e}"}, status=400)
+
+    rows, next_cursor = store.results.get_index().page(cursor=cursor, limit=limit, **filters)
+    return web.json_response({
+        "items": rows,
+        "count": len(rows),
+        "next_cursor": next_cursor
+    }, dumps=lambda data: json.dumps(data, ensure_ascii=False))
+
+
+async def results_stream_api(request):
+    """Résultats en NDJSON, écrits par lots sans construire la réponse complète en mémoire"""
+    store, error = store_for_request(request)
+    if error is not None:
+        return error
+    try:
+        filters = parse_result_filters(request.query)
+    except ValueError as e:
+        return web.json_response({"error": f"Paramètre invalide: {e}"}, status=400)
+
+    # Sélection figée avant le premier await: ResultsIndex.add insère dans les listes parcourues par query,
+    # un parcours à travers les écritures pourrait sauter ou répéter des lignes (seules les références sont copiées)
+    rows = list(store.results.get_index().query(**filters))
+
+    response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson; charset=utf-8'})
+    await response.prepare(request)
+
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(row, ensure_ascii=False))
+        if len(batch) >= NDJSON_BATCH:
+            await response.write(('\n'.join(batch) + '\n').encode('utf-8'))
+            batch = []
+    if batch:
+        await response.write(('\n'.join(batch) + '\n').encode('utf-8'))
+
+    await response.write_eof()
+    return response
+
+
+async def analytics_api(request):
+    """Endpoint d'analyse de l'historique (?days=N&channel=ID)"""
+    store, error = store_for_request(request)
+    if error is not None:
+        return error
+    try:
+        days = int(request.query.get('days', 30))
+    except ValueError:
+        return web.json_response({"error": "Paramètre days invalide"}, status=400)
+    return web.json_response(await asyncio.to_thread(build_analytics, days, store))
 
 
 async def start_web_server():
@@ -778,22 +1548,201 @@ async def start_web_server():
     app.router.add_get('/', index)
     app.router.add_get('/health', health_check)
     app.router.add_get('/status', status_api)
+    app.router.add_get('/analytics', analytics_api)
+    app.router.add_get('/metrics', metrics_api)
+    app.router.add_get('/results', results_api)
+    app.router.add_get('/results.ndjson', results_stream_api)
+    app.router.add_get('/feed', live_feed.sse_handler)
+    app.router.add_get('/ws', live_feed.ws_handler)
+    live_feed.start()
 
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, '0.0.0.0', PORT)
     await site.start()
-    logger.info(f"✅ Serveur web démarré sur le port {PORT}")
+    logger.info("✅ Serveur web démarré sur le port %s", PORT)
 
 
 auto_export_task = None
 
 
+# Tâches de finalisation des journées figées (référence conservée jusqu'à leur fin)
+rollover_tasks = set()
+# Fichiers figés en cours de finalisation dans ce processus (pas de reprise en double)
+finishing_files = set()
+
+
+async def finish_rollover(store: ChannelStore, day_iso: str, results: list, frozen_file: Path):
+    """
+    Exporte, envoie et archive une journée figée; l'export Excel et l'archivage tournent
+    dans un thread pour ne pas bloquer l'enregistrement des nouvelles parties
+    Le fichier figé n'est supprimé qu'une fois tout terminé (reprise au redémarrage sinon)
+    """
+    date_str = datetime.strptime(day_iso, '%Y-%m-%d').strftime('%d-%m-%Y')
+    stats = store.results.get_stats(results)
+    label = channel_label(store)
+
+    if stats['total'] > 0:
+        file_path = f"resultats_journee_{date_str}{store.file_suffix}.xlsx"
+        excel_file = await asyncio.to_thread(store.results.export_to_txt, file_path, results)
+
+        if not excel_file or not os.path.exists(excel_file):
+            logger.error("❌ Export de la journée %s échoué, fichier figé conservé", day_iso)
+            return
+
+        caption = f"""📊 **Rapport Journalier du {date_str}**{label}
+
+📈 Résultats de la journée (01h00 à 00h59):
+• Total: {stats['total']} parties
+• Victoires Joueur: {stats['joueur_victoires']} ({stats['taux_joueur']:.1f}%)
+• Victoires Banquier: {stats['banquier_victoires']} ({stats['taux_banquier']:.1f}%)
+
+🔄 La base de données a été remise à zéro pour une nouvelle journée."""
+
+        await client.send_file(
+            ADMIN_ID,
+            excel_file,
+            caption=caption
+        )
+        logger.info("✅ Rapport journalier envoyé avec %s parties", stats['total'])
+    else:
+        await client.send_message(
+            ADMIN_ID,
+            f"📊 **Rapport Journalier**{label}\n\nAucune partie enregistrée aujourd'hui (01h00 à 00h59)."
+        )
+        logger.info("ℹ️ Aucune donnée à exporter pour aujourd'hui")
+
+    try:
+        await asyncio.to_thread(store.archive.append_day, day_iso, results)
+        await asyncio.to_thread(store.day_archive.write_day, day_iso, results)
+    except Exception as e:
+        logger.error("❌ Erreur archivage journée %s, fichier figé conservé: %s", day_iso, e)
+        return
+
+    store.results.discard_frozen(frozen_file)
+
+
+def schedule_rollover_finish(store: ChannelStore, day_iso: str, results: list, frozen_file: Path):
+    finishing_files.add(frozen_file)
+    task = asyncio.create_task(finish_rollover(store, day_iso, results, frozen_file))
+    rollover_tasks.add(task)
+    task.add_done_callback(rollover_tasks.discard)
+    task.add_done_callback(lambda _: finishing_files.discard(frozen_file))
+
+
+def resume_pending_rollovers():
+    """Journées figées non terminées (arrêt pendant un export): reprise en arrière-plan"""
+    for store in channels:
+        for day_iso, frozen_file in store.results.pending_rollovers():
+            if frozen_file in finishing_files:
+                continue
+            logger.info("🔁 Reprise de la journée figée %s (canal %s)", day_iso, store.channel_id)
+            schedule_rollover_finish(store, day_iso, store.results.load_frozen(frozen_file), frozen_file)
+
+
+def rollover_channels(day_iso: str) -> list:
+    """Bascule de tous les canaux vers une journée vide (aucun await entre elles)"""
+    rollovers = [(store, *store.rollover(day_iso)) for store in channels]
+    logger.info("✅ Base de données remise à zéro")
+    return rollovers
+
+
+@DAILY_RESET_SECONDS.time()
+async def run_daily_reset(now_benin: datetime, rollovers: list = None):
+    """
+    Bascule atomique vers une journée vide, puis export/envoi/archivage de la journée figée
+    L'enregistrement continue pendant l'export: aucune partie n'est perdue ni comptée deux fois
+    rollovers: bascules déjà faites (mode multi-workers; liste vide si un leader tombé les a faites)
+    """
+    logger.info("🔄 REMISE À ZÉRO QUOTIDIENNE À 00H59...")
+
+    day_iso = (now_benin - timedelta(days=1)).strftime('%Y-%m-%d')
+    if rollovers is None:
+        # Toutes les bascules d'abord, puis les exports canal par canal
+        rollovers = rollover_channels(day_iso)
+
+    await client.send_message(
+        ADMIN_ID,
+        "🔄 **Remise à zéro effectuée à 00h59**\n\nLa base de données est maintenant vide et prête pour une nouvelle journée d'enregistrement."
+    )
+
+    # Fichiers figés marqués en cours: une reprise (élection du leader) ne les termine pas une seconde fois
+    for store, results, frozen_file in rollovers:
+        finishing_files.add(frozen_file)
+    try:
+        for store, results, frozen_file in rollovers:
+            await finish_rollover(store, day_iso, results, frozen_file)
+    finally:
+        for store, results, frozen_file in rollovers:
+            finishing_files.discard(frozen_file)
+    # Journées figées reprises en arrière-plan (redémarrage, nouveau leader): terminées avant la rétention
+    if rollover_tasks:
+        await asyncio.gather(*list(rollover_tasks), return_exceptions=True)
+
+    await apply_retention(day_iso)
+
+
+async def apply_retention(ended_day: str):
+    """
+    Politique de rétention: archives quotidiennes de chaque canal, prédictions automatiques
+    et historique des prédictions (les prédictions vérifiées jusqu'à la journée de jeu terminée y sont
+    d'abord déplacées)
+    """
+    try:
+        for store in channels:
+            await asyncio.to_thread(store.day_archive.apply_retention, RETENTION)
+        await asyncio.to_thread(yaml_manager.rotate_predictions, ended_day)
+        cutoff = RETENTION.cutoff(RETENTION.prediction_days)
+        if cutoff is not None:
+            await asyncio.to_thread(yaml_manager.prune_auto_predictions, cutoff)
+            await asyncio.to_thread(yaml_manager.prune_prediction_history, cutoff)
+    except Exception as e:
+        logger.error("❌ Erreur rétention: %s", e)
+
+
+async def renew_run_lease(run_name: str):
+    """Renouvelle le bail « en cours » d'une exécution partagée tant qu'elle dure"""
+    while True:
+        await asyncio.sleep(coordinator.lease_ttl / 3)
+        if not coordinator.renew_run(run_name):
+            logger.warning("⚠️ Bail de %s perdu pendant l'exécution", run_name)
+
+
+async def run_shared_daily_reset(now_benin: datetime):
+    """
+    Mode multi-workers: la remise à zéro est faite une seule fois, par le leader
+    Elle n'est enregistrée comme faite qu'après son succès; pendant l'exécution, un bail « en cours »
+    renouvelé la réserve. Si le leader tombe, le bail expire et le nouveau leader la reprend
+    (sans nouvelle bascule si elle avait eu lieu: les journées figées sont reprises à son élection)
+    Les autres workers attendent qu'elle soit enregistrée (ou de devenir leader si le leader tombe)
+    """
+    day_iso = (now_benin - timedelta(days=1)).strftime('%Y-%m-%d')
+    run_name = f"daily_reset:{day_iso}"
+    while not coordinator.has_run(run_name):
+        if coordinator.is_leader() and coordinator.start_run(run_name):
+            renewal = asyncio.create_task(renew_run_lease(run_name))
+            try:
+                if coordinator.has_step(run_name, 'bascule'):
+                    logger.info("🔁 Reprise de la remise à zéro du %s (bascule déjà faite)", day_iso)
+                    rollovers = []
+                else:
+                    rollovers = rollover_channels(day_iso)
+                    coordinator.mark_step(run_name, 'bascule')
+                await run_daily_reset(now_benin, rollovers)
+            finally:
+                renewal.cancel()
+            coordinator.finish_run(run_name)
+            coordinator.purge()
+            return
+        await asyncio.sleep(coordinator.lease_ttl / 2)
+    logger.info("ℹ️ Remise à zéro du %s déjà effectuée par un autre worker", day_iso)
+
+
 async def daily_reset():
     """Remise à zéro quotidienne à 00h59 du matin (heure du Bénin UTC+1)"""
+    benin_tz = timezone(timedelta(hours=1))
     while True:
         try:
-            benin_tz = timezone(timedelta(hours=1))
             now_benin = datetime.now(benin_tz)
             next_reset_benin = now_benin.replace(hour=0, minute=59, second=0, microsecond=0)
 
@@ -801,61 +1750,133 @@ async def daily_reset():
                 next_reset_benin += timedelta(days=1)
 
             wait_seconds = (next_reset_benin - now_benin).total_seconds()
-            logger.info(f"⏰ Prochaine remise à zéro dans {wait_seconds/3600:.1f} heures (à 00h59 heure Bénin)")
+            logger.info("⏰ Prochaine remise à zéro dans %.1f heures (à 00h59 heure Bénin)", wait_seconds / 3600)
 
             await asyncio.sleep(wait_seconds)
 
-            logger.info("🔄 REMISE À ZÉRO QUOTIDIENNE À 00H59...")
+            if coordinator is not None:
+                await run_shared_daily_reset(datetime.now(benin_tz))
+            else:
+                await run_daily_reset(datetime.now(benin_tz))
+            DAILY_RESETS.labels(outcome='success').inc()
 
-            stats = results_manager.get_stats()
+        except asyncio.CancelledError:
+            logger.info("🛑 Tâche de remise à zéro arrêtée")
+            break
+        except Exception as e:
+            DAILY_RESETS.labels(outcome='error').inc()
+            logger.error("❌ Erreur remise à zéro: %s", e)
+            await asyncio.sleep(3600)
 
-            if stats['total'] > 0:
-                date_str = (now_benin - timedelta(days=1)).strftime('%d-%m-%Y')
-                file_path = f"resultats_journee_{date_str}.xlsx"
-                excel_file = results_manager.export_to_txt(file_path=file_path)
 
-                if excel_file and os.path.exists(excel_file):
-                    caption = f"""📊 **Rapport Journalier du {date_str}**
+config_mtime = None
 
-📈 Résultats de la journée (01h00 à 00h59):
-• Total: {stats['total']} parties
-• Victoires Joueur: {stats['joueur_victoires']} ({stats['taux_joueur']:.1f}%)
-• Victoires Banquier: {stats['banquier_victoires']} ({stats['taux_banquier']:.1f}%)
 
-🔄 La base de données va être remise à zéro pour une nouvelle journée."""
+async def sync_channels():
+    """Mode multi-workers: applique les canaux ajoutés ou retirés par un autre worker (bot_config.json)"""
+    global config_mtime
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return
+    if mtime == config_mtime:
+        return
+    first_sync = config_mtime is None
+    config_mtime = mtime
+    if first_sync:
+        return
+
+    configured = load_config()
+    if configured is None:
+        return
+    for channel_id in channels.ids():
+        if channel_id not in configured:
+            await channels.remove(channel_id)
 
-                    await client.send_file(
-                        ADMIN_ID,
-                        excel_file,
-                        caption=caption
-                    )
-                    logger.info(f"✅ Rapport journalier envoyé avec {stats['total']} parties")
-            else:
-                await client.send_message(
-                    ADMIN_ID,
-                    "📊 **Rapport Journalier**\n\nAucune partie enregistrée aujourd'hui (01h00 à 00h59)."
-                )
-                logger.info("ℹ️ Aucune donnée à exporter pour aujourd'hui")
 
-            results_manager._save_yaml([])
-            logger.info("✅ Base de données remise à zéro")
+def sync_rules():
+    """Mode multi-workers: applique les règles rechargées par un autre worker (record_rules.yaml modifié)"""
+    global rules_mtime
+    mtime = os.stat(RULES_FILE).st_mtime_ns if os.path.exists(RULES_FILE) else None
+    if mtime == rules_mtime:
+        return
+    try:
+        reload_rules()
+        logger.info("📐 Règles d'enregistrement modifiées, rechargées")
+    except ValueError as e:
+        # Fichier invalide: signalé une seule fois, les règles en place sont conservées
+        rules_mtime = mtime
+        logger.error("❌ %s", e)
+
+
+async def drain_outbox():
+    """
+    Leader: envoie les notifications déposées par tous les workers, dans l'ordre, et applique
+    les parties enregistrées au moteur de prédictions; une partie ne quitte la boîte d'envoi
+    qu'une fois l'état des prédictions écrit (un nouveau leader la rejoue sinon)
+    """
+    while coordinator.is_leader():
+        batch = await asyncio.to_thread(coordinator.pending)
+        if not batch:
+            return
+        games = []
+        try:
+            for row_id, kind, payload in batch:
+                if kind == 'game':
+                    predictions.apply_shared(row_id, payload['channel_id'], payload['result'])
+                    games.append(row_id)
+                    continue
+                try:
+                    await deliver_admin(kind, payload)
+                except Exception as e:
+                    # Nouvel essai au prochain tour: l'ordre des notifications est conservé
+                    logger.error("❌ Erreur envoi notification %s: %s", row_id, e)
+                    return
+                await asyncio.to_thread(coordinator.mark_sent, row_id)
+        finally:
+            if games:
+                await predictions.flush()
+                for row_id in games:
+                    if row_id <= predictions.saved_id:
+                        await asyncio.to_thread(coordinator.mark_sent, row_id)
+        if any(row_id > predictions.saved_id for row_id in games):
+            # Écriture des prédictions en échec: nouvel essai au prochain tour
+            return
 
-            await client.send_message(
-                ADMIN_ID,
-                "🔄 **Remise à zéro effectuée à 00h59**\n\nLa base de données est maintenant vide et prête pour une nouvelle journée d'enregistrement."
-            )
 
+async def coordination_loop(interval: float = 1.0):
+    """Renouvelle le bail du leader, suit la configuration partagée et vide la boîte d'envoi"""
+    was_leader = False
+    while True:
+        try:
+            leader = await asyncio.to_thread(coordinator.try_acquire)
+            if leader and not was_leader:
+                logger.info("👑 Worker %s élu leader", coordinator.worker_id)
+                # État des prédictions écrit par le leader précédent; les parties non écrites sont rejouées
+                await asyncio.to_thread(predictions.reload)
+                resume_pending_rollovers()
+            elif was_leader and not leader:
+                logger.warning("⚠️ Worker %s n'est plus leader", coordinator.worker_id)
+                # Changements non écrits abandonnés: le nouveau leader les rejoue depuis la boîte d'envoi
+                await asyncio.to_thread(predictions.reload)
+            was_leader = leader
+
+            await sync_channels()
+            sync_rules()
+            if leader:
+                await drain_outbox()
         except asyncio.CancelledError:
-            logger.info("🛑 Tâche de remise à zéro arrêtée")
-            break
+            coordinator.release()
+            raise
         except Exception as e:
-            logger.error(f"❌ Erreur remise à zéro: {e}")
-            await asyncio.sleep(3600)
+            logger.error("❌ Erreur coordination: %s", e)
+        await asyncio.sleep(interval)
 
 
 async def main():
     """Fonction principale"""
     try:
+        loop_monitor.start()
         await start_web_server()
 
         success = await start_bot()
@@ -863,16 +1884,27 @@ async def main():
             logger.error("❌ Échec du démarrage du bot")
             return
 
+        channels.start(process_channel_message)
+        if coordinator is None:
+            # Mode multi-workers: écritures des prédictions faites par le leader (drain_outbox)
+            asyncio.create_task(predictions.run())
         logger.info("✅ Bot complètement opérationnel")
         logger.info("📊 En attente de messages...")
 
         asyncio.create_task(daily_reset())
         logger.info("✅ Tâche de remise à zéro démarrée")
 
+        if coordinator is not None:
+            # Les journées figées sont reprises par le leader, une fois élu
+            asyncio.create_task(coordination_loop())
+            logger.info("✅ Coordination multi-workers démarrée (worker %s)", coordinator.worker_id)
+        else:
+            resume_pending_rollovers()
+
         await client.run_until_disconnected()
 
     except Exception as e:
-        logger.error(f"❌ Erreur dans main: {e}")
+        logger.error("❌ Erreur dans main: %s", e)
     finally:
         await client.disconnect()
 
@@ -883,4 +1915,4 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         logger.info("🛑 Bot arrêté par l'utilisateur")
     except Exception as e:
-        logger.error(f"❌ Erreur fatale: {e}")
+        logger.error("❌ Erreur fatale: %s", e)
@@ -0,0 +1,145 @@
+"""
+Formats de messages des canaux de jeux
+Chaque format a son analyseur compilé (numéro de jeu + groupes de cartes); le format d'un canal
+est détecté sur ses premiers messages puis seul son analyseur tourne, avec repli sur les autres
+formats et nouvelle détection si la confiance baisse
+"""
+import logging
+import re
+from collections import Counter as Tally, deque
+from typing import Dict, List, Optional, Tuple
+
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+FORMAT_FALLBACKS = Counter('bot_format_fallbacks', "Messages reconnus par un autre format que celui du canal", ['format'])
+FORMAT_DETECTIONS = Counter('bot_format_detections', "Formats détectés", ['format'])
+
+# (numéro de jeu ou None, groupes de cartes)
+Parsed = Tuple[Optional[int], List[str]]
+
+
+class MessageFormat:
+    """Analyseur d'un format: expression du numéro de jeu et des groupes de cartes"""
+
+    def __init__(self, name: str, number_pattern: str, group_pattern: str = r"\(([^)]*)\)",
+                 description: str = ''):
+        self.name = name
+        self.description = description
+        self._number = re.compile(number_pattern, re.IGNORECASE).search
+        self._groups = re.compile(group_pattern).findall
+
+    def parse(self, message: str) -> Parsed:
+        match = self._number(message)
+        if match is None:
+            return None, []
+        return int(match.group(1)), self._groups(message)
+
+    def __repr__(self) -> str:
+        return f"MessageFormat({self.name!r})"
+
+
+# Registre des formats, dans l'ordre de préférence (repli et départage)
+FORMATS: Dict[str, MessageFormat] = {}
+
+
+def register_format(message_format: MessageFormat) -> MessageFormat:
+    FORMATS[message_format.name] = message_format
+    return message_format
+
+
+register_format(MessageFormat('hash_n', r"#N\s*(\d+)\.?", description="#N123. 1(A♠️K♥️2♦️) - ✅5(3♣️4♣️)"))
+register_format(MessageFormat('jeu', r"jeu\s*#?\s*(\d+)", description="Jeu #123 (A♠️K♥️2♦️) - (3♣️4♣️)"))
+
+
+def complete(parsed: Parsed) -> bool:
+    """Numéro trouvé et au moins deux groupes"""
+    return parsed[0] is not None and len(parsed[1]) >= 2
+
+
+class FormatDetector:
+    """
+    Format d'un canal: détection sur `sample_size` messages reconnus (vote), puis analyseur unique
+    Repli sur les autres formats pour un message non reconnu; nouvelle détection si moins de
+    `min_confidence` des `window` derniers messages sont reconnus par le format retenu
+    Derrière le cache d'analyse des résultats, seuls les textes distincts sont comptés
+    """
+
+    def __init__(self, formats: Optional[List[MessageFormat]] = None, sample_size: int = 5,
+                 window: int = 20, min_confidence: float = 0.6):
+        self._formats = formats
+        self.sample_size = sample_size
+        self.min_confidence = min_confidence
+        self.current: Optional[MessageFormat] = None
+        self._votes: Tally = Tally()
+        self._recent: deque = deque(maxlen=window)
+
+    @property
+    def formats(self) -> List[MessageFormat]:
+        return self._formats if self._formats is not None else list(FORMATS.values())
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.current.name if self.current else None
+
+    def confidence(self) -> float:
+        return sum(self._recent) / len(self._recent) if self._recent else 1.0
+
+    def parse(self, message: str) -> Parsed:
+        current = self.current
+        if current is None:
+            return self._detect(message)
+
+        number, groups = parsed = current.parse(message)
+        if number is not None and len(groups) >= 2:
+            self._recent.append(True)
+            return parsed
+
+        self._recent.append(False)
+        fallback = self._fallback(message, exclude=self.current, partial=parsed)
+        if len(self._recent) == self._recent.maxlen and self.confidence() < self.min_confidence:
+            logger.warning("🧭 Format %s reconnu sur %.0f%% des derniers messages, nouvelle détection",
+                           self.current.name, self.confidence() * 100)
+            self.reset()
+        return fallback
+
+    def _fallback(self, message: str, exclude: Optional[MessageFormat], partial: Parsed) -> Parsed:
+        """Premier format qui reconnaît le message; à défaut, le premier numéro trouvé"""
+        first_number = partial if partial[0] is not None else None
+        for message_format in self.formats:
+            if message_format is exclude:
+                continue
+            parsed = message_format.parse(message)
+            if complete(parsed):
+                FORMAT_FALLBACKS.labels(format=message_format.name).inc()
+                return parsed
+            if first_number is None and parsed[0] is not None:
+                first_number = parsed
+        return first_number or (None, [])
+
+    def _detect(self, message: str) -> Parsed:
+        """Phase de détection: tous les formats sont essayés et votent"""
+        result = None
+        first_number = None
+        for message_format in self.formats:
+            parsed = message_format.parse(message)
+            if complete(parsed):
+                self._votes[message_format.name] += 1
+                if result is None:
+                    result = parsed
+            elif first_number is None and parsed[0] is not None:
+                first_number = parsed
+        if result is not None and sum(self._votes.values()) >= self.sample_size:
+            order = [message_format.name for message_format in self.formats]
+            name = max(self._votes, key=lambda n: (self._votes[n], -order.index(n)))
+            self.current = FORMATS.get(name) or next(f for f in self.formats if f.name == name)
+            self._recent.clear()
+            FORMAT_DETECTIONS.labels(format=name).inc()
+            logger.info("🧭 Format détecté: %s (%s)", name, dict(self._votes))
+        return result or first_number or (None, [])
+
+    def reset(self):
+        self.current = None
+        self._votes.clear()
+        self._recent.clear()
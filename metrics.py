@@ -0,0 +1,265 @@
+"""
+Instrumentation du bot: compteurs, jauges et histogrammes de latence
+Exposés au format texte Prometheus sur la route /metrics
+"""
+import bisect
+import functools
+import inspect
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bornes par défaut des histogrammes de latence (secondes)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    """Mesure une durée; utilisable comme gestionnaire de contexte ou décorateur"""
+
+    __slots__ = ('_observe', '_start')
+
+    def __init__(self, observe: Callable[[float], None]):
+        self._observe = observe
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._observe(time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, func):
+        observe = self._observe
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - start)
+        return wrapper
+
+
+class _Metric:
+    """Base commune: une série par combinaison de valeurs d'étiquettes"""
+
+    kind = ''
+    # Suffixe des échantillons: la famille est déclarée sous le même nom (HELP/TYPE)
+    suffix = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 registry: Optional['Registry'] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values, **kwargs) -> '_Metric':
+        """Série correspondant aux valeurs d'étiquettes données (à conserver sur les chemins critiques)"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            child = self._new_child()
+            self._children[values] = child
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _series(self) -> List[Tuple[Tuple[str, ...], object]]:
+        if self.labelnames:
+            return list(self._children.items())
+        return [((), self)]
+
+    def collect(self) -> List[str]:
+        family = self.name + self.suffix
+        lines = [f"# HELP {family} {self.documentation}", f"# TYPE {family} {self.kind}"]
+        for values, series in self._series():
+            lines.extend(series._samples(family, self.labelnames, values))
+        return lines
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    kind = 'counter'
+    suffix = '_total'
+
+    def __init__(self, *args, **kwargs):
+        self.value = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _new_child(self):
+        child = Counter.__new__(Counter)
+        child.value = 0.0
+        return child
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def _samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée (éventuellement calculée à la collecte)"""
+
+    kind = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        super().__init__(*args, **kwargs)
+
+    def _new_child(self):
+        child = Gauge.__new__(Gauge)
+        child.value = 0.0
+        child._function = None
+        return child
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Calcule la valeur au moment de la collecte"""
+        self._function = function
+
+    def _samples(self, name, labelnames, values):
+        value = self.value
+        if self._function is not None:
+            try:
+                value = self._function()
+            except Exception:
+                value = float('nan')
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif de durées (ou de toute valeur positive)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS, registry: Optional['Registry'] = None):
+        self.buckets = tuple(sorted(buckets))
+        self._init_series(self)
+        super().__init__(name, documentation, labelnames, registry)
+
+    @staticmethod
+    def _init_series(series: 'Histogram'):
+        series.counts = [0] * (len(series.buckets) + 1)
+        series.sum = 0.0
+        series.count = 0
+
+    def _new_child(self):
+        child = Histogram.__new__(Histogram)
+        child.buckets = self.buckets
+        self._init_series(child)
+        return child
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> _Timer:
+        """Chronomètre: `with h.time():` ou `@h.time()`"""
+        return _Timer(self.observe)
+
+    def _samples(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {self.count}")
+        return lines
+
+
+class Registry:
+    """Ensemble des métriques exposées"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Format d'exposition texte Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+
+def instrument_async_methods(obj, names: Iterable[str], histogram: Histogram, errors: Counter):
+    """Remplace des méthodes asynchrones d'un objet par des versions chronométrées (étiquette: method)"""
+    for name in names:
+        original = getattr(obj, name)
+        series = histogram.labels(method=name)
+        error_series = errors.labels(method=name)
+
+        def make_wrapper(method, series, error_series):
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                except Exception:
+                    error_series.inc()
+                    raise
+                finally:
+                    series.observe(time.perf_counter() - start)
+            return wrapper
+
+        setattr(obj, name, make_wrapper(original, series, error_series))
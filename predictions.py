@@ -0,0 +1,385 @@
+"""
+Prédictions en temps réel à partir des résultats enregistrés
+Modèle de Markov sur les derniers gagnants (compteurs de transitions, mise à jour en O(1) par partie),
+vérification automatique quand le jeu visé arrive (index des prédictions en attente),
+écriture groupée dans les stocks de yaml_manager
+"""
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+from metrics import Counter, Histogram
+from yaml_manager import game_day
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_SECONDS = Histogram('bot_prediction_seconds', "Durée de mise à jour du modèle et d'émission d'une prédiction",
+                               buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05))
+PREDICTIONS_VERIFIED = Counter('bot_predictions_verified', "Prédictions vérifiées", ['outcome'])
+
+WINNERS = ('Joueur', 'Banquier')
+PENDING = '⌛'
+MISSED = '❌'
+EXPIRED = '⏹️'
+HIT_MARKS = ('0️⃣', '1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣')
+SUITS = ('♠', '♥', '♦', '♣')
+
+# Prédiction en attente: (canal ou None pour tous les canaux, numéro de jeu visé)
+PredictionKey = Tuple[Optional[int], int]
+
+
+def prediction_hit(prediction: str, result: Dict[str, Any]) -> bool:
+    """Gagnant prédit (Joueur/Banquier) ou combinaison de couleurs présente dans le premier groupe"""
+    if prediction in WINNERS:
+        return result.get('gagnant') == prediction
+    suits = [suit for suit in SUITS if suit in (prediction or '')]
+    cards = result.get('cartes_groupe1') or ''
+    return bool(suits) and any(suit in cards for suit in suits)
+
+
+class VerificationIndex:
+    """
+    Prédictions en attente indexées par numéro de jeu: chaque prédiction est inscrite sur les numéros
+    de sa fenêtre [cible, cible + tolérance] (dict) et dans un tas-min par canal sur la fin de fenêtre
+    Un résultat ne touche que les prédictions de son numéro et celles dont la fenêtre est dépassée
+    """
+
+    def __init__(self, tolerance: int = 2):
+        self.tolerance = tolerance
+        self.entries: Dict[PredictionKey, Dict[str, Any]] = {}
+        self._by_number: Dict[int, Set[PredictionKey]] = {}
+        self._heaps: Dict[Optional[int], List[Tuple[int, PredictionKey]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def add(self, chat_id: Optional[int], game_number: int, prediction: str, **extra):
+        key = (chat_id, game_number)
+        if key in self.entries:
+            return
+        self.entries[key] = dict(extra, chat_id=chat_id, game_number=game_number, prediction=prediction)
+        for number in range(game_number, game_number + self.tolerance + 1):
+            self._by_number.setdefault(number, set()).add(key)
+        heapq.heappush(self._heaps.setdefault(chat_id, []), (game_number + self.tolerance, key))
+
+    def _remove(self, key: PredictionKey) -> Dict[str, Any]:
+        entry = self.entries.pop(key)
+        game_number = entry['game_number']
+        for number in range(game_number, game_number + self.tolerance + 1):
+            keys = self._by_number.get(number)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_number[number]
+        return entry
+
+    @staticmethod
+    def _concerns(key: PredictionKey, channel_id: int) -> bool:
+        return key[0] is None or key[0] == channel_id
+
+    def resolve(self, channel_id: int, result: Dict[str, Any]) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Vérifie les prédictions touchées par un résultat: réussite dans la fenêtre, échec en fin de fenêtre
+        (ou fenêtre dépassée); les autres restent en attente. Renvoie [(prédiction, statut)]
+        """
+        number = result['numero']
+        resolved = []
+        for key in list(self._by_number.get(number, ())):
+            if not self._concerns(key, channel_id):
+                continue
+            entry = self.entries[key]
+            distance = number - entry['game_number']
+            if prediction_hit(entry['prediction'], result):
+                resolved.append((self._remove(key), '✅' + HIT_MARKS[distance]))
+            elif distance >= self.tolerance:
+                resolved.append((self._remove(key), MISSED))
+
+        # Fenêtres dépassées sans jeu enregistré en fin de fenêtre (entrées déjà retirées ignorées)
+        for chat_id in (channel_id, None):
+            heap = self._heaps.get(chat_id)
+            while heap and heap[0][0] < number:
+                end, key = heapq.heappop(heap)
+                if key in self.entries and self.entries[key]['game_number'] + self.tolerance == end:
+                    resolved.append((self._remove(key), MISSED))
+        return resolved
+
+    def expire_channel(self, channel_id: int) -> List[Tuple[Dict[str, Any], str]]:
+        """Numérotation repartie de zéro sur un canal: ses prédictions en attente expirent"""
+        self._heaps.pop(channel_id, None)
+        return [(self._remove(key), EXPIRED) for key in list(self.entries) if key[0] == channel_id]
+
+    def load(self, pending_predictions: Iterable[Dict[str, Any]], schedule: Dict[str, Any]):
+        """Construit l'index depuis predictions.yaml (statut ⌛) et la planification automatique du jour"""
+        for prediction in pending_predictions:
+            try:
+                self.add(prediction.get('chat_id'), int(prediction['game_number']),
+                         prediction.get('suit_combination'), source='predictions', id=prediction.get('id'))
+            except (KeyError, TypeError, ValueError):
+                continue
+        for schedule_key, entry in (schedule or {}).items():
+            if not isinstance(entry, dict) or entry.get('verified') or not entry.get('prediction'):
+                continue
+            chat, _, number = str(schedule_key).rpartition(':')
+            try:
+                self.add(int(chat) if chat and chat != 'None' else None, int(number), entry['prediction'],
+                         source='auto_predictions')
+            except ValueError:
+                continue
+
+
+class MarkovWinnerModel:
+    """
+    Probabilité du prochain gagnant selon les `order` derniers gagnants
+    Repli sur un contexte plus court tant qu'un contexte a moins de `min_samples` observations
+    """
+
+    def __init__(self, order: int = 3, min_samples: int = 8):
+        self.order = order
+        self.min_samples = min_samples
+        self.history: deque = deque(maxlen=order)
+        # Contexte ('' = fréquence globale, 'JB' = Joueur puis Banquier...) → [joueur, banquier]
+        self.counts: Dict[str, List[int]] = {}
+
+    def _contexts(self) -> List[str]:
+        letters = ''.join(winner[0] for winner in self.history)
+        return [letters[len(letters) - size:] if size else '' for size in range(len(letters), -1, -1)]
+
+    def update(self, winner: str):
+        if winner not in WINNERS:
+            return
+        slot = WINNERS.index(winner)
+        for context in self._contexts():
+            self.counts.setdefault(context, [0, 0])[slot] += 1
+        self.history.append(winner)
+
+    def predict(self) -> Tuple[str, float, str]:
+        """(gagnant prédit, probabilité lissée, contexte utilisé)"""
+        for context in self._contexts():
+            joueur, banquier = self.counts.get(context, (0, 0))
+            if joueur + banquier >= self.min_samples or context == '':
+                p_joueur = (joueur + 1) / (joueur + banquier + 2)
+                if p_joueur >= 0.5:
+                    return WINNERS[0], p_joueur, context
+                return WINNERS[1], 1 - p_joueur, context
+        return WINNERS[0], 0.5, ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copie de l'état (les compteurs continuent d'évoluer sur la boucle pendant l'écriture)"""
+        return {'history': list(self.history), 'counts': {context: list(pair) for context, pair in self.counts.items()}}
+
+    def load(self, data: Dict[str, Any]):
+        self.history.extend(w for w in data.get('history', []) if w in WINNERS)
+        self.counts = {str(k): [int(v[0]), int(v[1])] for k, v in (data.get('counts') or {}).items()}
+
+
+class ChannelPredictor:
+    """Modèle, prédiction en attente et précision pour un canal"""
+
+    def __init__(self, order: int, min_samples: int):
+        self.model = MarkovWinnerModel(order, min_samples)
+        self.pending: Optional[Dict[str, Any]] = None
+        self.last_number: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'model': self.model.to_dict(), 'pending': dict(self.pending) if self.pending else None,
+                'last_number': self.last_number,
+                'hits': self.hits, 'misses': self.misses}
+
+    def load(self, data: Dict[str, Any]):
+        self.model.load(data.get('model') or {})
+        self.pending = data.get('pending')
+        self.last_number = data.get('last_number')
+        self.hits = int(data.get('hits', 0))
+        self.misses = int(data.get('misses', 0))
+
+
+class PredictionEngine:
+    """
+    Écouteur des résultats enregistrés (tous canaux): vérifie la prédiction en attente,
+    met à jour le modèle puis prédit le gagnant du jeu `offset` numéros plus loin
+    Une prédiction est réussie si le gagnant prédit sort sur un jeu enregistré de [cible, cible + tolerance]
+    Les écritures YAML sont regroupées et faites hors de la boucle (flush)
+    Mode multi-workers: seul le leader fait tourner le moteur, alimenté par la boîte d'envoi partagée
+    (apply_shared); le dernier identifiant appliqué est sauvegardé avec l'état, un rejeu est ignoré
+    """
+
+    def __init__(self, store, state_file: str = "data/predictions_state.yaml",
+                 offset: int = 2, tolerance: int = 2, order: int = 3, min_samples: int = 8):
+        self.store = store
+        self.state_file = Path(state_file)
+        self.offset = offset
+        self.tolerance = min(tolerance, len(HIT_MARKS) - 1)
+        self.order = order
+        self.min_samples = min_samples
+        self.reload()
+
+    def reload(self):
+        """(Re)charge l'état sauvegardé; les changements non écrits sont abandonnés (nouveau leader)"""
+        self.channels: Dict[int, ChannelPredictor] = {}
+        self.index = VerificationIndex(self.tolerance)
+        # Écritures en attente: nouvelles prédictions et changements de statut
+        self._new: List[Dict[str, Any]] = []
+        self._updates: List[Dict[str, Any]] = []
+        self._dirty = False
+        # Dernière partie de la boîte d'envoi partagée appliquée au modèle (mode multi-workers)
+        self.applied_id = 0
+        self._load_state()
+        # Dernier identifiant écrit sur disque: les parties jusqu'à lui peuvent quitter la boîte d'envoi
+        self.saved_id = self.applied_id
+        self.index.load(self.store.get_pending_predictions(), self.store.load_auto_prediction_schedule())
+        for channel_id, predictor in self.channels.items():
+            if predictor.pending and (channel_id, predictor.pending['game_number']) not in self.index:
+                # Prédiction émise mais pas encore écrite avant l'arrêt
+                self._new.append(dict(predictor.pending, chat_id=channel_id))
+                self.index.add(channel_id, predictor.pending['game_number'], predictor.pending['prediction'],
+                               id=predictor.pending.get('id'))
+                self._dirty = True
+
+    def _load_state(self):
+        try:
+            if self.state_file.exists():
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f) or {}
+                for channel_id, channel_data in data.items():
+                    if channel_id == 'outbox_id':
+                        self.applied_id = int(channel_data or 0)
+                        continue
+                    self.predictor(int(channel_id)).load(channel_data or {})
+        except Exception as e:
+            logger.error("❌ Erreur chargement état des prédictions: %s", e)
+
+    def predictor(self, channel_id: int) -> ChannelPredictor:
+        predictor = self.channels.get(channel_id)
+        if predictor is None:
+            predictor = self.channels[channel_id] = ChannelPredictor(self.order, self.min_samples)
+        return predictor
+
+    def record(self, channel_id: int, result: Dict[str, Any]):
+        """Écouteur ChannelRegistry: appelé avec chaque partie enregistrée, en O(1)"""
+        start = time.perf_counter()
+        number = result.get('numero')
+        winner = result.get('gagnant')
+        if number is None:
+            return
+        predictor = self.predictor(channel_id)
+
+        resolved = []
+        # Numérotation repartie de zéro (nouvelle journée, remise à zéro): les prédictions en cours expirent
+        if predictor.last_number is not None and number < predictor.last_number:
+            resolved += self.index.expire_channel(channel_id)
+        predictor.last_number = number
+
+        resolved += self.index.resolve(channel_id, result)
+        for entry, status in resolved:
+            self._close(channel_id, predictor, entry, status, number)
+
+        predictor.model.update(winner)
+
+        if predictor.pending is None:
+            prediction, confidence, context = predictor.model.predict()
+            day = game_day()
+            predictor.pending = {
+                # Identifiant de la journée de jeu: un même numéro revient chaque jour
+                'id': self.store.prediction_id(day, channel_id, number + self.offset),
+                'day': day,
+                'game_number': number + self.offset,
+                'prediction': prediction,
+                'confidence': round(confidence, 3),
+                'context': context,
+                'created_at': datetime.now().isoformat()
+            }
+            self.index.add(channel_id, predictor.pending['game_number'], prediction, id=predictor.pending['id'])
+            self._new.append(dict(predictor.pending, chat_id=channel_id))
+
+        self._dirty = True
+        PREDICTION_SECONDS.observe(time.perf_counter() - start)
+
+    def apply_shared(self, row_id: int, channel_id: int, result: Dict[str, Any]):
+        """Partie lue dans la boîte d'envoi partagée (leader): appliquée une seule fois, dans l'ordre"""
+        if row_id <= self.applied_id:
+            return
+        self.record(channel_id, result)
+        self.applied_id = row_id
+        self._dirty = True
+
+    def _close(self, channel_id: int, predictor: ChannelPredictor, entry: Dict[str, Any], status: str,
+               verified_by: int):
+        outcome = 'hit' if status.startswith('✅') else 'expired' if status == EXPIRED else 'miss'
+        PREDICTIONS_VERIFIED.labels(outcome=outcome).inc()
+        pending = predictor.pending
+        if entry['chat_id'] == channel_id and pending and pending['game_number'] == entry['game_number']:
+            # Prédiction du modèle de ce canal: précision et émission de la suivante
+            predictor.pending = None
+            if outcome == 'hit':
+                predictor.hits += 1
+            elif outcome == 'miss':
+                predictor.misses += 1
+        self._updates.append({'id': entry.get('id'), 'game_number': entry['game_number'],
+                              'chat_id': entry['chat_id'], 'status': status, 'verified_by': verified_by if outcome != 'expired' else None})
+        logger.debug("🔮 Prédiction #%s (%s): %s", entry['game_number'], entry['prediction'], status)
+
+    def summary(self, channel_id: int) -> Dict[str, Any]:
+        predictor = self.channels.get(channel_id) or ChannelPredictor(self.order, self.min_samples)
+        verified = predictor.hits + predictor.misses
+        return {
+            'pending': predictor.pending,
+            'hits': predictor.hits,
+            'misses': predictor.misses,
+            'accuracy': (predictor.hits / verified * 100) if verified else 0.0,
+            'recent': ''.join(w[0] for w in predictor.model.history)
+        }
+
+    def _write(self, new: List[Dict[str, Any]], updates: List[Dict[str, Any]], state: Dict[int, Any]):
+        self.store.apply_prediction_updates(new, updates)
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            yaml.dump(state, f, allow_unicode=True, default_flow_style=False)
+        tmp_file.replace(self.state_file)
+
+    async def flush(self) -> bool:
+        """
+        Écrit les prédictions et vérifications accumulées en une seule passe, dans un thread
+        Renvoie False si l'écriture a échoué (les changements sont gardés pour la passe suivante)
+        """
+        if not self._dirty:
+            return True
+        new, self._new = self._new, []
+        updates, self._updates = self._updates, []
+        self._dirty = False
+        # Instantané pris sur la boucle: le thread d'écriture ne voit aucun objet modifié entre-temps
+        state = {channel_id: predictor.to_dict() for channel_id, predictor in self.channels.items()}
+        applied_id = self.applied_id
+        if applied_id:
+            state['outbox_id'] = applied_id
+        try:
+            await asyncio.to_thread(self._write, new, updates, state)
+            self.saved_id = applied_id
+        except Exception as e:
+            logger.error("❌ Erreur sauvegarde des prédictions: %s", e)
+            self._new[:0] = new
+            self._updates[:0] = updates
+            self._dirty = True
+            return False
+        return True
+
+    async def run(self, interval: float = 1.0):
+        """Tâche de fond: écritures groupées toutes les `interval` secondes"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
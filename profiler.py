@@ -0,0 +1,93 @@
+"""
+Profilage à la demande du bot en fonctionnement
+cProfile (temps cumulé par fonction) et tracemalloc (sites d'allocation) pendant N secondes
+Aucun coût quand aucune session n'est active: rien n'est installé en dehors d'une session
+"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+
+MAX_DURATION = 300
+TELEGRAM_LIMIT = 3900
+
+# Répertoire du projet, retiré des chemins affichés
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+# Mécanique de la boucle asyncio: englobe tout le reste, inutile dans le classement
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__) + os.sep
+
+
+def _short_path(path: str) -> str:
+    if path.startswith(PROJECT_DIR):
+        return path[len(PROJECT_DIR):]
+    parts = path.replace('\\', '/').split('/')
+    return '/'.join(parts[-2:])
+
+
+class ProfileSession:
+    """Une seule session de profilage à la fois"""
+
+    def __init__(self):
+        self.active = False
+
+    async def run(self, seconds: float, top: int = 15) -> str:
+        """Profile la boucle asyncio pendant `seconds` secondes et renvoie un rapport texte"""
+        if self.active:
+            raise RuntimeError("Un profilage est déjà en cours")
+        seconds = max(1.0, min(float(seconds), MAX_DURATION))
+
+        self.active = True
+        profiler = cProfile.Profile()
+        started_tracemalloc = not tracemalloc.is_tracing()
+        try:
+            if started_tracemalloc:
+                tracemalloc.start(10)
+            # cProfile s'installe sur le thread courant: celui de la boucle, où tournent les handlers
+            profiler.enable()
+            await asyncio.sleep(seconds)
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            profiler.disable()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self.active = False
+
+        return self._format_report(seconds, profiler, snapshot, top)
+
+    def _format_report(self, seconds: float, profiler: cProfile.Profile,
+                       snapshot: tracemalloc.Snapshot, top: int) -> str:
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        entries = []
+        for (filename, line, name), (_, calls, _, cumulative, _) in stats.stats.items():
+            if filename.startswith(ASYNCIO_DIR) or filename == '~' or filename == __file__:
+                continue
+            entries.append((cumulative, calls, f"{_short_path(filename)}:{line} {name}"))
+        entries.sort(reverse=True)
+
+        lines = [f"🔬 **Profilage sur {seconds:.0f}s**", "", "**Temps cumulé (top fonctions):**"]
+        for cumulative, calls, label in entries[:top]:
+            lines.append(f"`{cumulative * 1000:8.1f} ms {calls:6d}x` {label}")
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, __file__),
+        ))
+        allocations = snapshot.statistics('lineno')[:10]
+        total = sum(stat.size for stat in snapshot.statistics('filename'))
+        lines += ["", f"**Allocations (total suivi {total / 1024:.0f} Ko):**"]
+        for stat in allocations:
+            frame = stat.traceback[0]
+            lines.append(f"`{stat.size / 1024:8.1f} Ko {stat.count:6d}x` {_short_path(frame.filename)}:{frame.lineno}")
+
+        report = '\n'.join(lines)
+        if len(report) > TELEGRAM_LIMIT:
+            report = report[:TELEGRAM_LIMIT] + "\n…"
+        return report
+
+
+profile_session = ProfileSession()
+
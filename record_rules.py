@@ -0,0 +1,189 @@
+"""
+Règles d'enregistrement déclaratives (record_rules.yaml)
+Marqueurs exigés ou interdits, nombre de cartes et motif de couleurs par groupe, contraintes de séquence
+Compilées au chargement: chaque condition de groupe devient un ensemble précalculé de profils
+de couleurs acceptés, testé par une simple appartenance
+"""
+import itertools
+import logging
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+SUIT_ORDER = ('♠', '♥', '♦', '♣')
+SUIT_BITS = (1, 2, 4, 8)
+MAX_CARDS = 6
+
+# Profil d'un groupe: nombre de ♠, ♥, ♦, ♣
+SuitCounts = Tuple[int, int, int, int]
+
+# Règles actuelles du bot (utilisées si record_rules.yaml est absent)
+DEFAULT_RULES: Dict[str, Any] = {
+    'markers': [
+        {'symbol': '⏰', 'present': False, 'reason': "Message en cours d'édition (symbole ⏰)"},
+        {'symbol': '🔰', 'present': False, 'reason': "Message avec symbole 🔰 (ignoré)"},
+        {'symbol': '✅', 'present': True, 'reason': "Message non finalisé (pas de symbole ✅)"},
+    ],
+    'groups': [
+        {'winner': 'Joueur', 'cards': 3, 'suits': 'distinct'},
+        {'winner': 'Banquier', 'cards': 3, 'suits': 'distinct'},
+    ],
+    'several_match': 'ignore',
+    'reasons': {
+        'missing_groups': "Pas assez de groupes de parenthèses",
+        'several_match': "Les deux groupes ont 3 couleurs différentes - pas d'enregistrement",
+        'no_match': "Aucun groupe avec 3 couleurs différentes",
+    },
+    'sequence': {
+        'skip_duplicates': True,
+        'skip_after_recorded': 1,
+    },
+}
+
+
+def suit_counts(group: str) -> SuitCounts:
+    """Nombre de cartes de chaque couleur dans un groupe (♠, ♥, ♦, ♣; ❤ compte comme ♥)"""
+    return (group.count('♠'), group.count('♥') + group.count('❤'), group.count('♦'), group.count('♣'))
+
+
+ALL_PROFILES = list(itertools.product(range(MAX_CARDS + 1), repeat=len(SUIT_ORDER)))
+# Masque binaire des couleurs présentes (♠=1, ♥=2, ♦=4, ♣=8) pour chaque profil
+PROFILE_MASKS: Dict[SuitCounts, int] = {
+    counts: sum(bit for count, bit in zip(counts, SUIT_BITS) if count) for counts in ALL_PROFILES}
+
+
+def suit_mask_from_counts(counts: SuitCounts) -> int:
+    mask = PROFILE_MASKS.get(counts)
+    if mask is None:
+        mask = sum(bit for count, bit in zip(counts, SUIT_BITS) if count)
+    return mask
+
+
+def _suits_predicate(spec) -> Any:
+    """Motif de couleurs: 'distinct', 'same', 'any' ou liste de combinaisons (ordre indifférent)"""
+    if spec in (None, 'any'):
+        return lambda counts: True
+    if spec == 'distinct':
+        return lambda counts: all(count <= 1 for count in counts)
+    if spec == 'same':
+        return lambda counts: sum(1 for count in counts if count) == 1
+    if isinstance(spec, list):
+        patterns = {suit_counts(str(pattern)) for pattern in spec}
+        return lambda counts: counts in patterns
+    raise ValueError(f"Motif de couleurs inconnu: {spec!r}")
+
+
+def _compile_group(rule: Dict[str, Any]) -> FrozenSet[SuitCounts]:
+    """Ensemble des profils de couleurs acceptés par une condition de groupe"""
+    cards = rule.get('cards', 3)
+    card_counts = {int(c) for c in (cards if isinstance(cards, list) else [cards])}
+    if not card_counts or min(card_counts) < 0 or max(card_counts) > MAX_CARDS:
+        raise ValueError(f"Nombre de cartes invalide: {cards!r} (0 à {MAX_CARDS})")
+    accepts = _suits_predicate(rule.get('suits', 'any'))
+    return frozenset(counts for counts in ALL_PROFILES if sum(counts) in card_counts and accepts(counts))
+
+
+class RuleSet:
+    """Règles compilées; `source` garde la description d'origine pour l'affichage"""
+
+    def __init__(self, source: Dict[str, Any], origin: str = 'défaut'):
+        self.source = source
+        self.origin = origin
+
+        markers = source.get('markers') or []
+        self.markers: List[Tuple[str, bool, str]] = []
+        for marker in markers:
+            symbol = str(marker['symbol'])
+            present = bool(marker.get('present', True))
+            default_reason = (f"Message sans symbole {symbol}" if present else f"Message avec symbole {symbol} (ignoré)")
+            self.markers.append((symbol, present, marker.get('reason') or default_reason))
+
+        groups = source.get('groups') or []
+        if not groups:
+            raise ValueError("Au moins une condition de groupe est requise")
+        self.group_tables: List[Tuple[FrozenSet[SuitCounts], str]] = []
+        for rule in groups:
+            winner = rule.get('winner')
+            if not winner:
+                raise ValueError(f"Condition de groupe sans gagnant: {rule!r}")
+            self.group_tables.append((_compile_group(rule), str(winner)))
+        self.required_groups = max(2, len(self.group_tables))
+
+        several = source.get('several_match', 'ignore')
+        if several not in ('ignore', 'first'):
+            raise ValueError(f"several_match doit valoir 'ignore' ou 'first': {several!r}")
+        self.first_match_wins = several == 'first'
+
+        reasons = dict(DEFAULT_RULES['reasons'], **(source.get('reasons') or {}))
+        self.missing_groups_reason = reasons['missing_groups']
+        self.several_match_reason = reasons['several_match']
+        self.no_match_reason = reasons['no_match']
+
+        sequence = source.get('sequence') or {}
+        self.skip_duplicates = bool(sequence.get('skip_duplicates', True))
+        self.skip_after_recorded = int(sequence.get('skip_after_recorded', 1))
+
+    @classmethod
+    def default(cls) -> 'RuleSet':
+        return cls(DEFAULT_RULES)
+
+    def marker_reject(self, message: str) -> Optional[str]:
+        """Raison du rejet si un marqueur interdit est présent ou un marqueur exigé absent"""
+        for symbol, present, reason in self.markers:
+            if (symbol in message) != present:
+                return reason
+        return None
+
+    def winner(self, profiles: List[SuitCounts]) -> Tuple[Optional[str], Optional[str]]:
+        """(gagnant, raison du rejet) d'après les profils de couleurs des groupes"""
+        matched = None
+        for (table, winner), counts in zip(self.group_tables, profiles):
+            if counts in table:
+                if matched is not None:
+                    return None, self.several_match_reason
+                matched = winner
+                if self.first_match_wins:
+                    break
+        if matched is None:
+            return None, self.no_match_reason
+        return matched, None
+
+    def sequence_reject(self, index, game_number: int) -> Optional[str]:
+        """Contraintes de séquence évaluées contre les résultats enregistrés (index trié)"""
+        if self.skip_duplicates and index.contains(game_number):
+            return f"Jeu #{game_number} déjà enregistré"
+        for gap in range(1, self.skip_after_recorded + 1):
+            if index.contains(game_number - gap):
+                return f"Numéro consécutif ignoré ({game_number - gap} → {game_number})"
+        return None
+
+    def describe(self) -> str:
+        lines = []
+        for symbol, present, _ in self.markers:
+            lines.append(f"• {symbol} {'exigé' if present else 'interdit'}")
+        for position, rule in enumerate(self.source.get('groups') or [], 1):
+            lines.append(f"• Groupe {position} → {rule.get('winner')}: {rule.get('cards', 3)} carte(s), "
+                         f"couleurs {rule.get('suits', 'any')}")
+        lines.append(f"• Plusieurs groupes valides: {'premier' if self.first_match_wins else 'ignoré'}")
+        lines.append(f"• Doublons ignorés: {'oui' if self.skip_duplicates else 'non'}")
+        lines.append(f"• Numéros suivant un jeu enregistré ignorés: {self.skip_after_recorded}")
+        return '\n'.join(lines)
+
+
+def load_rules(path: str) -> RuleSet:
+    """Charge et compile les règles; règles par défaut si le fichier est absent (ValueError si invalide)"""
+    file_path = Path(path)
+    if not file_path.exists():
+        logger.info("ℹ️ %s absent, règles d'enregistrement par défaut", path)
+        return RuleSet.default()
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source = yaml.safe_load(f) or {}
+        rules = RuleSet(source, origin=str(file_path))
+    except (KeyError, TypeError, AttributeError, yaml.YAMLError) as e:
+        raise ValueError(f"Règles invalides dans {path}: {e}") from e
+    logger.info("📐 Règles d'enregistrement chargées depuis %s", path)
+    return rules
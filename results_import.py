@@ -0,0 +1,111 @@
+"""
+Import des résultats depuis un export Excel (resultats_*.xlsx) ou un CSV de même disposition
+Colonnes: "Date & Heure" (JJ/MM/AAAA - HH:MM), "Numéro", "Victoire (Joueur/Banquier)"
+Les lignes sont lues à la demande (openpyxl en lecture seule, csv.reader): la mémoire ne dépend
+pas de la taille du fichier
+"""
+import csv
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+IMPORTED_ROWS = Counter('bot_import_rows', "Lignes lues par les imports, par résultat", ['result'])
+
+WINNERS = {'joueur': 'Joueur', 'banquier': 'Banquier'}
+# Disposition de export_to_txt: "JJ/MM/AAAA - HH:MM" (analysée sans strptime, c'est le cas courant)
+EXPORT_DATETIME = re.compile(r"(\d{2})/(\d{2})/(\d{4}) - (\d{2}):(\d{2})(?::(\d{2}))?").fullmatch
+SUPPORTED_SUFFIXES = ('.xlsx', '.xlsm', '.csv')
+
+
+def iter_rows(path: str) -> Iterator[Sequence[Any]]:
+    """Lignes brutes du fichier (valeurs des cellules), sans charger le fichier entier"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            yield from csv.reader(f, dialect)
+    elif suffix in ('.xlsx', '.xlsm'):
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Format non pris en charge: {suffix or path} (xlsx ou csv)")
+
+
+def parse_datetime(value: Any) -> Tuple[str, str]:
+    """Date et heure du résultat ('YYYY-MM-DD', 'HH:MM:SS'); chaînes vides si absentes"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d'), value.strftime('%H:%M:%S')
+    text = str(value or '').strip()
+    match = EXPORT_DATETIME(text)
+    if match:
+        day, month, year, hour, minute, second = match.groups()
+        return f"{year}-{month}-{day}", f"{hour}:{minute}:{second or '00'}"
+    for pattern in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            moment = datetime.strptime(text, pattern)
+            return moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M:%S')
+        except ValueError:
+            continue
+    return '', ''
+
+
+def parse_row(row: Sequence[Any]) -> Optional[Dict[str, Any]]:
+    """Résultat au format du stockage, ou None si la ligne n'est pas un résultat (en-tête, ligne vide)"""
+    if len(row) < 3:
+        return None
+    moment, numero, gagnant = row[0], row[1], row[2]
+    gagnant = WINNERS.get(str(gagnant or '').strip().lower())
+    if gagnant is None:
+        return None
+    try:
+        numero = int(float(numero)) if isinstance(numero, float) else int(str(numero).strip())
+    except (TypeError, ValueError):
+        return None
+    date_str, time_str = parse_datetime(moment)
+    return {
+        'numero': numero,
+        'date': date_str,
+        'heure': time_str,
+        'cartes_groupe1': '',
+        'cartes_groupe2': '',
+        'gagnant': gagnant,
+        'message_complet': ''
+    }
+
+
+def iter_results(path: str, counts: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Résultats du fichier, un par un
+    counts (optionnel) reçoit le nombre de lignes lues et de lignes ignorées
+    """
+    counts = counts if counts is not None else {}
+    counts.setdefault('lignes', 0)
+    counts.setdefault('invalides', 0)
+    for position, row in enumerate(iter_rows(path)):
+        if not row or all(cell in (None, '') for cell in row):
+            continue
+        result = parse_row(row)
+        if result is None:
+            # L'en-tête et la ligne "Aucun résultat enregistré." ne comptent pas comme des erreurs
+            if position > 0 and not str(row[0] or '').startswith('Aucun'):
+                counts['invalides'] += 1
+                IMPORTED_ROWS.labels(result='invalid').inc()
+            continue
+        counts['lignes'] += 1
+        yield result
@@ -0,0 +1,164 @@
+"""
+Index trié des résultats stockés
+Recherches par numéro de jeu et par horodatage en O(log n) (bisect)
+"""
+import bisect
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+Result = Dict[str, Any]
+
+
+def result_time(result: Result) -> str:
+    """Clé temporelle triable 'YYYY-MM-DD HH:MM:SS'"""
+    return f"{result.get('date', '')} {result.get('heure', '')}"
+
+
+def normalize_bound(value: Optional[str], upper: bool) -> Optional[str]:
+    """Complète une borne de date ('YYYY-MM-DD' ou 'YYYY-MM-DD HH:MM') en clé temporelle"""
+    if not value:
+        return None
+    value = value.strip().replace('T', ' ')
+    if len(value) == 10:
+        return value + (' 23:59:59' if upper else ' 00:00:00')
+    if len(value) == 16:
+        return value + (':59' if upper else ':00')
+    return value
+
+
+def matches(result: Result, min_numero: Optional[int] = None, max_numero: Optional[int] = None,
+            since: Optional[str] = None, until: Optional[str] = None, winner: Optional[str] = None) -> bool:
+    """Même filtre que ResultsIndex.query, pour un résultat isolé (données non indexées)"""
+    numero = result.get('numero', 0)
+    if (min_numero is not None and numero < min_numero) or (max_numero is not None and numero > max_numero):
+        return False
+    if winner is not None and result.get('gagnant') != winner:
+        return False
+    since = normalize_bound(since, upper=False)
+    until = normalize_bound(until, upper=True)
+    if since is not None or until is not None:
+        moment = result_time(result)
+        if (since is not None and moment < since) or (until is not None and moment > until):
+            return False
+    return True
+
+
+class ResultsIndex:
+    """Résultats triés par numéro, avec des index secondaires triés par horodatage et par gagnant"""
+
+    def __init__(self, results: List[Result] = ()):
+        self._rows: List[Result] = sorted(results, key=lambda r: r.get('numero', 0))
+        self._numbers: List[int] = [r.get('numero', 0) for r in self._rows]
+        # Index temporel: (clé, numéro) triés; le numéro renvoie vers _rows par bisect
+        self._times: List[Tuple[str, int]] = sorted((result_time(r), r.get('numero', 0)) for r in self._rows)
+        # Par gagnant: numéros et résultats triés par numéro (plages par bisect sans filtrer les autres lignes)
+        self._by_winner: Dict[str, Tuple[List[int], List[Result]]] = {}
+        for row in self._rows:
+            numbers, rows = self._by_winner.setdefault(row.get('gagnant'), ([], []))
+            numbers.append(row.get('numero', 0))
+            rows.append(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def contains(self, numero: int) -> bool:
+        """Vrai si le numéro de jeu est déjà indexé"""
+        position = bisect.bisect_left(self._numbers, numero)
+        return position < len(self._numbers) and self._numbers[position] == numero
+
+    def get(self, numero: int) -> Optional[Result]:
+        position = bisect.bisect_left(self._numbers, numero)
+        if position < len(self._numbers) and self._numbers[position] == numero:
+            return self._rows[position]
+        return None
+
+    def copy(self) -> 'ResultsIndex':
+        """Copie indépendante (listes copiées, résultats partagés), sans re-tri"""
+        clone = ResultsIndex.__new__(ResultsIndex)
+        clone._rows = list(self._rows)
+        clone._numbers = list(self._numbers)
+        clone._times = list(self._times)
+        clone._by_winner = {winner: (list(numbers), list(rows)) for winner, (numbers, rows) in self._by_winner.items()}
+        return clone
+
+    def add(self, result: Result):
+        """Insère un résultat en conservant les deux ordres"""
+        numero = result.get('numero', 0)
+        position = bisect.bisect_right(self._numbers, numero)
+        self._numbers.insert(position, numero)
+        self._rows.insert(position, result)
+        bisect.insort(self._times, (result_time(result), numero))
+        numbers, rows = self._by_winner.setdefault(result.get('gagnant'), ([], []))
+        position = bisect.bisect_right(numbers, numero)
+        numbers.insert(position, numero)
+        rows.insert(position, result)
+
+    def _number_span(self, min_numero: Optional[int], max_numero: Optional[int],
+                     numbers: Optional[List[int]] = None) -> Tuple[int, int]:
+        numbers = self._numbers if numbers is None else numbers
+        lo = 0 if min_numero is None else bisect.bisect_left(numbers, min_numero)
+        hi = len(numbers) if max_numero is None else bisect.bisect_right(numbers, max_numero)
+        return lo, max(lo, hi)
+
+    def _sorted_rows(self, winner: Optional[str]) -> Tuple[List[int], List[Result]]:
+        """Numéros et résultats triés par numéro (tous, ou ceux d'un gagnant)"""
+        if winner is None:
+            return self._numbers, self._rows
+        return self._by_winner.get(winner, ([], []))
+
+    def _time_numbers(self, since: Optional[str], until: Optional[str]) -> List[int]:
+        """Numéros (triés) dont l'horodatage est dans [since, until]"""
+        since = normalize_bound(since, upper=False)
+        until = normalize_bound(until, upper=True)
+        lo = 0 if since is None else bisect.bisect_left(self._times, (since,))
+        hi = len(self._times) if until is None else bisect.bisect_right(self._times, (until, float('inf')))
+        return sorted(numero for _, numero in self._times[lo:hi])
+
+    def query(self, min_numero: Optional[int] = None, max_numero: Optional[int] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              winner: Optional[str] = None) -> Iterator[Result]:
+        """
+        Itère (par numéro croissant) sur les résultats correspondant aux filtres
+        Le coût dépend du nombre de résultats renvoyés, pas de la taille du stockage
+        (avec une plage de dates, le filtre gagnant s'applique aux lignes de la plage)
+        """
+        if since is None and until is None:
+            numbers, rows = self._sorted_rows(winner)
+            lo, hi = self._number_span(min_numero, max_numero, numbers)
+            for position in range(lo, hi):
+                yield rows[position]
+            return
+        rows = (self.get(numero) for numero in self._time_numbers(since, until)
+                if (min_numero is None or numero >= min_numero)
+                and (max_numero is None or numero <= max_numero))
+        for row in rows:
+            if winner is None or row.get('gagnant') == winner:
+                yield row
+
+    def page(self, cursor: Optional[int] = None, limit: int = 100, **filters) -> Tuple[List[Result], Optional[int]]:
+        """Page de résultats après le numéro `cursor`; renvoie (lignes, curseur suivant ou None)"""
+        min_numero = filters.pop('min_numero', None)
+        if cursor is not None:
+            min_numero = max(cursor + 1, min_numero) if min_numero is not None else cursor + 1
+        rows = []
+        for row in self.query(min_numero=min_numero, **filters):
+            if len(rows) == limit:
+                return rows, rows[-1].get('numero')
+            rows.append(row)
+        return rows, None
+
+    def tail(self, count: int, **filters) -> List[Result]:
+        """Les N derniers résultats (par numéro) correspondant aux filtres"""
+        if count <= 0:
+            return []
+        if filters.get('since') is None and filters.get('until') is None:
+            numbers, rows = self._sorted_rows(filters.get('winner'))
+            lo, hi = self._number_span(filters.get('min_numero'), filters.get('max_numero'), numbers)
+            return rows[max(lo, hi - count):hi]
+        return list(deque(self.query(**filters), maxlen=count))
+
+    def last(self, count: int) -> List[Result]:
+        """Les N derniers résultats dans l'ordre chronologique"""
+        if count <= 0:
+            return []
+        return [self.get(numero) for _, numero in self._times[-count:]]
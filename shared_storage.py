@@ -0,0 +1,327 @@
+"""
+Mode multi-processus: plusieurs workers partagent le même répertoire de données
+- verrou de fichier autour des écritures du stockage YAML des résultats
+- base SQLite de coordination: versions de messages déjà traitées, bail du leader,
+  boîte d'envoi des notifications (envoyées par le seul leader), réglages partagés,
+  jeux de la journée figée par la dernière bascule
+Les accès sont bloquants (verrou, transactions): depuis la boucle asyncio, ils passent par un thread
+"""
+import fcntl
+import functools
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed (
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    at REAL NOT NULL,
+    PRIMARY KEY (channel_id, message_id, digest)
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dedupe_key TEXT UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (sent_at, id);
+CREATE TABLE IF NOT EXISTS transfers (
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    admin_message_id INTEGER NOT NULL,
+    PRIMARY KEY (channel_id, message_id)
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rolled_over (
+    channel_id INTEGER NOT NULL,
+    game_number INTEGER NOT NULL,
+    cards TEXT NOT NULL,
+    PRIMARY KEY (channel_id, game_number)
+);
+"""
+
+
+class FileLock:
+    """
+    Verrou exclusif inter-processus (flock) sur un fichier; réentrant dans un même thread
+    Un verrou de threads est pris d'abord: la boucle et les threads du processus s'excluent aussi
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+        return False
+
+
+def message_digest(text: str) -> str:
+    """Empreinte courte du contenu: chaque version éditée d'un message est traitée une fois"""
+    return hashlib.blake2b((text or '').encode('utf-8'), digest_size=8).hexdigest()
+
+
+def serialized(method):
+    """Un seul accès à la connexion SQLite à la fois (boucle et threads du processus)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._db_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class Coordinator:
+    """
+    Coordination des workers partageant la base SQLite (transactions courtes, mode WAL)
+    La connexion est partagée entre la boucle et les threads, chaque méthode la prend sous verrou
+    """
+
+    def __init__(self, db_path: str, worker_id: Optional[str] = None, lease_ttl: float = 10.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self._leader_until = 0.0
+
+        self._db_lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    @serialized
+    def close(self):
+        self._db.close()
+
+    # --- Ingestion idempotente ---
+
+    @serialized
+    def claim_message(self, channel_id: int, message_id: int, text: str) -> bool:
+        """Vrai si ce worker est le premier à traiter cette version du message"""
+        cursor = self._db.execute(
+            "INSERT OR IGNORE INTO processed (channel_id, message_id, digest, worker, at) VALUES (?, ?, ?, ?, ?)",
+            (channel_id, message_id, message_digest(text), self.worker_id, time.time()))
+        return cursor.rowcount == 1
+
+    @serialized
+    def purge(self, older_than: float = 2 * 86400):
+        """Oublie les messages traités et les notifications envoyées plus anciens que `older_than` secondes"""
+        limit = time.time() - older_than
+        self._db.execute("DELETE FROM processed WHERE at < ?", (limit,))
+        self._db.execute("DELETE FROM outbox WHERE sent_at IS NOT NULL AND sent_at < ?", (limit,))
+
+    # --- Élection du leader par bail ---
+
+    @serialized
+    def try_acquire(self, name: str = 'leader') -> bool:
+        """Prend ou renouvelle le bail s'il est libre, expiré ou déjà détenu par ce worker"""
+        now = time.time()
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+            row = self._db.execute("SELECT holder, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            acquired = row is None or row[0] == self.worker_id or row[1] < now
+            if acquired:
+                self._db.execute(
+                    "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at",
+                    (name, self.worker_id, now + self.lease_ttl))
+            self._db.execute("COMMIT")
+        except sqlite3.OperationalError as e:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            logger.warning("⚠️ Bail %s non renouvelé: %s", name, e)
+            acquired = False
+
+        if name == 'leader':
+            # Marge d'une seconde: on cesse d'agir en leader avant l'expiration vue par les autres
+            self._leader_until = now + self.lease_ttl - 1.0 if acquired else 0.0
+        return acquired
+
+    def is_leader(self) -> bool:
+        return time.time() < self._leader_until
+
+    @serialized
+    def leader(self) -> Optional[str]:
+        row = self._db.execute("SELECT holder, expires_at FROM leases WHERE name = 'leader'").fetchone()
+        return row[0] if row and row[1] >= time.time() else None
+
+    @serialized
+    def release(self, name: str = 'leader'):
+        self._db.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, self.worker_id))
+        if name == 'leader':
+            self._leader_until = 0.0
+
+    @serialized
+    def run_once(self, name: str) -> bool:
+        """Vrai pour le seul worker qui enregistre l'exécution `name` (ex: remise à zéro d'une journée)"""
+        cursor = self._db.execute("INSERT OR IGNORE INTO runs (name, holder, at) VALUES (?, ?, ?)",
+                                  (name, self.worker_id, time.time()))
+        return cursor.rowcount == 1
+
+    @serialized
+    def has_run(self, name: str) -> bool:
+        return self._db.execute("SELECT 1 FROM runs WHERE name = ?", (name,)).fetchone() is not None
+
+    @serialized
+    def start_run(self, name: str) -> bool:
+        """
+        Vrai si ce worker prend l'exécution `name`: pas encore terminée et bail « en cours » libre,
+        expiré ou déjà à lui (un worker tombé pendant l'exécution la laisse reprendre après expiration)
+        Le bail est à renouveler (renew_run) tant que l'exécution dure, puis finish_run après son succès
+        """
+        return not self.has_run(name) and self.try_acquire(f"run:{name}")
+
+    @serialized
+    def renew_run(self, name: str) -> bool:
+        return self.try_acquire(f"run:{name}")
+
+    @serialized
+    def finish_run(self, name: str):
+        """Enregistre l'exécution `name` comme terminée, oublie ses étapes et libère son bail"""
+        self._db.execute("INSERT OR IGNORE INTO runs (name, holder, at) VALUES (?, ?, ?)",
+                         (name, self.worker_id, time.time()))
+        prefix = f"run:{name}:"
+        self._db.execute("DELETE FROM settings WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        self.release(f"run:{name}")
+
+    @serialized
+    def mark_step(self, name: str, step: str):
+        """Étape franchie d'une exécution en cours (visible du worker qui la reprendrait)"""
+        self.set_setting(f"run:{name}:{step}", True)
+
+    @serialized
+    def has_step(self, name: str, step: str) -> bool:
+        return bool(self.get_setting(f"run:{name}:{step}", False))
+
+    # --- Journée figée par la dernière bascule ---
+
+    @serialized
+    def remember_rollover(self, channel_id: int, games: Iterable[Tuple[int, str]]):
+        """Remplace les jeux (numéro, cartes) de la journée figée d'un canal, visibles de tous les workers"""
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM rolled_over WHERE channel_id = ?", (channel_id,))
+            self._db.executemany("INSERT OR REPLACE INTO rolled_over (channel_id, game_number, cards) VALUES (?, ?, ?)",
+                                 ((channel_id, number, cards) for number, cards in games))
+            self._db.execute("COMMIT")
+        except BaseException:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            raise
+
+    @serialized
+    def rolled_over_cards(self, channel_id: int, game_number: int) -> Optional[str]:
+        row = self._db.execute("SELECT cards FROM rolled_over WHERE channel_id = ? AND game_number = ?",
+                               (channel_id, game_number)).fetchone()
+        return row[0] if row else None
+
+    # --- Boîte d'envoi ---
+
+    @serialized
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> bool:
+        """Ajoute une notification à envoyer par le leader (ignorée si la clé existe déjà)"""
+        cursor = self._db.execute(
+            "INSERT OR IGNORE INTO outbox (dedupe_key, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+            (dedupe_key, kind, json.dumps(payload, ensure_ascii=False), time.time()))
+        return cursor.rowcount == 1
+
+    @serialized
+    def pending(self, limit: int = 50) -> List[Tuple[int, str, Dict[str, Any]]]:
+        rows = self._db.execute(
+            "SELECT id, kind, payload FROM outbox WHERE sent_at IS NULL ORDER BY id LIMIT ?", (limit,)).fetchall()
+        return [(row_id, kind, json.loads(payload)) for row_id, kind, payload in rows]
+
+    @serialized
+    def mark_sent(self, row_id: int):
+        self._db.execute("UPDATE outbox SET sent_at = ? WHERE id = ?", (time.time(), row_id))
+
+    # --- État partagé ---
+
+    @serialized
+    def get_transfer(self, channel_id: int, message_id: int) -> Optional[int]:
+        row = self._db.execute("SELECT admin_message_id FROM transfers WHERE channel_id = ? AND message_id = ?",
+                               (channel_id, message_id)).fetchone()
+        return row[0] if row else None
+
+    @serialized
+    def set_transfer(self, channel_id: int, message_id: int, admin_message_id: int):
+        self._db.execute("INSERT OR REPLACE INTO transfers (channel_id, message_id, admin_message_id) VALUES (?, ?, ?)",
+                         (channel_id, message_id, admin_message_id))
+
+    @serialized
+    def get_setting(self, key: str, default: Any = None) -> Any:
+        row = self._db.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    @serialized
+    def set_setting(self, key: str, value: Any):
+        self._db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+
+class SharedPreviousDayGames:
+    """
+    Jeux de la journée figée d'un canal, dans la base partagée (même rôle que PreviousDayGames)
+    La bascule est faite par un seul worker; une édition tardive de la veille reçue par un autre
+    worker est reconnue aussi (l'empreinte du texte édité est nouvelle, claim_message ne l'arrête pas)
+    """
+
+    def __init__(self, coordinator: Coordinator, channel_id: int):
+        self.coordinator = coordinator
+        self.channel_id = channel_id
+
+    def remember(self, games: Dict[int, str]):
+        self.coordinator.remember_rollover(self.channel_id, games.items())
+
+    def cards(self, game_number: int) -> Optional[str]:
+        return self.coordinator.rolled_over_cards(self.channel_id, game_number)
@@ -0,0 +1,7 @@
+"""
+Configuration commune des tests: modules du bot importables depuis la racine du dépôt
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
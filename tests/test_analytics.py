@@ -0,0 +1,100 @@
+"""
+Analyses vectorisées comparées à une implémentation Python ligne par ligne
+"""
+import random
+from collections import Counter
+
+import pytest
+
+import analytics
+from analytics import ResultsFrame, mask_to_suits
+
+SUITS = ['♠️', '♥️', '♦️', '♣️']
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+
+
+def make_results(count=400, seed=7):
+    rng = random.Random(seed)
+    results, numero = [], 0
+    for _ in range(count):
+        numero += rng.choice((1, 1, 2, 3))
+        seconds = numero * 60
+        group = ''.join(rng.choice(RANKS) + rng.choice(SUITS) for _ in range(rng.choice((2, 3))))
+        results.append({'numero': numero, 'date': '2026-01-01',
+                        'heure': f"{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:00",
+                        'cartes_groupe1': group, 'cartes_groupe2': '2♥️2♦️',
+                        'gagnant': rng.choice(('Joueur', 'Joueur', 'Banquier', 'Banquier', None))})
+    return results
+
+
+@pytest.fixture(scope='module')
+def results():
+    return make_results()
+
+
+@pytest.fixture(scope='module')
+def frame(results):
+    return ResultsFrame.from_dicts(results)
+
+
+def reference_runs(winners):
+    runs = []
+    for winner in winners:
+        if runs and runs[-1][0] == winner:
+            runs[-1][1] += 1
+        else:
+            runs.append([winner, 1])
+    return runs
+
+
+def test_streaks_match_reference(results, frame):
+    runs = reference_runs([r['gagnant'] for r in results])
+    series = analytics.streaks(frame.winners)
+    for name, winner in (('joueur', 'Joueur'), ('banquier', 'Banquier')):
+        own = [length for value, length in runs if value == winner]
+        assert series[f'plus_longue_{name}'] == max(own)
+        assert series[f'moyenne_{name}'] == pytest.approx(sum(own) / len(own))
+    assert series['serie_en_cours'] == {'gagnant': runs[-1][0], 'longueur': runs[-1][1]}
+
+
+@pytest.mark.parametrize('window', [1, 20, 50, 400])
+def test_rolling_win_rate_matches_reference(results, frame, window):
+    joueur = [r['gagnant'] == 'Joueur' for r in results]
+    expected = [sum(joueur[i - window:i]) / window * 100 for i in range(window, len(joueur) + 1)]
+    assert analytics.rolling_win_rate(frame.winners, window).tolist() == pytest.approx(expected)
+    assert analytics.rolling_win_rate(frame.winners, len(results) + 1).size == 0
+
+
+def test_hourly_breakdown_matches_reference(results, frame):
+    expected = {}
+    for r in results:
+        if r['gagnant']:
+            hour = expected.setdefault(int(r['heure'][:2]), {'joueur': 0, 'banquier': 0})
+            hour[r['gagnant'].lower()] += 1
+    assert analytics.hourly_breakdown(frame.timestamps, frame.winners) == expected
+
+
+def test_suit_combinations_match_reference(results, frame):
+    expected = Counter(''.join(suit for suit in '♠♥♦♣' if suit in r['cartes_groupe1']) for r in results)
+    combinations = analytics.suit_combinations(frame.cards)
+    assert combinations == dict(expected)
+    counts = list(combinations.values())
+    assert counts == sorted(counts, reverse=True)
+    assert mask_to_suits(0b1011) == '♠♥♣'
+
+
+def test_number_gaps_match_reference(results, frame):
+    gaps = [b['numero'] - a['numero'] for a, b in zip(results, results[1:])]
+    report = analytics.number_gaps(frame.numeros)
+    assert report['moyen'] == pytest.approx(sum(gaps) / len(gaps))
+    assert report['max'] == max(gaps)
+    reference = Counter(gaps)
+    assert all(reference[gap] == count for gap, count in report['frequents'].items())
+    assert sorted(report['frequents'].values(), reverse=True) == sorted(reference.values(), reverse=True)[:5]
+    assert analytics.number_gaps(frame.numeros[:1]) == {'moyen': 0.0, 'max': 0, 'frequents': {}}
+
+
+def test_empty_summary():
+    report = analytics.summary(ResultsFrame.from_dicts([]))
+    assert report['total'] == 0 and report['series']['serie_en_cours'] == {'gagnant': None, 'longueur': 0}
+    assert report['taux_glissants'][20]['taux_joueur_actuel'] is None
@@ -0,0 +1,86 @@
+"""
+Backtest vectorisé comparé à une simulation partie par partie, sur place et en pool de threads
+"""
+import random
+
+import pytest
+
+import backtest
+from analytics import BANQUIER, JOUEUR, ResultsFrame
+from history_archive import suits_to_mask
+
+SUITS = ['♠️', '♥️', '♦️', '♣️']
+
+
+@pytest.fixture(scope='module')
+def results():
+    rng = random.Random(5)
+    return [{'numero': n, 'date': '2026-01-01', 'heure': '12:00:00',
+             'cartes_groupe1': ''.join('K' + rng.choice(SUITS) for _ in range(rng.choice((2, 3)))),
+             'cartes_groupe2': '2♥️', 'gagnant': rng.choice(('Joueur', 'Banquier', 'Joueur', 'Banquier', None))}
+            for n in range(1, 601)]
+
+
+def reference(results, strategy):
+    """Simulation en boucle: le pari de chaque partie est décidé avec les parties précédentes"""
+    kind, param, target = strategy
+    codes = {'Joueur': JOUEUR, 'Banquier': BANQUIER}
+    paris = gagnes = gain = peak = drawdown = losing = longest = 0
+    length, previous, signal = 0, None, 0
+    for result in results:
+        winner = codes.get(result['gagnant'], 0)
+        if signal and winner:
+            paris += 1
+            if signal == winner:
+                gagnes, gain, losing = gagnes + 1, gain + 1, 0
+            else:
+                gain, losing = gain - 1, losing + 1
+            peak = max(peak, gain)
+            drawdown = max(drawdown, peak - gain)
+            longest = max(longest, losing)
+        length = length + 1 if winner == previous else 1
+        previous = winner
+        if kind == backtest.SUIT_PATTERN:
+            signal = target if suits_to_mask(result['cartes_groupe1']) == param else 0
+        elif length >= param and winner:
+            signal = winner if kind == backtest.FOLLOW_STREAK else 3 - winner
+        else:
+            signal = 0
+    return {'paris': paris, 'taux_reussite': gagnes / paris * 100 if paris else 0.0, 'gain': gain,
+            'drawdown_max': drawdown, 'plus_longue_perte': longest}
+
+
+def test_sweep_matches_reference(results):
+    strategies = backtest.default_grid(max_streak=6)
+    rows = backtest.sweep(ResultsFrame.from_dicts(results), strategies, workers=1)
+    assert len(rows) == len(strategies)
+    for row, strategy in zip(rows, strategies):
+        expected = reference(results, strategy)
+        assert {key: row[key] for key in expected} == pytest.approx(expected), backtest.describe(strategy)
+
+
+def test_thread_pool_batches_match_local_run(results, monkeypatch):
+    frame = ResultsFrame.from_dicts(results)
+    local = backtest.sweep(frame, workers=1)
+    monkeypatch.setattr(backtest, 'BATCH_CELLS', len(results) * 3)
+    assert backtest.sweep(frame, workers=4) == local
+
+
+def test_summary_ranks_eligible_strategies(results):
+    report = backtest.summary(ResultsFrame.from_dicts(results), min_bets=50, top=3)
+    rates = [row['taux_reussite'] for row in report['meilleures']]
+    assert rates == sorted(rates, reverse=True) and len(rates) == 3
+    assert all(row['paris'] >= 50 for row in report['meilleures'] + report['pires'])
+    assert report['parties'] == len(results) and report['strategies'] == len(report['resultats'])
+
+
+def test_parse_strategy():
+    assert backtest.parse_strategy('suivre_serie:3') == (backtest.FOLLOW_STREAK, 3, 0)
+    assert backtest.parse_strategy('couleurs_groupe1:♠♥:Banquier') == (backtest.SUIT_PATTERN, 3, BANQUIER)
+    for text in ('alterner_apres:0', 'couleurs_groupe1:x:Joueur', 'inconnu:1'):
+        with pytest.raises(ValueError):
+            backtest.parse_strategy(text)
+
+
+def test_empty_history():
+    assert all(row['paris'] == 0 for row in backtest.sweep(ResultsFrame.from_dicts([]), workers=1))
@@ -0,0 +1,79 @@
+"""
+Canaux multiples: stockage séparé par canal, files de traitement indépendantes et écouteurs communs
+"""
+import asyncio
+
+from channel_stores import ChannelRegistry
+
+FINAL = "#N{n}. ✅2(K♠️5♣️7♥️) - 1(2♣️2♥️) #T3"
+
+
+def test_each_channel_has_its_own_store(tmp_path):
+    registry = ChannelRegistry(base_dir=str(tmp_path))
+    seen = []
+    registry.add_listener(lambda channel_id, result: seen.append((channel_id, result['numero'])))
+    legacy, other = registry.add(-1001, 'A'), registry.add(-1002)
+
+    assert legacy.data_dir == tmp_path and other.data_dir == tmp_path / "channels" / "1002"
+    assert (legacy.file_suffix, other.file_suffix) == ('', '_1002')
+    assert other.title == "Canal -1002" and registry.add(-1002, 'B') is other and other.title == 'B'
+    assert registry.primary is legacy and registry.ids() == [-1001, -1002]
+
+    assert legacy.results.process_message(FINAL.format(n=10))[0]
+    assert other.results.process_message(FINAL.format(n=20))[0]
+    assert [r['numero'] for r in legacy.results.get_all_results()] == [10]
+    assert [r['numero'] for r in other.results.get_all_results()] == [20]
+    assert seen == [(-1001, 10), (-1002, 20)]
+
+
+def test_busy_channel_does_not_delay_the_others(tmp_path):
+    async def scenario():
+        registry = ChannelRegistry(base_dir=str(tmp_path))
+        busy, quiet = registry.add(-1001), registry.add(-1002)
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(store, message_id, text, edited):
+            if store is busy:
+                await release.wait()
+            handled.append((store.channel_id, message_id))
+
+        registry.start(handler)
+        for message_id in (1, 2, 3):
+            await busy.submit(message_id, "", False)
+        await quiet.submit(1, "", False)
+        await asyncio.wait_for(quiet.queue.join(), 1)
+        quiet_first = list(handled)
+
+        release.set()
+        await asyncio.wait_for(busy.queue.join(), 1)
+        for store_id in registry.ids():
+            await registry.remove(store_id)
+        return quiet_first, handled, len(registry)
+
+    quiet_first, handled, remaining = asyncio.run(scenario())
+    assert quiet_first == [(-1002, 1)]
+    # Ordre d'arrivée conservé dans chaque canal
+    assert [m for channel, m in handled if channel == -1001] == [1, 2, 3]
+    assert remaining == 0
+
+
+def test_handler_error_does_not_stop_the_channel(tmp_path):
+    async def scenario():
+        registry = ChannelRegistry(base_dir=str(tmp_path))
+        store = registry.add(-1001)
+        handled = []
+
+        async def handler(store, message_id, text, edited):
+            if message_id == 1:
+                raise ValueError("message illisible")
+            handled.append(message_id)
+
+        registry.start(handler)
+        await store.submit(1, "", False)
+        await store.submit(2, "", True)
+        await asyncio.wait_for(store.queue.join(), 1)
+        await registry.remove(-1001)
+        return handled
+
+    assert asyncio.run(scenario()) == [2]
@@ -0,0 +1,52 @@
+"""
+Encodage compact des résultats: aller-retour avec le format YAML et le format binaire fixe
+"""
+import pytest
+
+from compact_results import (CompactResult, CompactResultArray, RECORD_STRUCT, decode_card, decode_group,
+                             encode_card, encode_group)
+
+RESULTS = [
+    {'numero': 1, 'date': '2026-01-01', 'heure': '00:59:00', 'cartes_groupe1': 'K♠️5♣️7♥️',
+     'cartes_groupe2': '10♦️2♥️', 'gagnant': 'Joueur'},
+    {'numero': 2, 'date': '2026-01-01', 'heure': '01:00:30', 'cartes_groupe1': 'A♦️J♠️Q♣️',
+     'cartes_groupe2': '3♠️', 'gagnant': 'Banquier'},
+    {'numero': 1440, 'date': '2026-12-31', 'heure': '23:59:59', 'cartes_groupe1': '9♥️8♥️4♦️',
+     'cartes_groupe2': '6♣️6♠️2♦️', 'gagnant': None},
+]
+
+
+@pytest.mark.parametrize('rank', ['A', '2', '9', '10', 'J', 'Q', 'K'])
+@pytest.mark.parametrize('suit', ['♠', '♥', '♦', '♣'])
+def test_card_round_trip(rank, suit):
+    code = encode_card(rank, suit)
+    assert 0 < code < 256
+    assert decode_card(code) == f"{rank}{suit}️"
+
+
+def test_group_is_padded_and_accepts_plain_heart():
+    assert encode_group('K♠️5❤') == encode_group('K♠️5♥️')
+    assert encode_group('K♠️')[1:] == bytes(2)
+    assert decode_group(encode_group('')) == ''
+
+
+def test_dict_round_trip():
+    assert [CompactResult.from_dict(result).to_dict() for result in RESULTS] == RESULTS
+
+
+def test_second_group_from_legacy_full_message():
+    legacy = {'numero': 7, 'date': '2026-01-01', 'heure': '12:00:00', 'cartes_groupe1': 'K♠️5♣️7♥️',
+              'message_complet': "#N7. ✅2(K♠️5♣️7♥️) - 1(2♣️2♥️) #T3", 'gagnant': 'Joueur'}
+    assert CompactResult.from_dict(legacy).to_dict()['cartes_groupe2'] == '2♣️2♥️'
+
+
+def test_array_round_trip_through_bytes():
+    compact = CompactResultArray.from_dicts(RESULTS)
+    data = compact.to_bytes()
+    assert len(data) == len(RESULTS) * RECORD_STRUCT.size
+    restored = CompactResultArray.from_bytes(data)
+    assert list(restored) == list(compact)
+    assert restored.to_dicts() == RESULTS
+    assert compact.memory_bytes() == len(data)
+    assert compact.find(1440).to_dict() == RESULTS[2] and compact.find(3) is None
+    assert compact[-1] == compact[2]
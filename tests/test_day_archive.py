@@ -0,0 +1,69 @@
+"""
+Archives quotidiennes compressées: journal figé à la bascule, lecture en flux et rétention
+"""
+import asyncio
+from datetime import date
+
+import pytest
+
+from day_archive import DayArchive, RetentionPolicy
+
+RESULTS = [{'numero': n, 'date': '2026-01-01', 'heure': '12:00:00', 'gagnant': 'Joueur'} for n in (4, 9, 7)]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return DayArchive(tmp_path, channel_id=-1001)
+
+
+def test_write_and_stream_back_a_day(archive):
+    archive.journal.append(1, "#N4. ⏲️", False)
+    archive.journal.append(1, "#N4. ✅", True)
+    archive.journal.rotate('2026-01-01')
+    # Message arrivé après la bascule: journal de la journée suivante
+    archive.journal.append(2, "#N1. ⏲️", False)
+    asyncio.run(archive.journal.flush())
+
+    path = archive.write_day('2026-01-01', RESULTS)
+    header = archive.read_header('2026-01-01')
+    assert (header['results'], header['messages'], header['first_game'], header['last_game']) == (3, 2, 4, 9)
+    assert header['channel_id'] == -1001
+    assert list(archive.iter_results('2026-01-01')) == RESULTS
+    assert [(m['id'], m['edited'], m['text']) for m in archive.iter_messages('2026-01-01')] == \
+        [(1, False, "#N4. ⏲️"), (1, True, "#N4. ✅")]
+    assert not archive.journal.frozen_path('2026-01-01').exists()
+    assert archive.journal.path.read_text(encoding='utf-8').count('\n') == 1
+
+    # Relancée après coup, l'écriture ne duplique rien
+    assert archive.write_day('2026-01-01', RESULTS + RESULTS) == path
+    assert len(list(archive.iter_results('2026-01-01'))) == 3
+    assert archive.days() == ['2026-01-01']
+
+
+def test_rotate_twice_appends_to_the_frozen_journal(archive):
+    archive.journal.append(1, "a", False)
+    archive.journal.rotate('2026-01-01')
+    archive.journal.append(2, "b", False)
+    archive.journal.rotate('2026-01-01')
+    archive.write_day('2026-01-01', [])
+    assert [m['text'] for m in archive.iter_messages('2026-01-01')] == ["a", "b"]
+
+
+def test_retention_by_age_then_by_size(archive):
+    for day in ('2026-01-01', '2026-01-05', '2026-01-09', '2026-01-10'):
+        archive.write_day(day, RESULTS)
+    # Date limite conservée: 2026-01-05
+    removed = archive.apply_retention(RetentionPolicy(archive_days=7), today=date(2026, 1, 12))
+    assert removed == ['2026-01-01'] and archive.days() == ['2026-01-05', '2026-01-09', '2026-01-10']
+
+    size = archive.path_for('2026-01-10').stat().st_size
+    policy = RetentionPolicy(archive_days=None, max_archive_mb=size * 1.5 / (1024 * 1024))
+    assert archive.apply_retention(policy) == ['2026-01-05', '2026-01-09']
+    assert archive.days() == ['2026-01-10']
+
+
+def test_retention_cutoff_and_description():
+    policy = RetentionPolicy(archive_days=90, max_archive_mb=50, prediction_days=None)
+    assert policy.cutoff(90, date(2026, 4, 1)) == '2026-01-01'
+    assert policy.cutoff(None) is None
+    assert policy.describe() == "archives: 90 jours, 50 Mo max, prédictions: illimitée"
@@ -0,0 +1,66 @@
+"""
+Arguments de /fichier (main.parse_export_args), main étant importé avec le client Telegram factice
+"""
+import importlib
+import os
+import sys
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def main(tmp_path_factory):
+    """Import de main dans un répertoire temporaire (fichiers de données relatifs au répertoire courant)"""
+    if 'main' in sys.modules:
+        return sys.modules['main']
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('bot'))
+    try:
+        with pytest.MonkeyPatch.context() as patch:
+            for key, value in {'API_ID': '1', 'API_HASH': 'x', 'BOT_TOKEN': '0:x', 'ADMIN_ID': '4242',
+                               'LOG_LEVEL': 'WARNING'}.items():
+                patch.setenv(key, value)
+            patch.delenv('SHARED_DB', raising=False)
+            import fake_telegram
+            fake_telegram.install()
+            return importlib.import_module('main')
+    finally:
+        os.chdir(previous)
+
+
+def test_empty_arguments(main):
+    filters, last, channel = main.parse_export_args('')
+    assert filters == {'min_numero': None, 'max_numero': None, 'since': None, 'until': None, 'winner': None}
+    assert last is None and channel is None
+
+
+def test_all_arguments(main):
+    filters, last, channel = main.parse_export_args(
+        'date:2026-01-01..2026-01-31T12:00 num:200..350 derniers:20 gagnant:Banquier -1001234')
+    assert filters == {'min_numero': 200, 'max_numero': 350, 'since': '2026-01-01',
+                       'until': '2026-01-31T12:00', 'winner': 'Banquier'}
+    assert last == 20 and channel == '-1001234'
+
+
+def test_open_ranges(main):
+    filters, _, _ = main.parse_export_args('num:..350 date:2026-01-05..')
+    assert (filters['min_numero'], filters['max_numero']) == (None, 350)
+    assert (filters['since'], filters['until']) == ('2026-01-05', None)
+
+
+@pytest.mark.parametrize('text', [
+    'num:x..3', 'num:-5', 'date:hier', 'date:2026-13', 'derniers:0', 'derniers:abc',
+    'gagnant:egalite', 'inconnu', 'date:', 'date:2026-13-45', 'date:2026-02-30..', 'date:..2026-01-01T25:00',
+])
+def test_invalid_arguments_raise_value_error(main, text):
+    with pytest.raises(ValueError):
+        main.parse_export_args(text)
+
+
+def test_filters_feed_results_index(main):
+    from results_index import ResultsIndex
+    rows = [{'numero': n, 'date': '2026-01-01', 'heure': f"{n:02d}:00:00",
+             'gagnant': 'Joueur' if n % 2 else 'Banquier'} for n in range(1, 11)]
+    filters, last, _ = main.parse_export_args('num:3..9 gagnant:joueur derniers:2')
+    assert [row['numero'] for row in ResultsIndex(rows).tail(last, **filters)] == [7, 9]
+    assert main.describe_export_filters(filters, last) == "jeux #3 → #9, gagnant Joueur, 2 derniers"
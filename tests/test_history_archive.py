@@ -0,0 +1,58 @@
+"""
+Archive en colonnes: sélection des lignes par journées, y compris une journée archivée en retard
+"""
+import numpy as np
+import pytest
+
+from history_archive import HistoryArchive
+
+
+def day_results(day, first, count):
+    return [{'numero': n, 'date': day, 'heure': f"{n % 24:02d}:00:00",
+             'cartes_groupe1': 'K♠️5♣️', 'cartes_groupe2': '2♥️2♦️',
+             'gagnant': 'Joueur' if n % 2 else 'Banquier'} for n in range(first, first + count)]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return HistoryArchive(str(tmp_path / "archive"))
+
+
+def numbers(archive, since=None, until=None):
+    return [int(n) for n in archive.load_columns(since, until)['numeros']]
+
+
+def test_contiguous_days_are_a_slice(archive):
+    archive.append_day('2026-01-01', day_results('2026-01-01', 1, 3))
+    archive.append_day('2026-01-02', day_results('2026-01-02', 10, 2))
+    archive.append_day('2026-01-03', day_results('2026-01-03', 20, 2))
+    assert archive.row_range('2026-01-02', '2026-01-03') == slice(3, 7)
+    assert archive.row_range(until='2026-01-01') == slice(0, 3)
+    assert archive.row_range('2026-02-01') == slice(0, 0)
+    assert numbers(archive, since='2026-01-02') == [10, 11, 20, 21]
+
+
+def test_late_archived_day_is_not_mixed_into_the_range(archive):
+    archive.append_day('2026-01-01', day_results('2026-01-01', 1, 2))
+    archive.append_day('2026-01-03', day_results('2026-01-03', 20, 2))
+    archive.append_day('2026-01-04', day_results('2026-01-04', 30, 2))
+    # Journée 02 archivée après la 04: ses lignes sont en fin de colonnes
+    archive.append_day('2026-01-02', day_results('2026-01-02', 10, 2))
+
+    assert numbers(archive, '2026-01-01', '2026-01-03') == [1, 2, 10, 11, 20, 21]
+    assert numbers(archive, '2026-01-03', '2026-01-04') == [20, 21, 30, 31]
+    assert numbers(archive, '2026-01-02', '2026-01-02') == [10, 11]
+    assert numbers(archive) == [1, 2, 10, 11, 20, 21, 30, 31]
+    rows = archive.row_range('2026-01-01', '2026-01-03')
+    assert isinstance(rows, np.ndarray)
+    assert len(archive.find_suit_pattern('♠♣', since='2026-01-01', until='2026-01-03')) == 6
+    assert archive.winner_rate(days=100000)['total'] == 8
+
+
+def test_reopened_archive_keeps_the_day_offsets(archive, tmp_path):
+    archive.append_day('2026-01-03', day_results('2026-01-03', 20, 2))
+    archive.append_day('2026-01-02', day_results('2026-01-02', 10, 1))
+    assert archive.append_day('2026-01-02', day_results('2026-01-02', 10, 1)) == 0
+    reopened = HistoryArchive(str(tmp_path / "archive"))
+    assert numbers(reopened) == [10, 20, 21]
+    assert [r['numero'] for r in reopened.load_day('2026-01-03')] == [20, 21]
@@ -0,0 +1,52 @@
+"""
+Fenêtres glissantes: expiration des plus anciens gagnants et restauration de l'état
+"""
+import asyncio
+import random
+
+from compact_results import WINNER_CODES
+from live_stats import LiveStats, RingWindow
+
+JOUEUR, BANQUIER = WINNER_CODES['Joueur'], WINNER_CODES['Banquier']
+
+
+def test_ring_window_expires_oldest():
+    window = RingWindow(3)
+    for code in (JOUEUR, JOUEUR, BANQUIER):
+        window.push(code)
+    assert (window.count, window.joueur, window.banquier) == (3, 2, 1)
+    window.push(0)
+    assert (window.count, window.joueur, window.banquier) == (3, 1, 1)
+    window.push(BANQUIER)
+    window.push(BANQUIER)
+    stats = window.stats()
+    assert (stats['total'], stats['joueur_victoires'], stats['banquier_victoires']) == (3, 0, 2)
+    assert stats['taux_banquier'] == 2 / 3 * 100
+
+
+def test_windows_match_last_n_results():
+    rng = random.Random(3)
+    codes = [rng.choice((0, JOUEUR, BANQUIER)) for _ in range(250)]
+    live = LiveStats(windows=(20, 100), state_file='/nonexistent/live_stats.yaml')
+    for index, code in enumerate(codes, 1):
+        live._push(code)
+        for size in (20, 100):
+            recent = codes[max(0, index - size):index]
+            stats = live.window(size)
+            assert stats['total'] == len(recent)
+            assert stats['joueur_victoires'] == recent.count(JOUEUR)
+            assert stats['banquier_victoires'] == recent.count(BANQUIER)
+    assert live.recent_codes() == codes[-100:]
+    assert live.window(50) is None
+
+
+def test_state_is_restored_after_flush(tmp_path):
+    state_file = str(tmp_path / "live_stats.yaml")
+    live = LiveStats(windows=(2, 4), state_file=state_file)
+    for winner in ('Joueur', 'Banquier', 'Joueur', 'Joueur', 'Banquier'):
+        live.record({'gagnant': winner})
+    asyncio.run(live.flush())
+
+    restored = LiveStats(windows=(2, 4), state_file=state_file)
+    assert restored.recent_codes() == [BANQUIER, JOUEUR, JOUEUR, BANQUIER]
+    assert restored.snapshot() == live.snapshot()
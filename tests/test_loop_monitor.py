@@ -0,0 +1,43 @@
+"""
+Surveillance de la boucle: retard mesuré, pile du code bloquant capturée et santé dégradée
+"""
+import asyncio
+import time
+
+from loop_monitor import LoopLagMonitor
+
+
+def block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_blocking_call_is_recorded_with_its_stack():
+    async def scenario():
+        monitor = LoopLagMonitor(interval=0.05, threshold=0.15)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.2)
+            healthy_before = monitor.is_healthy()
+            block_the_loop(0.5)
+            await asyncio.sleep(0.1)
+            return healthy_before, monitor.report()
+        finally:
+            monitor.stop()
+
+    healthy_before, report = asyncio.run(scenario())
+    assert healthy_before
+    assert report['lag_ms']['max'] >= 300
+    worst = report['worst'][0]
+    assert worst['lag_ms'] >= 300
+    assert 'block_the_loop' in worst['stack']
+
+
+def test_percentiles_and_health_from_samples():
+    monitor = LoopLagMonitor(threshold=0.5)
+    for lag in [0.001] * 90 + [0.6] * 10:
+        monitor._record(lag)
+    assert monitor.percentile(0.5) == 0.001
+    assert monitor.percentile(0.99) == 0.6
+    assert not monitor.is_healthy()
+    assert len(monitor.worst) == monitor.worst_count
+    assert monitor.blocked_for() == 0.0
@@ -0,0 +1,32 @@
+"""
+Formats de messages: détection par vote, repli sur les autres formats et nouvelle détection
+"""
+from message_formats import FORMATS, FormatDetector
+
+
+def test_detector_votes_then_uses_single_format():
+    detector = FormatDetector(sample_size=2)
+    assert detector.parse("#N10. ✅(K♠️5♣️7♥️) - (2♣️2♥️)") == (10, ['K♠️5♣️7♥️', '2♣️2♥️'])
+    assert detector.name is None
+    detector.parse("#N11. ✅(K♠️5♣️7♥️) - (2♣️2♥️)")
+    assert detector.name == 'hash_n'
+    # Message d'un autre format: repli, le format retenu ne change pas
+    assert detector.parse("Jeu #12 (A♠️K♥️2♦️) - (3♣️4♣️)") == (12, ['A♠️K♥️2♦️', '3♣️4♣️'])
+    assert detector.name == 'hash_n'
+
+
+def test_detector_redetects_when_confidence_drops():
+    detector = FormatDetector(sample_size=1, window=4, min_confidence=0.5)
+    detector.parse("#N1. (K♠️5♣️7♥️) - (2♣️2♥️)")
+    assert detector.current is FORMATS['hash_n']
+    for n in range(2, 6):
+        detector.parse(f"Jeu #{n} (A♠️K♥️2♦️) - (3♣️4♣️)")
+    assert detector.current is None
+    detector.parse("Jeu #6 (A♠️K♥️2♦️) - (3♣️4♣️)")
+    assert detector.name == 'jeu'
+
+
+def test_detector_returns_number_of_incomplete_message():
+    detector = FormatDetector()
+    assert detector.parse("#N42. ⏰") == (42, [])
+    assert detector.parse("rien") == (None, [])
@@ -0,0 +1,28 @@
+"""
+Cache d'analyse des messages (LRU par empreinte du texte)
+"""
+from game_results_manager import GameResultsManager
+from record_rules import RuleSet
+
+
+def test_parse_cache_hits_and_rules_change_clears_it(tmp_path):
+    manager = GameResultsManager(data_dir=str(tmp_path))
+    message = "#N5. ⏰ (K♠️5♣️7♥️) - (2♣️2♥️)"
+    first = manager.parse_message(message)
+    assert manager.parse_message(message) is first
+    assert manager.get_parse_cache_stats()['size'] == 1
+    manager.set_rules(RuleSet.default())
+    assert manager.get_parse_cache_stats()['size'] == 0
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path):
+    manager = GameResultsManager(data_dir=str(tmp_path), parse_cache_size=2)
+    first, second, third = (f"#N{n}. ⏰ (K♠️5♣️7♥️) - (2♣️2♥️)" for n in (1, 2, 3))
+    manager.parse_message(first)
+    manager.parse_message(second)
+    manager.parse_message(first)
+    manager.parse_message(third)
+    stats = manager.get_parse_cache_stats()
+    assert stats['size'] == 2 and stats['hits'] == 1
+    manager.parse_message(first)
+    assert manager.get_parse_cache_stats()['hits'] == 2
@@ -0,0 +1,116 @@
+"""
+Prédictions: identifiants par journée de jeu (les numéros repartent de zéro chaque jour),
+vérifications limitées aux prédictions en attente et rotation vers l'historique
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+import yaml
+
+import predictions
+from predictions import PredictionEngine
+from yaml_manager import GAME_DAY_TZ, YAMLDataManager, game_day
+
+CHAT = -100123
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Le gestionnaire écrit dans data/ relatif au répertoire courant
+    monkeypatch.chdir(tmp_path)
+    return YAMLDataManager()
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def new_prediction(store, day, game_number, prediction):
+    return {'id': store.prediction_id(day, CHAT, game_number), 'day': day, 'chat_id': CHAT,
+            'game_number': game_number, 'prediction': prediction, 'confidence': 0.6,
+            'created_at': f"{day}T12:00:00"}
+
+
+def test_game_day_starts_at_00h59_benin():
+    assert game_day(datetime(2026, 1, 2, 0, 58, tzinfo=GAME_DAY_TZ)) == '2026-01-01'
+    assert game_day(datetime(2026, 1, 2, 0, 59, tzinfo=GAME_DAY_TZ)) == '2026-01-02'
+
+
+def test_same_game_number_on_the_next_day_does_not_touch_verified_prediction(store):
+    yesterday = new_prediction(store, '2026-01-01', 5, 'Joueur')
+    store.apply_prediction_updates([yesterday], [{'id': yesterday['id'], 'game_number': 5, 'chat_id': CHAT,
+                                                  'status': '✅0️⃣', 'verified_by': 5}])
+    # Rotation d'avant la fin de la journée: rien n'est déplacé
+    assert store.rotate_predictions('2025-12-31') == 0
+
+    today = new_prediction(store, '2026-01-02', 5, 'Banquier')
+    store.apply_prediction_updates([today], [])
+    store.apply_prediction_updates([], [{'id': today['id'], 'game_number': 5, 'chat_id': CHAT,
+                                         'status': '❌', 'verified_by': 7}])
+
+    by_id = {p['id']: p for p in load(store.predictions_file)}
+    assert by_id[yesterday['id']]['status'] == '✅0️⃣'
+    assert by_id[today['id']]['suit_combination'] == 'Banquier'
+    assert by_id[today['id']]['status'] == '❌'
+    schedule = load(store.auto_predictions_file)
+    assert schedule['2026-01-01'][f"{CHAT}:5"]['status'] == '✅0️⃣'
+    assert schedule['2026-01-02'][f"{CHAT}:5"]['status'] == '❌'
+
+
+def test_update_without_id_only_targets_pending_prediction(store):
+    verified = new_prediction(store, '2026-01-01', 5, 'Joueur')
+    store.apply_prediction_updates([verified], [{'id': verified['id'], 'game_number': 5, 'chat_id': CHAT,
+                                                 'status': '✅1️⃣', 'verified_by': 6}])
+    legacy = {'game_number': 5, 'chat_id': CHAT, 'status': '❌', 'verified_by': 7}
+    store.apply_prediction_updates([], [legacy])
+    assert load(store.predictions_file)[0]['status'] == '✅1️⃣'
+
+    pending = new_prediction(store, '2026-01-02', 5, 'Banquier')
+    store.apply_prediction_updates([pending], [legacy])
+    statuses = {p['id']: p['status'] for p in load(store.predictions_file)}
+    assert statuses == {verified['id']: '✅1️⃣', pending['id']: '❌'}
+
+
+def test_rotation_moves_the_ended_game_day_only(store):
+    ended = new_prediction(store, '2026-01-01', 5, 'Joueur')
+    current = new_prediction(store, '2026-01-02', 3, 'Banquier')
+    waiting = new_prediction(store, '2026-01-01', 9, 'Banquier')
+    store.apply_prediction_updates([ended, current, waiting], [
+        {'id': ended['id'], 'game_number': 5, 'chat_id': CHAT, 'status': '❌', 'verified_by': 7},
+        {'id': current['id'], 'game_number': 3, 'chat_id': CHAT, 'status': '✅0️⃣', 'verified_by': 3}])
+
+    assert store.rotate_predictions('2026-01-01') == 1
+    assert [p['id'] for p in load(store.predictions_file)] == [current['id'], waiting['id']]
+    assert [p['id'] for p in load(store.predictions_history_dir / "2026-01-01.yaml")] == [ended['id']]
+    # Relancée, la rotation n'ajoute pas de doublon
+    assert store.rotate_predictions('2026-01-01') == 0
+
+
+def test_engine_updates_carry_the_game_day_id(store, tmp_path, monkeypatch):
+    engine = PredictionEngine(store, state_file=str(tmp_path / "state.yaml"), offset=1, tolerance=0)
+    monkeypatch.setattr(predictions, 'game_day', lambda: '2026-01-01')
+    engine.record(CHAT, {'numero': 4, 'gagnant': 'Joueur'})
+    engine.record(CHAT, {'numero': 5, 'gagnant': 'Joueur'})
+    # Nouvelle journée: la numérotation repart, la prédiction du jeu 6 expire
+    monkeypatch.setattr(predictions, 'game_day', lambda: '2026-01-02')
+    engine.record(CHAT, {'numero': 4, 'gagnant': 'Banquier'})
+    engine.record(CHAT, {'numero': 5, 'gagnant': 'Banquier'})
+    assert asyncio.run(engine.flush())
+
+    statuses = {p['id']: p['status'] for p in load(store.predictions_file)}
+    assert statuses[f"2026-01-01:{CHAT}:5"] == '✅0️⃣'
+    assert statuses[f"2026-01-01:{CHAT}:6"] == '⏹️'
+    assert statuses[f"2026-01-02:{CHAT}:5"] in ('✅0️⃣', '❌')
+    assert statuses[f"2026-01-02:{CHAT}:6"] == '⌛'
+
+
+def test_history_pruning_keeps_days_from_cutoff(store):
+    for day, number in (('2026-01-01', 5), ('2026-01-02', 6)):
+        prediction = new_prediction(store, day, number, 'Joueur')
+        store.apply_prediction_updates([prediction], [{'id': prediction['id'], 'game_number': number,
+                                                       'chat_id': CHAT, 'status': '❌', 'verified_by': number}])
+    store.rotate_predictions('2026-01-02')
+    assert store.prune_prediction_history('2026-01-02') == 1
+    assert [path.stem for path in store.predictions_history_dir.glob("*.yaml")] == ['2026-01-02']
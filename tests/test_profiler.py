@@ -0,0 +1,38 @@
+"""
+Profilage à la demande: rapport des fonctions actives pendant la session, une session à la fois
+"""
+import asyncio
+
+import pytest
+
+from profiler import ProfileSession
+
+
+def busy_handler():
+    return sum(i * i for i in range(20000))
+
+
+def test_report_lists_functions_run_during_the_session():
+    session = ProfileSession()
+
+    async def scenario():
+        async def work():
+            while True:
+                busy_handler()
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(work())
+        try:
+            profile = asyncio.create_task(session.run(0.5, top=40))
+            await asyncio.sleep(0.05)
+            with pytest.raises(RuntimeError):
+                await session.run(1)
+            return await profile
+        finally:
+            task.cancel()
+
+    report = asyncio.run(scenario())
+    assert report.startswith("🔬 **Profilage sur 1s**")
+    assert 'busy_handler' in report
+    assert "**Allocations" in report
+    assert not session.active
@@ -0,0 +1,69 @@
+"""
+Règles d'enregistrement: compilation du YAML, marqueurs, gagnant et contraintes de séquence
+"""
+import pytest
+import yaml
+
+from game_results_manager import GameResultsManager
+from record_rules import DEFAULT_RULES, RuleSet, load_rules, suit_counts
+
+FINAL = "#N{n}. ✅2({first}) - 1({second}) #T3"
+
+
+def test_suit_counts_ignores_variation_selectors():
+    assert suit_counts("K♠️5♣️7♥️") == suit_counts("K♠5♣7♥") == (1, 1, 0, 1)
+
+
+def test_default_rules_markers_and_winner():
+    rules = RuleSet.default()
+    assert rules.marker_reject("#N1. ⏰ ✅") == "Message en cours d'édition (symbole ⏰)"
+    assert rules.marker_reject("#N1. (A♠️)") == "Message non finalisé (pas de symbole ✅)"
+    assert rules.marker_reject("#N1. ✅") is None
+    distinct, pair = suit_counts("K♠️5♣️7♥️"), suit_counts("2♣️2♥️")
+    assert rules.winner([distinct, pair]) == ('Joueur', None)
+    assert rules.winner([pair, distinct]) == ('Banquier', None)
+    assert rules.winner([distinct, distinct]) == (None, rules.several_match_reason)
+    assert rules.winner([pair, pair]) == (None, rules.no_match_reason)
+
+
+def test_several_match_first_and_card_list():
+    source = dict(DEFAULT_RULES, several_match='first',
+                  groups=[{'winner': 'Joueur', 'cards': [2, 3], 'suits': 'same'},
+                          {'winner': 'Banquier', 'cards': 3, 'suits': 'distinct'}])
+    rules = RuleSet(source)
+    assert rules.winner([suit_counts("2♣️3♣️"), suit_counts("K♠️5♣️7♥️")]) == ('Joueur', None)
+    assert rules.winner([suit_counts("2♣️3♣️4♣️5♣️"), suit_counts("K♠️5♣️7♥️")]) == ('Banquier', None)
+
+
+@pytest.mark.parametrize('source', [
+    dict(DEFAULT_RULES, groups=[]),
+    dict(DEFAULT_RULES, groups=[{'cards': 3}]),
+    dict(DEFAULT_RULES, several_match='both'),
+])
+def test_invalid_rules_raise_value_error(source):
+    with pytest.raises(ValueError):
+        RuleSet(source)
+
+
+def test_load_rules_file(tmp_path):
+    assert load_rules(str(tmp_path / "absent.yaml")).origin == 'défaut'
+    path = tmp_path / "rules.yaml"
+    path.write_text(yaml.safe_dump({'groups': [{'winner': 'Joueur', 'cards': 3, 'suits': 'distinct'}],
+                                    'sequence': {'skip_after_recorded': 0}}), encoding='utf-8')
+    rules = load_rules(str(path))
+    assert rules.skip_after_recorded == 0 and rules.required_groups == 2
+    path.write_text("groups: [", encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_rules(str(path))
+
+
+def test_process_message_applies_rules_and_sequence(tmp_path):
+    manager = GameResultsManager(data_dir=str(tmp_path))
+    assert manager.process_message(FINAL.format(n=10, first="K♠️5♣️7♥️", second="2♣️2♥️"))[0]
+    assert manager.get_index().get(10)['gagnant'] == 'Joueur'
+    success, reason = manager.process_message(FINAL.format(n=10, first="K♠️5♣️7♥️", second="2♣️2♥️"))
+    assert not success and reason == "Jeu #10 déjà enregistré"
+    success, reason = manager.process_message(FINAL.format(n=11, first="2♣️2♥️", second="K♠️5♣️7♥️"))
+    assert not success and reason.startswith("Numéro consécutif ignoré")
+    assert manager.process_message(FINAL.format(n=12, first="2♣️2♥️", second="K♠️5♣️7♥️"))[0]
+    assert manager.get_index().get(12)['gagnant'] == 'Banquier'
@@ -0,0 +1,65 @@
+"""
+Import en flux: export Excel relu, CSV, dédoublonnage contre le stock et à l'intérieur du fichier
+"""
+import pytest
+
+from game_results_manager import GameResultsManager
+from results_import import parse_datetime
+
+FINAL = "#N{n}. ✅2(K♠️5♣️7♥️) - 1(2♣️2♥️) #T3"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return GameResultsManager(data_dir=str(tmp_path / "data"))
+
+
+def write_csv(path, lines):
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_excel_export_round_trip(manager, tmp_path):
+    for n in (10, 12, 14):
+        assert manager.process_message(FINAL.format(n=n))[0]
+    exported = manager.export_to_txt(str(tmp_path / "resultats.xlsx"))
+
+    target = GameResultsManager(data_dir=str(tmp_path / "restored"))
+    report = target.import_file(exported)
+    assert report == {'lignes': 3, 'invalides': 0, 'importes': 3, 'doublons': 0}
+    restored = target.get_all_results()
+    assert [(r['numero'], r['gagnant']) for r in restored] == [(10, 'Joueur'), (12, 'Joueur'), (14, 'Joueur')]
+    original = manager.get_all_results()
+    assert [r['date'] for r in restored] == [r['date'] for r in original]
+    assert [r['heure'][:5] for r in restored] == [r['heure'][:5] for r in original]
+
+
+def test_csv_duplicates_are_skipped(manager, tmp_path):
+    assert manager.process_message(FINAL.format(n=10))[0]
+    path = write_csv(tmp_path / "import.csv", [
+        "Date & Heure;Numéro;Victoire (Joueur/Banquier)",
+        "01/01/2026 - 12:00;10;Joueur",
+        "01/01/2026 - 12:01;11;Banquier",
+        "01/01/2026 - 12:01;11;Banquier",
+        "01/01/2026 - 12:02;x;Joueur",
+        "",
+        "2026-01-01 12:03:30;13;joueur",
+    ])
+    report = manager.import_file(path)
+    assert report == {'lignes': 4, 'invalides': 1, 'importes': 2, 'doublons': 2}
+    assert [r['numero'] for r in manager.get_all_results()] == [10, 11, 13]
+    # Relancé, l'import n'ajoute rien
+    assert manager.import_file(path)['importes'] == 0
+
+
+def test_parse_datetime():
+    assert parse_datetime("05/02/2026 - 08:15") == ('2026-02-05', '08:15:00')
+    assert parse_datetime("2026-02-05 08:15") == ('2026-02-05', '08:15:00')
+    assert parse_datetime("hier") == ('', '')
+
+
+def test_unsupported_format(manager, tmp_path):
+    path = tmp_path / "resultats.txt"
+    path.write_text("x", encoding='utf-8')
+    with pytest.raises(ValueError):
+        manager.import_file(str(path))
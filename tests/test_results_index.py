@@ -0,0 +1,90 @@
+"""
+Index trié des résultats: filtres de query, pagination par curseur et N derniers
+"""
+import pytest
+
+from results_index import ResultsIndex, matches
+
+
+def make_rows():
+    # Numéros 1..10, une heure d'écart, gagnant alterné; insérés dans le désordre
+    rows = [{'numero': n, 'date': '2026-01-01', 'heure': f"{n:02d}:00:00",
+             'gagnant': 'Joueur' if n % 2 else 'Banquier'} for n in range(1, 11)]
+    return rows[5:] + rows[:5]
+
+
+@pytest.fixture
+def index():
+    return ResultsIndex(make_rows())
+
+
+def numbers(rows):
+    return [row['numero'] for row in rows]
+
+
+def test_query_without_filters_is_sorted(index):
+    assert numbers(index.query()) == list(range(1, 11))
+
+
+def test_query_number_bounds_are_inclusive(index):
+    assert numbers(index.query(min_numero=3, max_numero=5)) == [3, 4, 5]
+    assert numbers(index.query(min_numero=11)) == []
+    assert numbers(index.query(min_numero=6, max_numero=2)) == []
+
+
+def test_query_by_winner(index):
+    assert numbers(index.query(winner='Banquier', max_numero=6)) == [2, 4, 6]
+    assert numbers(index.query(winner='Egalité')) == []
+
+
+def test_query_date_bounds_complete_day_and_minutes(index):
+    assert numbers(index.query(since='2026-01-01 03:00', until='2026-01-01 05:30')) == [3, 4, 5]
+    assert numbers(index.query(since='2026-01-01', until='2026-01-01')) == list(range(1, 11))
+    assert numbers(index.query(since='2026-01-02')) == []
+    assert numbers(index.query(since='2026-01-01T08:00', winner='Joueur', max_numero=9)) == [9]
+
+
+def test_query_matches_isolated_filter(index):
+    filters = {'min_numero': 2, 'until': '2026-01-01 07:00', 'winner': 'Joueur'}
+    expected = [row['numero'] for row in sorted(make_rows(), key=lambda r: r['numero']) if matches(row, **filters)]
+    assert numbers(index.query(**filters)) == expected == [3, 5, 7]
+
+
+def test_page_walks_all_rows_with_cursor(index):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = index.page(cursor, limit=3)
+        seen.extend(numbers(rows))
+        if cursor is None:
+            break
+    assert seen == list(range(1, 11))
+
+
+def test_page_exact_multiple_ends_without_empty_page(index):
+    rows, cursor = index.page(limit=5, min_numero=1, max_numero=10)
+    assert numbers(rows) == [1, 2, 3, 4, 5] and cursor == 5
+    rows, cursor = index.page(cursor, limit=5, max_numero=10)
+    assert numbers(rows) == [6, 7, 8, 9, 10] and cursor is None
+
+
+def test_page_cursor_combines_with_min_numero(index):
+    rows, _ = index.page(cursor=2, limit=2, min_numero=6)
+    assert numbers(rows) == [6, 7]
+    rows, _ = index.page(cursor=7, limit=2, min_numero=3)
+    assert numbers(rows) == [8, 9]
+
+
+def test_tail(index):
+    assert numbers(index.tail(3)) == [8, 9, 10]
+    assert numbers(index.tail(0)) == []
+    assert numbers(index.tail(50)) == list(range(1, 11))
+    assert numbers(index.tail(2, winner='Banquier', max_numero=7)) == [4, 6]
+    assert numbers(index.tail(2, since='2026-01-01 02:00', until='2026-01-01 06:00')) == [5, 6]
+
+
+def test_add_keeps_every_order(index):
+    index.add({'numero': 11, 'date': '2026-01-01', 'heure': '00:30:00', 'gagnant': 'Joueur'})
+    assert index.contains(11) and index.get(11)['heure'] == '00:30:00'
+    assert numbers(index.tail(1, winner='Joueur')) == [11]
+    assert numbers(index.query(until='2026-01-01 00:59')) == [11]
+    assert numbers(index.last(2)) == [9, 10]
@@ -0,0 +1,59 @@
+"""
+Bascule de journée: stock actif figé par renommage, relance idempotente et éditions tardives rejetées
+"""
+import pytest
+
+from game_results_manager import GameResultsManager
+
+FINAL = "#N{n}. ✅2({first}) - 1({second}) #T3"
+
+
+def final(n, first="K♠️5♣️7♥️", second="2♣️2♥️"):
+    return FINAL.format(n=n, first=first, second=second)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return GameResultsManager(data_dir=str(tmp_path))
+
+
+def numbers(results):
+    return [r['numero'] for r in results]
+
+
+def test_rollover_freezes_the_active_store(manager):
+    # Numéros non consécutifs (règle de séquence par défaut)
+    for n in (1, 3, 5):
+        assert manager.process_message(final(n))[0]
+    frozen, frozen_file = manager.rollover('2026-01-01')
+
+    assert numbers(frozen) == [1, 3, 5]
+    assert frozen_file.name == "game_results_2026-01-01.yaml"
+    assert numbers(manager.load_frozen(frozen_file)) == [1, 3, 5]
+    assert manager.get_all_results() == [] and len(manager.get_index()) == 0
+    assert manager.pending_rollovers() == [('2026-01-01', frozen_file)]
+
+    manager.discard_frozen(frozen_file)
+    assert manager.pending_rollovers() == []
+
+
+def test_repeated_rollover_completes_the_frozen_day(manager):
+    assert manager.process_message(final(1))[0]
+    manager.rollover('2026-01-01')
+    # Partie enregistrée entre deux bascules de la même journée (bascule relancée)
+    assert manager.process_message(final(2))[0]
+    frozen, frozen_file = manager.rollover('2026-01-01')
+    assert numbers(frozen) == [1, 2]
+    assert numbers(manager.load_frozen(frozen_file)) == [1, 2]
+
+
+def test_late_edit_of_the_previous_day_is_rejected(manager):
+    assert manager.process_message(final(10))[0]
+    manager.rollover('2026-01-01')
+
+    success, reason = manager.process_message(final(10) + " ✏️")
+    assert not success and reason == "Jeu #10 déjà enregistré"
+    assert manager.get_all_results() == []
+    # Même numéro dans la nouvelle journée, autres cartes: nouvelle partie
+    assert manager.process_message(final(10, first="2♣️2♥️", second="K♠️5♣️7♥️"))[0]
+    assert numbers(manager.get_all_results()) == [10]
@@ -0,0 +1,125 @@
+"""
+Coordination des workers: bail du leader, exécutions uniques et reprise d'une exécution interrompue
+"""
+import pytest
+
+from shared_storage import Coordinator
+
+
+@pytest.fixture
+def workers(tmp_path):
+    db = tmp_path / "shared.db"
+    first, second = Coordinator(str(db), worker_id='a'), Coordinator(str(db), worker_id='b')
+    yield first, second
+    first.close()
+    second.close()
+
+
+def test_try_acquire_is_exclusive_until_release(workers):
+    a, b = workers
+    assert a.try_acquire() and a.is_leader()
+    assert not b.try_acquire() and not b.is_leader()
+    assert a.try_acquire()
+    assert b.leader() == 'a'
+    a.release()
+    assert not a.is_leader() and a.leader() is None
+    assert b.try_acquire() and b.leader() == 'b'
+
+
+def test_try_acquire_takes_over_expired_lease(workers):
+    a, b = workers
+    a.lease_ttl = -1.0
+    assert a.try_acquire()
+    assert b.try_acquire() and b.leader() == 'b'
+
+
+def test_run_once_records_a_single_winner(workers):
+    a, b = workers
+    assert a.run_once('reset:2026-01-01')
+    assert not b.run_once('reset:2026-01-01')
+    assert not a.run_once('reset:2026-01-01')
+    assert b.has_run('reset:2026-01-01') and not b.has_run('reset:2026-01-02')
+
+
+def test_start_run_is_exclusive_and_done_after_finish(workers):
+    a, b = workers
+    assert a.start_run('reset:d')
+    assert not b.start_run('reset:d')
+    assert a.renew_run('reset:d')
+    a.mark_step('reset:d', 'bascule')
+    assert b.has_step('reset:d', 'bascule')
+    a.finish_run('reset:d')
+    assert b.has_run('reset:d')
+    assert not b.start_run('reset:d') and not a.start_run('reset:d')
+    # Les étapes sont oubliées, sans toucher aux réglages voisins
+    assert not b.has_step('reset:d', 'bascule')
+
+
+def test_finish_run_keeps_other_runs_steps(workers):
+    a, _ = workers
+    a.mark_step('reset:d', 'bascule')
+    a.mark_step('reset:d2', 'bascule')
+    a.set_setting('run:reset_d:bascule', True)
+    a.finish_run('reset:d')
+    assert a.has_step('reset:d2', 'bascule')
+    assert a.get_setting('run:reset_d:bascule') is True
+
+
+def test_interrupted_run_resumes_after_lease_expiry(workers):
+    a, b = workers
+    a.lease_ttl = -1.0
+    assert a.start_run('reset:d')
+    a.mark_step('reset:d', 'bascule')
+    # a est tombé sans finish_run: b reprend et voit l'étape déjà franchie
+    assert b.start_run('reset:d')
+    assert b.has_step('reset:d', 'bascule')
+    b.finish_run('reset:d')
+    assert a.has_run('reset:d')
+
+
+FINAL = "#N{n}. ✅2({first}) - 1({second}) #T3"
+
+
+def test_late_edit_rejected_on_a_worker_that_did_not_roll_over(workers, tmp_path):
+    from game_results_manager import GameResultsManager
+    from shared_storage import FileLock, SharedPreviousDayGames
+    a, b = workers
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+
+    def manager(coordinator):
+        return GameResultsManager(data_dir=str(data_dir), lock=FileLock(data_dir / "results.lock"),
+                                  previous_day=SharedPreviousDayGames(coordinator, -100))
+
+    leader, other = manager(a), manager(b)
+    assert leader.process_message(FINAL.format(n=10, first="K♠️5♣️7♥️", second="2♣️2♥️"))[0]
+    leader.rollover('2026-01-01')
+
+    # Édition tardive de la veille (texte différent, mêmes cartes) reçue par l'autre worker
+    success, reason = other.process_message(FINAL.format(n=10, first="K♠️5♣️7♥️", second="2♣️2♥️") + " ✏️")
+    assert not success and reason == "Jeu #10 déjà enregistré"
+    # Même numéro le jour suivant, autres cartes: enregistré
+    assert other.process_message(FINAL.format(n=10, first="2♣️2♥️", second="K♠️5♣️7♥️"))[0]
+    assert len(leader.get_index()) == 1
+
+
+def test_listeners_called_on_the_loop_when_recording_in_a_thread(tmp_path):
+    import asyncio
+    import threading
+    from game_results_manager import GameResultsManager
+
+    async def record():
+        manager = GameResultsManager(data_dir=str(tmp_path), loop=asyncio.get_running_loop())
+        calls = []
+        manager.add_listener(lambda result: calls.append(('loop', threading.current_thread())))
+        manager.add_listener(lambda result: calls.append(('thread_safe', threading.current_thread())),
+                             thread_safe=True)
+        success, _ = await asyncio.to_thread(manager.process_message,
+                                             FINAL.format(n=10, first="K♠️5♣️7♥️", second="2♣️2♥️"))
+        return success, calls
+
+    success, calls = asyncio.run(record())
+    assert success
+    threads = dict(calls)
+    assert threads['loop'] is threading.main_thread()
+    assert threads['thread_safe'] is not threading.main_thread()
@@ -0,0 +1,75 @@
+"""
+Index de vérification des prédictions comparé à un parcours complet des prédictions en attente
+"""
+import random
+
+from predictions import HIT_MARKS, MISSED, EXPIRED, VerificationIndex, prediction_hit
+
+CHANNELS = (-1001, -1002)
+
+
+def naive_resolve(pending, tolerance, channel_id, result):
+    """Référence: chaque prédiction en attente du canal est examinée à chaque résultat"""
+    resolved = []
+    for key, entry in list(pending.items()):
+        if key[0] is not None and key[0] != channel_id:
+            continue
+        distance = result['numero'] - entry['game_number']
+        if 0 <= distance <= tolerance and prediction_hit(entry['prediction'], result):
+            resolved.append((key, '✅' + HIT_MARKS[distance]))
+        elif distance >= tolerance:
+            resolved.append((key, MISSED))
+    for key, _ in resolved:
+        del pending[key]
+    return resolved
+
+
+def test_matches_naive_scan():
+    rng = random.Random(11)
+    index, pending, tolerance = VerificationIndex(tolerance=2), {}, 2
+    numbers = {channel: 0 for channel in CHANNELS}
+    statuses = set()
+    for _ in range(2000):
+        channel = rng.choice(CHANNELS)
+        if rng.random() < 0.4:
+            chat_id = rng.choice(CHANNELS + (None,))
+            target = numbers[chat_id or channel] + rng.randint(1, 4)
+            prediction = rng.choice(('Joueur', 'Banquier', '♠♥', '♣'))
+            index.add(chat_id, target, prediction)
+            pending.setdefault((chat_id, target), {'game_number': target, 'prediction': prediction})
+            continue
+        numbers[channel] += rng.choice((1, 1, 2, 4))
+        result = {'numero': numbers[channel], 'gagnant': rng.choice(('Joueur', 'Banquier')),
+                  'cartes_groupe1': rng.choice(('K♠️5♣️', '7♥️2♦️', '3♦️'))}
+        expected = naive_resolve(pending, tolerance, channel, result)
+        actual = [((entry['chat_id'], entry['game_number']), status)
+                  for entry, status in index.resolve(channel, result)]
+        assert sorted(actual, key=repr) == sorted(expected, key=repr)
+        statuses.update(status for _, status in actual)
+    assert set(index.entries) == set(pending)
+    assert statuses >= {'✅' + HIT_MARKS[0], '✅' + HIT_MARKS[2], MISSED}
+
+
+def test_expire_channel_only_touches_that_channel():
+    index = VerificationIndex(tolerance=1)
+    index.add(-1001, 5, 'Joueur', id='a')
+    index.add(-1002, 5, 'Joueur', id='b')
+    index.add(None, 7, 'Banquier', id='c')
+    index.add(-1001, 5, 'Banquier', id='doublon')
+    expired = index.expire_channel(-1001)
+    assert [(entry['id'], status) for entry, status in expired] == [('a', EXPIRED)]
+    assert (-1001, 5) not in index and len(index) == 2
+    # Le tas du canal expiré est vidé: un résultat ultérieur ne renvoie rien pour lui
+    assert index.resolve(-1001, {'numero': 3, 'gagnant': 'Joueur'}) == []
+
+
+def test_load_skips_verified_and_invalid_entries():
+    index = VerificationIndex()
+    index.load([{'chat_id': -1001, 'game_number': 5, 'suit_combination': 'Joueur', 'id': 'x'},
+                {'chat_id': -1001, 'game_number': 'abc', 'suit_combination': 'Joueur'}],
+               {'-1001:6': {'prediction': 'Banquier'},
+                '-1001:7': {'prediction': 'Joueur', 'verified': True},
+                'None:8': {'prediction': '♠'}})
+    assert set(index.entries) == {(-1001, 5), (-1001, 6), (None, 8)}
+    assert index.entries[(-1001, 5)]['id'] == 'x'
+    assert index.entries[(-1001, 6)]['source'] == 'auto_predictions'
@@ -2,19 +2,46 @@
 Gestionnaire de données YAML pour le bot Telegram de prédiction
 Remplace complètement la base de données PostgreSQL par des fichiers YAML
 """
+import functools
+import logging
 import os
+import threading
 import yaml
 import json
 import hashlib
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, time, timedelta, timezone
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Journée de jeu: de 00h59 à 00h59 le lendemain, heure du Bénin (comme la remise à zéro quotidienne)
+GAME_DAY_TZ = timezone(timedelta(hours=1))
+GAME_DAY_START = timedelta(minutes=59)
+
+
+def game_day(moment: Optional[datetime] = None) -> str:
+    """Journée de jeu (ISO) d'un instant, maintenant par défaut (les numéros de jeu y sont uniques)"""
+    moment = moment or datetime.now(GAME_DAY_TZ)
+    return (moment.astimezone(GAME_DAY_TZ) - GAME_DAY_START).date().isoformat()
+
+
+def exclusive(method):
+    """Lecture-modification-écriture d'un fichier du gestionnaire sous son verrou (et le verrou de fichier partagé)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            if self._file_lock is None:
+                return method(self, *args, **kwargs)
+            with self._file_lock:
+                return method(self, *args, **kwargs)
+    return wrapper
+
 
 class YAMLDataManager:
     """Gestionnaire de données basé sur YAML"""
     
-    def __init__(self):
+    def __init__(self, file_lock=None):
         # Répertoire pour stocker tous les fichiers YAML
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)
@@ -24,10 +51,17 @@ class YAMLDataManager:
         self.predictions_file = self.data_dir / "predictions.yaml"
         self.auto_predictions_file = self.data_dir / "auto_predictions.yaml"
         self.message_log_file = self.data_dir / "message_log.yaml"
+        # Prédictions vérifiées des journées passées, un fichier par jour de création
+        self.predictions_history_dir = self.data_dir / "predictions_history"
+        # Une seule écriture à la fois: l'écriture groupée des prédictions et la rétention
+        # tournent dans des threads et réécrivent les mêmes fichiers
+        self._lock = threading.RLock()
+        # Mode multi-workers: verrou inter-processus (FileLock) pris en plus du verrou des threads
+        self._file_lock = file_lock
         
         # Initialiser les fichiers s'ils n'existent pas
         self._init_files()
-        print("✅ Gestionnaire YAML initialisé")
+        logger.info("✅ Gestionnaire YAML initialisé")
     
     def _init_files(self):
         """Initialise les fichiers YAML s'ils n'existent pas"""
@@ -42,25 +76,37 @@ class YAMLDataManager:
             if not file_path.exists():
                 self._save_yaml(file_path, default_content)
     
-    def _load_yaml(self, file_path: Path) -> Any:
-        """Charge un fichier YAML"""
+    @staticmethod
+    def prediction_id(day: str, chat_id: Optional[int], game_number: int) -> str:
+        """Identifiant stable: journée de jeu, canal et numéro de jeu (les numéros repartent de zéro chaque jour)"""
+        return f"{day}:{chat_id}:{game_number}"
+
+    def _load_yaml(self, file_path: Path, strict: bool = False) -> Any:
+        """Charge un fichier YAML (strict: l'erreur remonte au lieu d'un contenu vide)"""
         try:
             if file_path.exists():
                 with open(file_path, 'r', encoding='utf-8') as f:
                     return yaml.safe_load(f) or {}
             return {}
         except Exception as e:
-            print(f"❌ Erreur chargement {file_path}: {e}")
+            if strict:
+                raise
+            logger.error("❌ Erreur chargement %s: %s", file_path, e)
             return {}
     
-    def _save_yaml(self, file_path: Path, data: Any):
-        """Sauvegarde des données dans un fichier YAML"""
+    def _save_yaml(self, file_path: Path, data: Any, strict: bool = False):
+        """Sauvegarde des données dans un fichier YAML (fichier temporaire puis renommage)"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            tmp_file = file_path.with_name(file_path.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 yaml.dump(data, f, allow_unicode=True, default_flow_style=False, indent=2)
+            os.replace(tmp_file, file_path)
         except Exception as e:
-            print(f"❌ Erreur sauvegarde {file_path}: {e}")
+            if strict:
+                raise
+            logger.error("❌ Erreur sauvegarde %s: %s", file_path, e)
     
+    @exclusive
     def set_config(self, key: str, value: Any):
         """Sauvegarde une valeur de configuration"""
         try:
@@ -71,7 +117,7 @@ class YAMLDataManager:
             }
             self._save_yaml(self.config_file, config)
         except Exception as e:
-            print(f"❌ Erreur set_config: {e}")
+            logger.error("❌ Erreur set_config: %s", e)
     
     def get_config(self, key: str, default=None):
         """Récupère une valeur de configuration"""
@@ -81,9 +127,10 @@ class YAMLDataManager:
                 return config[key]['value']
             return default
         except Exception as e:
-            print(f"❌ Erreur get_config: {e}")
+            logger.error("❌ Erreur get_config: %s", e)
             return default
     
+    @exclusive
     def save_prediction(self, game_number: int, suit_combination: str, 
                        message_id: Optional[int] = None, chat_id: Optional[int] = None, 
                        prediction_type: str = 'manual'):
@@ -93,13 +140,15 @@ class YAMLDataManager:
             if not isinstance(predictions, list):
                 predictions = []
             
-            # Vérifier si la prédiction existe déjà
-            existing = any(p.get('game_number') == game_number for p in predictions)
-            if existing:
+            # Vérifier si la prédiction existe déjà (même jeu de la même journée)
+            day = game_day()
+            prediction_id = self.prediction_id(day, chat_id, game_number)
+            if any(p.get('id') == prediction_id for p in predictions):
                 return
             
             prediction = {
-                'id': len(predictions) + 1,
+                'id': prediction_id,
+                'day': day,
                 'game_number': game_number,
                 'suit_combination': suit_combination,
                 'status': '⌛',
@@ -113,8 +162,9 @@ class YAMLDataManager:
             predictions.append(prediction)
             self._save_yaml(self.predictions_file, predictions)
         except Exception as e:
-            print(f"❌ Erreur save_prediction: {e}")
+            logger.error("❌ Erreur save_prediction: %s", e)
     
+    @exclusive
     def update_prediction_status(self, game_number: int, status: str):
         """Met à jour le statut d'une prédiction"""
         try:
@@ -130,7 +180,7 @@ class YAMLDataManager:
             
             self._save_yaml(self.predictions_file, predictions)
         except Exception as e:
-            print(f"❌ Erreur update_prediction_status: {e}")
+            logger.error("❌ Erreur update_prediction_status: %s", e)
     
     def get_pending_predictions(self) -> List[Dict]:
         """Récupère les prédictions en attente"""
@@ -141,9 +191,10 @@ class YAMLDataManager:
             
             return [p for p in predictions if p.get('status') == '⌛']
         except Exception as e:
-            print(f"❌ Erreur get_pending_predictions: {e}")
+            logger.error("❌ Erreur get_pending_predictions: %s", e)
             return []
     
+    @exclusive
     def update_prediction_status(self, game_number: int, new_status: str):
         """Met à jour le statut d'une prédiction existante"""
         try:
@@ -159,25 +210,91 @@ class YAMLDataManager:
                     prediction['status'] = new_status
                     prediction['verified_at'] = datetime.now().isoformat()
                     updated = True
-                    print(f"📁 Prédiction #{game_number}: {old_status} → {new_status}")
+                    logger.info("📁 Prédiction #%s: %s → %s", game_number, old_status, new_status)
                     break
             
             if updated:
                 self._save_yaml(self.predictions_file, predictions)
                 return True
             else:
-                print(f"⚠️ Prédiction #{game_number} non trouvée dans YAML")
+                logger.warning("⚠️ Prédiction #%s non trouvée dans YAML", game_number)
                 return False
                 
         except Exception as e:
-            print(f"❌ Erreur update_prediction_status: {e}")
+            logger.error("❌ Erreur update_prediction_status: %s", e)
             return False
     
+    @exclusive
+    def apply_prediction_updates(self, new_predictions: List[Dict[str, Any]], status_updates: List[Dict[str, Any]]):
+        """
+        Enregistre en une seule lecture/écriture par fichier les prédictions automatiques émises
+        et leurs vérifications (clé: identifiant journée:canal:numéro, les numéros repartant de zéro chaque jour)
+        Une vérification sans identifiant ne vise qu'une prédiction encore en attente (⌛) de ce jeu et de ce canal;
+        une prédiction déjà vérifiée n'est jamais réécrite
+        Tient aussi à jour la planification automatique de la journée (launched / verified)
+        Les erreurs de lecture ou d'écriture remontent: l'appelant garde les changements pour la passe suivante
+        """
+        if not new_predictions and not status_updates:
+            return
+        predictions = self._load_yaml(self.predictions_file, strict=True)
+        if not isinstance(predictions, list):
+            predictions = []
+        by_id = {p.get('id'): p for p in predictions}
+
+        auto_predictions = self._load_yaml(self.auto_predictions_file, strict=True)
+        if not isinstance(auto_predictions, dict):
+            auto_predictions = {}
+
+        for new in new_predictions:
+            day = new.get('day') or game_day()
+            prediction_id = new.get('id') or self.prediction_id(day, new.get('chat_id'), new['game_number'])
+            if prediction_id in by_id:
+                continue
+            prediction = {
+                'id': prediction_id,
+                'day': day,
+                'game_number': new['game_number'],
+                'suit_combination': new['prediction'],
+                'status': '⌛',
+                'message_id': None,
+                'chat_id': new.get('chat_id'),
+                'created_at': new.get('created_at', datetime.now().isoformat()),
+                'verified_at': None,
+                'prediction_type': 'auto',
+                'confidence': new.get('confidence')
+            }
+            predictions.append(prediction)
+            by_id[prediction_id] = prediction
+            auto_predictions.setdefault(day, {})[f"{new.get('chat_id')}:{new['game_number']}"] = {
+                'prediction': new['prediction'],
+                'confidence': new.get('confidence'),
+                'launched': True,
+                'verified': False
+            }
+
+        for update in status_updates:
+            prediction = by_id.get(update.get('id')) if update.get('id') else next(
+                (p for p in reversed(predictions) if p.get('status') == '⌛'
+                 and p.get('game_number') == update['game_number'] and p.get('chat_id') == update.get('chat_id')), None)
+            if prediction is None or prediction.get('status') != '⌛':
+                continue
+            prediction['status'] = update['status']
+            prediction['verified_at'] = datetime.now().isoformat()
+            prediction['verified_by'] = update.get('verified_by')
+            day = prediction.get('day') or str(prediction.get('created_at') or '')[:10]
+            entry = auto_predictions.get(day, {}).get(f"{update.get('chat_id')}:{update['game_number']}")
+            if entry is not None:
+                entry.update({'verified': True, 'status': update['status']})
+
+        self._save_yaml(self.predictions_file, predictions, strict=True)
+        self._save_yaml(self.auto_predictions_file, auto_predictions, strict=True)
+
+    @exclusive
     def save_auto_prediction_schedule(self, schedule_data: Dict[str, Any]):
         """Sauvegarde la planification automatique complète"""
         try:
             # Ajouter la date courante pour organiser par jour
-            today = date.today().isoformat()
+            today = game_day()
             auto_predictions = self._load_yaml(self.auto_predictions_file)
             
             if not isinstance(auto_predictions, dict):
@@ -188,12 +305,12 @@ class YAMLDataManager:
             
             self._save_yaml(self.auto_predictions_file, auto_predictions)
         except Exception as e:
-            print(f"❌ Erreur save_auto_prediction_schedule: {e}")
+            logger.error("❌ Erreur save_auto_prediction_schedule: %s", e)
     
     def load_auto_prediction_schedule(self) -> Dict[str, Any]:
         """Charge la planification automatique du jour"""
         try:
-            today = date.today().isoformat()
+            today = game_day()
             auto_predictions = self._load_yaml(self.auto_predictions_file)
             
             if not isinstance(auto_predictions, dict):
@@ -201,13 +318,14 @@ class YAMLDataManager:
             
             return auto_predictions.get(today, {})
         except Exception as e:
-            print(f"❌ Erreur load_auto_prediction_schedule: {e}")
+            logger.error("❌ Erreur load_auto_prediction_schedule: %s", e)
             return {}
     
+    @exclusive
     def update_auto_prediction(self, numero: str, updates: Dict[str, Any]):
         """Met à jour une prédiction automatique"""
         try:
-            today = date.today().isoformat()
+            today = game_day()
             auto_predictions = self._load_yaml(self.auto_predictions_file)
             
             if not isinstance(auto_predictions, dict):
@@ -220,7 +338,7 @@ class YAMLDataManager:
                 auto_predictions[today][numero].update(updates)
                 self._save_yaml(self.auto_predictions_file, auto_predictions)
         except Exception as e:
-            print(f"❌ Erreur update_auto_prediction: {e}")
+            logger.error("❌ Erreur update_auto_prediction: %s", e)
     
     def is_message_processed(self, message_content: str, channel_id: int) -> bool:
         """Vérifie si un message a déjà été traité"""
@@ -233,9 +351,10 @@ class YAMLDataManager:
             
             return any(msg.get('message_hash') == message_hash for msg in message_log)
         except Exception as e:
-            print(f"❌ Erreur is_message_processed: {e}")
+            logger.error("❌ Erreur is_message_processed: %s", e)
             return False
     
+    @exclusive
     def mark_message_processed(self, message_content: str, channel_id: int):
         """Marque un message comme traité"""
         try:
@@ -249,11 +368,11 @@ class YAMLDataManager:
             if any(msg.get('message_hash') == message_hash for msg in message_log):
                 return
             
+            # Empreinte seulement: le texte brut est conservé dans les archives quotidiennes compressées
             message_entry = {
                 'id': len(message_log) + 1,
                 'message_hash': message_hash,
                 'channel_id': channel_id,
-                'content': message_content,
                 'processed_at': datetime.now().isoformat()
             }
             
@@ -265,7 +384,7 @@ class YAMLDataManager:
             
             self._save_yaml(self.message_log_file, message_log)
         except Exception as e:
-            print(f"❌ Erreur mark_message_processed: {e}")
+            logger.error("❌ Erreur mark_message_processed: %s", e)
     
     def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques du bot"""
@@ -282,7 +401,7 @@ class YAMLDataManager:
             }
             
             # Statistiques des prédictions automatiques
-            today = date.today().isoformat()
+            today = game_day()
             auto_predictions = self._load_yaml(self.auto_predictions_file)
             
             if not isinstance(auto_predictions, dict):
@@ -301,26 +420,75 @@ class YAMLDataManager:
                 'auto': auto_stats
             }
         except Exception as e:
-            print(f"❌ Erreur get_stats: {e}")
+            logger.error("❌ Erreur get_stats: %s", e)
             return {'manual': {}, 'auto': {}}
     
-    def cleanup_old_data(self, days_to_keep: int = 30):
-        """Nettoie les anciennes données (optionnel)"""
+    @exclusive
+    def rotate_predictions(self, through_day: str) -> int:
+        """
+        Déplace les prédictions vérifiées des journées de jeu jusqu'à through_day (ISO, incluse)
+        vers predictions_history/<jour>.yaml
+        predictions.yaml ne garde que la journée en cours et les prédictions en attente: sa réécriture
+        à chaque écriture groupée ne dépend pas de la taille de l'historique
+        Relancée après une interruption, la rotation n'ajoute pas de doublon (identifiants stables)
+        """
+        predictions = self._load_yaml(self.predictions_file, strict=True)
+        if not isinstance(predictions, list):
+            return 0
+        kept = []
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for prediction in predictions:
+            day = prediction.get('day') or str(prediction.get('created_at') or '')[:10]
+            if prediction.get('status') != '⌛' and day <= through_day:
+                by_day.setdefault(day or 'inconnu', []).append(prediction)
+            else:
+                kept.append(prediction)
+        if not by_day:
+            return 0
+
+        self.predictions_history_dir.mkdir(exist_ok=True)
+        for day, moved in by_day.items():
+            history_file = self.predictions_history_dir / f"{day}.yaml"
+            history = self._load_yaml(history_file, strict=True)
+            if not isinstance(history, list):
+                history = []
+            known = {prediction.get('id') for prediction in history}
+            history.extend(prediction for prediction in moved if prediction.get('id') not in known)
+            self._save_yaml(history_file, history, strict=True)
+        self._save_yaml(self.predictions_file, kept, strict=True)
+
+        moved_count = len(predictions) - len(kept)
+        logger.info("🗂️ %s prédiction(s) vérifiée(s) déplacée(s) vers l'historique (%s jour(s))", moved_count, len(by_day))
+        return moved_count
+
+    @exclusive
+    def prune_prediction_history(self, cutoff: str) -> int:
+        """Supprime l'historique des prédictions des journées antérieures à la date ISO cutoff"""
+        removed = 0
+        for history_file in sorted(self.predictions_history_dir.glob("*.yaml")):
+            if history_file.stem < cutoff:
+                history_file.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info("🧹 Rétention: %s journée(s) d'historique des prédictions supprimée(s)", removed)
+        return removed
+
+    @exclusive
+    def prune_auto_predictions(self, cutoff: str) -> int:
+        """Supprime les planifications automatiques antérieures à la date ISO cutoff (politique de rétention)"""
         try:
-            cutoff_date = datetime.now().date() - timedelta(days=days_to_keep)
-            
-            # Nettoyer les anciennes prédictions automatiques
             auto_predictions = self._load_yaml(self.auto_predictions_file)
-            if isinstance(auto_predictions, dict):
-                cleaned = {
-                    date_str: data for date_str, data in auto_predictions.items()
-                    if datetime.fromisoformat(date_str).date() >= cutoff_date
-                }
-                if len(cleaned) != len(auto_predictions):
-                    self._save_yaml(self.auto_predictions_file, cleaned)
-                    print(f"🧹 Nettoyage: {len(auto_predictions) - len(cleaned)} anciennes planifications supprimées")
+            if not isinstance(auto_predictions, dict):
+                return 0
+            cleaned = {date_str: data for date_str, data in auto_predictions.items() if str(date_str) >= cutoff}
+            removed = len(auto_predictions) - len(cleaned)
+            if removed:
+                self._save_yaml(self.auto_predictions_file, cleaned)
+                logger.info("🧹 Rétention: %s anciennes planifications supprimées", removed)
+            return removed
         except Exception as e:
-            print(f"❌ Erreur cleanup_old_data: {e}")
+            logger.error("❌ Erreur prune_auto_predictions: %s", e)
+            return 0
 
 
 # Instance globale
@@ -333,7 +501,7 @@ def init_yaml_manager():
         yaml_manager = YAMLDataManager()
         return yaml_manager
     except Exception as e:
-        print(f"❌ Erreur initialisation gestionnaire YAML: {e}")
+        logger.error("❌ Erreur initialisation gestionnaire YAML: %s", e)
         return None
 
 # Alias pour compatibilité avec l'ancien code